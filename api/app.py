@@ -0,0 +1,389 @@
+"""ASGI HTTP/JSON API for jobs, running alongside the Streamlit UI.
+
+    uvicorn api.app:app --port 8503 --workers 2
+
+Requests authenticate with the session token issued at login: ``Authorization: Bearer <token>``.
+"""
+import sys
+import os
+import re
+import json
+import time
+import asyncio
+import hashlib
+from urllib.parse import unquote_plus
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.datamanager.connectionpool import ConnectionPool
+from components.datamanager.jobrecords import insert_job_record, assign_technician
+from components.datamanager.jobstatus import apply_job_status, UNCHANGED
+from components.datamanager.repairstatus import invalidate_job_status
+
+TOKEN_FILE = "tokens.json"
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+MAX_BODY_BYTES = 1024 * 1024
+
+JOB_STATUSES = ('New', 'In Progress', 'Pending', 'Completed')
+NOTIFICATION_METHODS = ('SMS', 'Email', 'Phone Call', 'WhatsApp')
+_REQUIRED_JOB_FIELDS = ('customer_name', 'customer_phone', 'device_type', 'problem_description')
+_COST_FIELDS = ('deposit_cost', 'estimate_cost')
+
+_JOB_COLUMNS = [
+    'id', 'customer_id', 'customer_name', 'customer_phone', 'store_id', 'store_name',
+    'device_type', 'device_model', 'problem_description', 'deposit_cost', 'estimate_cost',
+    'actual_cost', 'payment_status', 'status', 'created_at', 'updated_at', 'started_at', 'completed_at',
+]
+
+_JOB_SELECT = """
+    SELECT j.id, j.customer_id, c.name, c.phone, j.store_id, s.name,
+           j.device_type, j.device_model, j.problem_description, j.deposit_cost, j.estimate_cost,
+           j.actual_cost, j.payment_status, j.status, j.created_at, j.updated_at, j.started_at, j.completed_at
+    FROM jobs j
+    LEFT JOIN customers c ON j.customer_id = c.id
+    LEFT JOIN stores s ON j.store_id = s.id
+"""
+
+pool = ConnectionPool(size=int(os.environ.get("REPAIRPRO_API_POOL_SIZE", "8")))
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# ── Authentication ──
+
+_token_cache = {'mtime': None, 'tokens': {}}
+
+
+def authenticate(headers):
+    """User dict for the request's bearer token (tokens.json is re-read only when it changes)"""
+    auth = headers.get('authorization', '')
+    if not auth.lower().startswith('bearer '):
+        raise ApiError(401, 'missing bearer token')
+    try:
+        mtime = os.path.getmtime(TOKEN_FILE)
+        if mtime != _token_cache['mtime']:
+            with open(TOKEN_FILE, "r") as f:
+                _token_cache['tokens'] = json.load(f)
+            _token_cache['mtime'] = mtime
+    except (OSError, ValueError):
+        _token_cache['tokens'] = {}
+    user = _token_cache['tokens'].get(auth[7:].strip())
+    if not user:
+        raise ApiError(401, 'invalid token')
+    return user
+
+
+def store_scope(user, requested_store_id=None):
+    """Store a request may see: admins choose, everyone else is pinned to their own store"""
+    if user['role'] == 'admin':
+        return requested_store_id
+    return user.get('store_id')
+
+
+# ── Handlers (run in worker threads) ──
+
+def list_jobs(user, query):
+    try:
+        limit = min(int(query.get('limit', DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+        before_id = int(query['cursor']) if query.get('cursor') else None
+        store_id = store_scope(user, int(query['store_id']) if query.get('store_id') else None)
+    except ValueError:
+        raise ApiError(400, 'limit, cursor and store_id must be integers')
+
+    conditions, params = [], []
+    if store_id is not None:
+        conditions.append("j.store_id = ?")
+        params.append(store_id)
+    if query.get('status'):
+        conditions.append("j.status = ?")
+        params.append(query['status'])
+    if query.get('updated_since'):
+        conditions.append("j.updated_at > ?")
+        params.append(query['updated_since'])
+    if before_id is not None:
+        # Keyset pagination: stable and O(limit) regardless of depth
+        conditions.append("j.id < ?")
+        params.append(before_id)
+
+    where_clause = " AND ".join(conditions) if conditions else "1 = 1"
+    with pool.connection() as conn:
+        rows = conn.execute(
+            _JOB_SELECT + f" WHERE {where_clause} ORDER BY j.id DESC LIMIT ?", params + [limit + 1]
+        ).fetchall()
+
+    items = [dict(zip(_JOB_COLUMNS, row)) for row in rows[:limit]]
+    next_cursor = str(items[-1]['id']) if len(rows) > limit else None
+    return 200, {'items': items, 'next_cursor': next_cursor}
+
+
+def get_job(user, job_id):
+    with pool.connection() as conn:
+        row = conn.execute(_JOB_SELECT + " WHERE j.id = ?", (job_id,)).fetchone()
+    if not row:
+        raise ApiError(404, f'job {job_id} not found')
+    job = dict(zip(_JOB_COLUMNS, row))
+    scope = store_scope(user)
+    if scope is not None and job['store_id'] != scope:
+        raise ApiError(404, f'job {job_id} not found')
+    return job
+
+
+def validate_new_job(conn, body, store_id):
+    """422 for a create-job body the create-job form could not have produced"""
+    missing = [f for f in _REQUIRED_JOB_FIELDS if not body.get(f)]
+    if missing:
+        raise ApiError(422, f"missing fields: {', '.join(missing)}")
+    not_text = [f for f in _REQUIRED_JOB_FIELDS + ('device_model', 'customer_email', 'customer_address')
+                if body.get(f) is not None and not isinstance(body[f], str)]
+    if not_text:
+        raise ApiError(422, f"must be strings: {', '.join(not_text)}")
+    if not isinstance(store_id, int) or isinstance(store_id, bool):
+        raise ApiError(422, 'store_id must be an integer')
+
+    methods = body.get('notification_methods', [])
+    if not isinstance(methods, list) or any(m not in NOTIFICATION_METHODS for m in methods):
+        raise ApiError(422, f"notification_methods must be a list of {', '.join(NOTIFICATION_METHODS)}")
+
+    for field in _COST_FIELDS:
+        value = body.get(field, 0)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+            raise ApiError(422, f"{field} must be a non-negative number")
+
+    technician_id = body.get('technician_id')
+    if technician_id is not None:
+        if isinstance(technician_id, bool) or not isinstance(technician_id, int):
+            raise ApiError(422, 'technician_id must be an integer')
+        row = conn.execute("""
+            SELECT 1 FROM store_technicians st
+            JOIN users u ON u.id = st.technician_id
+            WHERE st.technician_id = ? AND st.store_id = ? AND st.is_active = 1 AND u.role = 'technician'
+        """, (technician_id, store_id)).fetchone()
+        if not row:
+            raise ApiError(422, f'technician {technician_id} is not an active technician of store {store_id}')
+
+
+def create_job(user, body):
+    store_id = store_scope(user, body.get('store_id')) or user.get('store_id')
+    job_data = dict(body)
+    job_data['selected_store_id'] = store_id
+    job_data['assigned_by'] = user['id']
+
+    with pool.connection() as conn:
+        validate_new_job(conn, body, store_id)
+        cursor = conn.cursor()
+        try:
+            # Reuse the store's customer with this phone; like the create-job form, a matched
+            # customer keeps the stored name, and email/address only fill in blanks
+            cursor.execute(
+                "SELECT id, name, email, address FROM customers WHERE phone = ? AND store_id = ?",
+                (body['customer_phone'], store_id)
+            )
+            existing = cursor.fetchone()
+            job_data['existing_customer_id'] = existing[0] if existing else None
+            if existing:
+                job_data['customer_name'] = existing[1]
+                job_data['customer_email'] = existing[2] or body.get('customer_email')
+                job_data['customer_address'] = existing[3] or body.get('customer_address')
+
+            job_id = insert_job_record(cursor, user, job_data)
+            if body.get('technician_id') is not None:
+                assign_technician(cursor, job_id, body['technician_id'], user['id'])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return 201, get_job(user, job_id)
+
+
+def update_job_status(user, job_id, body):
+    new_status = body.get('status')
+    if new_status not in JOB_STATUSES:
+        raise ApiError(422, f"status must be one of {', '.join(JOB_STATUSES)}")
+    get_job(user, job_id)
+
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        try:
+            apply_job_status(
+                cursor, job_id, new_status,
+                body.get('raw_cost', UNCHANGED), body.get('actual_cost', UNCHANGED), actor=user['id']
+            )
+            if body.get('note'):
+                cursor.execute(
+                    "INSERT INTO job_notes (job_id, note) VALUES (?, ?)",
+                    (job_id, f"Status changed to {new_status}: {body['note']}")
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    invalidate_job_status(job_id)
+    return 200, get_job(user, job_id)
+
+
+def lookup_customers(user, query):
+    phone = query.get('phone')
+    if not phone:
+        raise ApiError(400, 'phone is required')
+    sql = "SELECT id, name, phone, email, address, store_id FROM customers WHERE phone = ?"
+    params = [phone]
+    scope = store_scope(user)
+    if scope is not None:
+        sql += " AND store_id = ?"
+        params.append(scope)
+    with pool.connection() as conn:
+        rows = conn.execute(sql, params).fetchall()
+    columns = ['id', 'name', 'phone', 'email', 'address', 'store_id']
+    return 200, {'items': [dict(zip(columns, row)) for row in rows]}
+
+
+def invoice_etag(job):
+    return '"' + hashlib.sha1(f"invoice-{job['id']}-{job['updated_at']}".encode()).hexdigest() + '"'
+
+
+def render_invoice(job):
+    # reportlab/qrcode are only loaded once an invoice is actually rendered
+    from components.utils.pdf import generate_invoice_pdf_stream
+    return generate_invoice_pdf_stream(job['id'], job['status']).getvalue()
+
+
+# ── ASGI plumbing ──
+
+_ROUTES = [
+    ('GET', re.compile(r'^/jobs$'), 'list_jobs'),
+    ('POST', re.compile(r'^/jobs$'), 'create_job'),
+    ('GET', re.compile(r'^/jobs/(\d+)$'), 'get_job'),
+    ('PATCH', re.compile(r'^/jobs/(\d+)/status$'), 'update_job_status'),
+    ('GET', re.compile(r'^/jobs/(\d+)/invoice\.pdf$'), 'invoice'),
+    ('GET', re.compile(r'^/customers$'), 'lookup_customers'),
+]
+
+
+def _etag(body_bytes):
+    return '"' + hashlib.sha1(body_bytes).hexdigest() + '"'
+
+
+async def _read_body(receive):
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            raise ApiError(413, 'request body too large')
+        chunks.append(chunk)
+        if not message.get('more_body'):
+            break
+    raw = b''.join(chunks)
+    if not raw:
+        return {}
+    try:
+        body = json.loads(raw)
+    except ValueError:
+        raise ApiError(400, 'body must be JSON')
+    if not isinstance(body, dict):
+        raise ApiError(400, 'body must be a JSON object')
+    return body
+
+
+async def _send(send, status, body, content_type='application/json', headers=None):
+    response_headers = [(b'content-type', content_type.encode()), (b'content-length', str(len(body)).encode())]
+    for name, value in (headers or {}).items():
+        response_headers.append((name.lower().encode(), value.encode()))
+    await send({'type': 'http.response.start', 'status': status, 'headers': response_headers})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def _dispatch(scope, receive):
+    method = scope['method']
+    path = scope['path'].rstrip('/') or '/'
+    headers = {k.decode('latin-1').lower(): v.decode('latin-1') for k, v in scope.get('headers', [])}
+    query = {}
+    for pair in scope.get('query_string', b'').decode().split('&'):
+        if pair:
+            key, _, value = pair.partition('=')
+            query[unquote_plus(key)] = unquote_plus(value)
+
+    if path == '/health':
+        return 200, {'status': 'ok'}, headers, None
+
+    for route_method, pattern, name in _ROUTES:
+        match = pattern.match(path)
+        if not match:
+            continue
+        if route_method != method:
+            continue
+        user = authenticate(headers)
+        args = [int(g) for g in match.groups()]
+
+        if name == 'list_jobs':
+            status, payload = await asyncio.to_thread(list_jobs, user, query)
+        elif name == 'get_job':
+            status, payload = 200, await asyncio.to_thread(get_job, user, *args)
+        elif name == 'create_job':
+            body = await _read_body(receive)
+            status, payload = await asyncio.to_thread(create_job, user, body)
+        elif name == 'update_job_status':
+            body = await _read_body(receive)
+            status, payload = await asyncio.to_thread(update_job_status, user, *args, body)
+        elif name == 'lookup_customers':
+            status, payload = await asyncio.to_thread(lookup_customers, user, query)
+        else:
+            job = await asyncio.to_thread(get_job, user, *args)
+            etag = invoice_etag(job)
+            # Conditional GET: skip rendering when the job has not changed
+            if headers.get('if-none-match') == etag:
+                return 304, None, headers, {'etag': etag}
+            pdf = await asyncio.to_thread(render_invoice, job)
+            return 200, pdf, headers, {'etag': etag, 'content-type': 'application/pdf'}
+        return status, payload, headers, None
+
+    if any(pattern.match(path) for _, pattern, _ in _ROUTES):
+        raise ApiError(405, 'method not allowed')
+    raise ApiError(404, 'not found')
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                pool.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    if scope['type'] != 'http':
+        return
+
+    started = time.perf_counter()
+    try:
+        status, payload, headers, extra = await _dispatch(scope, receive)
+    except ApiError as e:
+        await _send(send, e.status, json.dumps({'error': e.message}).encode())
+        return
+    except Exception as e:
+        print(f"API error on {scope['method']} {scope['path']}: {e}")
+        await _send(send, 500, json.dumps({'error': 'internal error'}).encode())
+        return
+
+    timing = {'server-timing': f"app;dur={(time.perf_counter() - started) * 1000:.1f}"}
+    if status == 304:
+        await _send(send, 304, b'', headers={**extra, **timing})
+        return
+    if extra and extra.get('content-type') == 'application/pdf':
+        await _send(send, status, payload, 'application/pdf', {'etag': extra['etag'], **timing})
+        return
+
+    body = json.dumps(payload, default=str).encode()
+    etag = _etag(body)
+    if scope['method'] == 'GET':
+        if headers.get('if-none-match') == etag:
+            await _send(send, 304, b'', headers={'etag': etag, **timing})
+            return
+        timing['etag'] = etag
+    await _send(send, status, body, headers=timing)
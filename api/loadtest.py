@@ -0,0 +1,74 @@
+"""Local load test for the HTTP APIs.
+
+    python api/loadtest.py http://127.0.0.1:8503/jobs?limit=20 --token <token> --requests 5000 --concurrency 32
+"""
+import sys
+import time
+import argparse
+import threading
+import http.client
+from urllib.parse import urlparse
+
+
+def run_load(url, token=None, total=1000, concurrency=16, conditional=False):
+    """Issue total GET requests from concurrency keep-alive clients; returns a summary dict"""
+    parsed = urlparse(url)
+    path = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+    headers = {'Authorization': f"Bearer {token}"} if token else {}
+    latencies, statuses = [], {}
+    lock = threading.Lock()
+    remaining = [total]
+
+    def worker():
+        conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=30)
+        etag = None
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    break
+                remaining[0] -= 1
+            request_headers = dict(headers)
+            if conditional and etag:
+                request_headers['If-None-Match'] = etag
+            started = time.perf_counter()
+            conn.request('GET', path, headers=request_headers)
+            response = conn.getresponse()
+            response.read()
+            elapsed = time.perf_counter() - started
+            etag = response.getheader('ETag') or etag
+            with lock:
+                latencies.append(elapsed)
+                statuses[response.status] = statuses.get(response.status, 0) + 1
+        conn.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    duration = time.perf_counter() - started
+
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    return {
+        'requests': len(latencies),
+        'seconds': round(duration, 3),
+        'requests_per_second': round(len(latencies) / duration, 1),
+        'p50_ms': round(pick(0.50), 2),
+        'p95_ms': round(pick(0.95), 2),
+        'p99_ms': round(pick(0.99), 2),
+        'statuses': statuses,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test a RepairPro HTTP endpoint")
+    parser.add_argument("url")
+    parser.add_argument("--token", default=None)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--conditional", action="store_true", help="Send If-None-Match with the last ETag")
+    args = parser.parse_args()
+    for key, value in run_load(args.url, args.token, args.requests, args.concurrency, args.conditional).items():
+        print(f"{key:>20}: {value}")
@@ -0,0 +1,106 @@
+"""Lightweight public repair-status endpoint, served separately from the Streamlit UI.
+
+    python api/statusserver.py --port 8502
+
+GET /status/<job_id> or /repair_status?job_id=<job_id> returns the job's status as JSON:
+device model, status and store contact only (see PUBLIC_STATUS_FIELDS). Listens on
+127.0.0.1 unless --host says otherwise.
+"""
+import sys
+import os
+import json
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.datamanager.repairstatus import get_status_service, get_status_rate_limiter, public_status
+
+
+class StatusRequestHandler(BaseHTTPRequestHandler):
+    server_version = "RepairProStatus/1.0"
+    trust_proxy = False
+
+    def _client_ip(self):
+        if self.trust_proxy:
+            forwarded = self.headers.get('X-Forwarded-For')
+            if forwarded:
+                return forwarded.split(',')[0].strip()
+        return self.client_address[0]
+
+    def _send_json(self, code, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _job_id(self):
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split('/') if p]
+        if len(parts) == 2 and parts[0] == 'status':
+            return parts[1]
+        if parts == ['repair_status']:
+            return parse_qs(url.query).get('job_id', [None])[0]
+        return None
+
+    def do_GET(self):
+        if urlparse(self.path).path == '/health':
+            self._send_json(200, {'status': 'ok'})
+            return
+
+        job_id = self._job_id()
+        if job_id is None:
+            self._send_json(404, {'error': 'not found'})
+            return
+        if not job_id.isdigit():
+            self._send_json(400, {'error': 'job_id must be numeric'})
+            return
+
+        allowed, retry_after = get_status_rate_limiter().allow(self._client_ip())
+        if not allowed:
+            self._send_json(429, {'error': 'too many requests'}, {'Retry-After': str(max(1, round(retry_after)))})
+            return
+
+        try:
+            record = get_status_service().get(int(job_id))
+        except Exception as e:
+            print("Status lookup error:", e)
+            self._send_json(500, {'error': 'lookup failed'})
+            return
+
+        if record is None:
+            self._send_json(404, {'error': f'job {job_id} not found'})
+        else:
+            self._send_json(200, public_status(record))
+
+    def log_message(self, format, *args):
+        # Per-request logging would dominate the cost of cached lookups
+        pass
+
+
+def run_status_server(host="127.0.0.1", port=8502, db_path=None, trust_proxy=False):
+    get_status_service(db_path)
+    StatusRequestHandler.trust_proxy = trust_proxy
+    server = ThreadingHTTPServer((host, port), StatusRequestHandler)
+    server.daemon_threads = True
+    print(f"Repair status service listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="RepairPro public repair-status endpoint")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address; use 0.0.0.0 to expose it")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--db", default=None, help="SQLite database path (default: $REPAIRPRO_DB or repairpro.db)")
+    parser.add_argument("--trust-proxy", action="store_true", help="Rate-limit by X-Forwarded-For")
+    args = parser.parse_args()
+    run_status_server(args.host, args.port, args.db, args.trust_proxy)
@@ -0,0 +1,86 @@
+"""Measure login latency and throughput for a shift-start burst of concurrent logins.
+
+    python benchmarks/bench_login.py --users 200 --concurrency 16
+
+Builds a temporary database with --users technicians, logs each one in from
+--concurrency threads and reports p50/p95/p99 latency and logins per second.
+Use a cheap KDF setting (the default here) to isolate the database path from
+password hashing cost, or pass --real-kdf to include it.
+"""
+import sys
+import os
+import time
+import argparse
+import tempfile
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def seed_users(db_path, count, hash_password):
+    from components.datamanager.databasemanger import DatabaseManager
+    db = DatabaseManager(db_path)
+    conn = db.get_connection()
+    store_id = conn.execute("SELECT id FROM stores ORDER BY id LIMIT 1").fetchone()[0]
+    stored = hash_password("shift-start")
+    conn.executemany(
+        "INSERT INTO users (username, password, role, full_name, email, store_id) VALUES (?, ?, 'technician', ?, ?, ?)",
+        [(f"bench_tech_{i}", stored, f"Bench Tech {i}", f"bench{i}@example.com", store_id) for i in range(count)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def run_burst(authenticate_user, users, concurrency, rounds):
+    """Log every user in `rounds` times; returns per-login latencies and elapsed seconds"""
+    def login(i):
+        started = time.perf_counter()
+        user = authenticate_user(f"bench_tech_{i % users}", "shift-start")
+        if user is None:
+            raise RuntimeError(f"login failed for bench_tech_{i % users}")
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(login, range(users * rounds)))
+    return latencies, time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark concurrent logins")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=3, help="Logins per user")
+    parser.add_argument("--real-kdf", action="store_true", help="Use the configured password KDF instead of a cheap one")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="repairpro-bench-")
+    os.environ["REPAIRPRO_DB"] = os.path.join(workdir, "bench.db")
+    if not args.real_kdf:
+        os.environ.setdefault("REPAIRPRO_PASSWORD_SCHEME", "pbkdf2_sha256")
+        os.environ.setdefault("REPAIRPRO_PBKDF2_ITERATIONS", "1000")
+    os.environ.setdefault("REPAIRPRO_HASH_WORKERS", str(args.concurrency))
+
+    # Imported after the environment is set so the settings above take effect
+    from components.utils.auth import authenticate_user
+    from components.utils.passwordhash import hash_password
+    from components.datamanager.lastloginwriter import get_last_login_writer
+
+    seed_users(os.environ["REPAIRPRO_DB"], args.users, hash_password)
+    authenticate_user("bench_tech_0", "shift-start")  # warm the pool
+
+    latencies, elapsed = run_burst(authenticate_user, args.users, args.concurrency, args.rounds)
+    writer = get_last_login_writer(os.environ["REPAIRPRO_DB"])
+    writer.flush()
+
+    ms = [s * 1000 for s in latencies]
+    print(f"{len(ms)} logins, {args.users} users, {args.concurrency} threads")
+    print(f"  p50 {percentile(ms, 50):7.2f} ms  p95 {percentile(ms, 95):7.2f} ms  "
+          f"p99 {percentile(ms, 99):7.2f} ms  mean {statistics.mean(ms):7.2f} ms")
+    print(f"  {len(ms) / elapsed:.1f} logins/s")
+    print(f"  last_login writes: {writer.flushed_rows} rows in {writer.flushed_batches} batches")
@@ -0,0 +1,77 @@
+"""Size the password KDF work factor to a target login latency on this machine.
+
+    python benchmarks/bench_password_hash.py --target-ms 250
+
+Prints the measured verify time for each candidate setting and the environment
+variables for the strongest setting that stays under the target.
+"""
+import sys
+import os
+import time
+import argparse
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.utils.passwordhash import hash_password, verify_password, HASH_WORKERS
+
+SCRYPT_CANDIDATES = [2 ** k for k in range(12, 19)]
+PBKDF2_CANDIDATES = [100000, 200000, 300000, 600000, 900000, 1200000]
+
+
+def time_verify(stored, rounds):
+    """Median seconds for one verification"""
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        verify_password("benchmark-password", stored)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def pool_throughput(stored, workers, logins):
+    """Verifications per second with the given number of hashing workers"""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        started = time.perf_counter()
+        list(pool.map(lambda _: verify_password("benchmark-password", stored), range(logins)))
+        return logins / (time.perf_counter() - started)
+
+
+def size_work_factor(scheme, target_ms, rounds):
+    best = None
+    candidates = SCRYPT_CANDIDATES if scheme == "scrypt" else PBKDF2_CANDIDATES
+    for factor in candidates:
+        params = {"n": factor} if scheme == "scrypt" else {"iterations": factor}
+        stored = hash_password("benchmark-password", scheme, **params)
+        median_ms = time_verify(stored, rounds) * 1000
+        marker = "ok" if median_ms <= target_ms else "over target"
+        print(f"  {scheme:>14} {factor:>9}: {median_ms:8.1f} ms  ({marker})")
+        if median_ms <= target_ms:
+            best = (factor, stored, median_ms)
+        else:
+            break
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark password KDF settings")
+    parser.add_argument("--target-ms", type=float, default=250, help="Target single-login verify latency")
+    parser.add_argument("--scheme", choices=["scrypt", "pbkdf2_sha256"], default="scrypt")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=HASH_WORKERS, help="Hashing pool size to test throughput with")
+    args = parser.parse_args()
+
+    print(f"Sizing {args.scheme} for a {args.target_ms:.0f} ms verify target on {os.cpu_count()} CPUs")
+    best = size_work_factor(args.scheme, args.target_ms, args.rounds)
+    if best is None:
+        print("No candidate meets the target; lower the work factor range or raise --target-ms")
+        sys.exit(1)
+
+    factor, stored, median_ms = best
+    throughput = pool_throughput(stored, args.workers, args.workers * 4)
+    print(f"\nRecommended: {median_ms:.1f} ms per login, ~{throughput:.1f} logins/s with {args.workers} hashing workers")
+    print(f"  REPAIRPRO_PASSWORD_SCHEME={args.scheme}")
+    if args.scheme == "scrypt":
+        print(f"  REPAIRPRO_SCRYPT_N={factor}")
+    else:
+        print(f"  REPAIRPRO_PBKDF2_ITERATIONS={factor}")
+    print(f"  REPAIRPRO_HASH_WORKERS={args.workers}")
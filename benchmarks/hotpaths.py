@@ -0,0 +1,318 @@
+"""Hot-path benchmark definitions used by benchmarks/suite.py.
+
+Each benchmark is a function taking a BenchContext and doing one unit of the
+real work a page does. Streamlit calls inside the app code run in bare mode.
+"""
+import sys
+import os
+import io
+import itertools
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import streamlit as st
+from components.datamanager.databasemanger import DatabaseManager
+from components.datamanager.jobqueries import fetch_jobs_by_status
+from components.datamanager.customerdirectory import fetch_customer_page, count_customers, fetch_recent_jobs
+from components.datamanager.technicianworkload import get_technician_workload
+from components.datamanager.technicianworkspace import get_technician_workspace
+from components.datamanager.deviceregistry import device_history
+from components.utils.auth import authenticate_user
+from components.utils.createjob import create_job_in_database
+from components.utils.pdf import generate_invoice_pdf_stream
+from components.utils.randomdata import DEFAULT_PASSWORD
+from components.report import adminanalytics, manageranalytics, techniciananalytics
+from components.report.reportcache import rollup_version
+from components.report.timeseries import get_timeseries_service
+from components.report.daterange import day_range_condition
+from pages.screens.techniciandashboard import update_job_status
+from pages.screens.storemanagement import store_management
+
+BENCHMARKS = []
+
+
+def benchmark(name):
+    """Register a benchmark under a dotted name"""
+    def register(func):
+        BENCHMARKS.append((name, func))
+        return func
+    return register
+
+
+class UploadedPhoto(io.BytesIO):
+    """Stand-in for Streamlit's UploadedFile (getvalue() and name)"""
+
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+
+
+class BenchContext:
+    """Connection and representative users, jobs and dates for one fixture database"""
+
+    def __init__(self, db_path, scale):
+        self.db_path = db_path
+        self.scale = scale
+        self.conn = DatabaseManager(db_path).get_connection()
+        cursor = self.conn.cursor()
+
+        # The busiest store gives the worst-case manager and technician views
+        cursor.execute("SELECT store_id FROM jobs GROUP BY store_id ORDER BY COUNT(*) DESC LIMIT 1")
+        self.store_id = cursor.fetchone()[0]
+        self.users = {
+            "admin": self._user(cursor, "SELECT id FROM users WHERE role = 'admin' ORDER BY id LIMIT 1"),
+            "manager": self._user(cursor, "SELECT id FROM users WHERE role = 'manager' AND store_id = ? LIMIT 1", (self.store_id,)),
+            "staff": self._user(cursor, "SELECT id FROM users WHERE role = 'staff' AND store_id = ? LIMIT 1", (self.store_id,)),
+            "technician": self._user(cursor, '''
+                SELECT ta.technician_id FROM technician_assignments ta
+                JOIN users u ON u.id = ta.technician_id
+                WHERE u.store_id = ?
+                GROUP BY ta.technician_id ORDER BY COUNT(*) DESC LIMIT 1
+            ''', (self.store_id,)),
+        }
+
+        cursor.execute("SELECT MAX(created_at) FROM jobs")
+        last = cursor.fetchone()[0]
+        cursor.execute("SELECT date(?, '-30 days'), date(?, '+1 day')", (last, last))
+        self.start_date, self.end_date = cursor.fetchone()
+        cursor.execute("SELECT date(MIN(created_at)) FROM jobs")
+        self.history_start = cursor.fetchone()[0]
+
+        cursor.execute("SELECT id FROM jobs WHERE status = 'Completed' ORDER BY id DESC LIMIT 1")
+        self.completed_job_id = cursor.fetchone()[0]
+        cursor.execute("SELECT name FROM customers ORDER BY id LIMIT 1")
+        self.customer_search = cursor.fetchone()[0].split()[-1]
+        cursor.execute("SELECT device_key FROM devices ORDER BY id DESC LIMIT 1")
+        row = cursor.fetchone()
+        self.device_key = row[0] if row else "490154203237518"
+
+        technician = self.users["technician"]["id"]
+        cursor.execute('''
+            SELECT aj.job_id FROM assignment_jobs aj
+            JOIN technician_assignments ta ON ta.id = aj.assignment_id
+            WHERE ta.technician_id = ?
+            ORDER BY aj.job_id DESC LIMIT 50
+        ''', (technician,))
+        self.status_targets = itertools.cycle(
+            itertools.product([r[0] for r in cursor.fetchall()], ["In Progress", "Pending", "Completed"])
+        )
+        self.photos = [UploadedPhoto(os.urandom(200 * 1024), f"photo_{i}.jpg") for i in range(3)]
+        self.created = 0
+
+    @staticmethod
+    def _user(cursor, query, params=()):
+        cursor.execute(query, params)
+        user_id = cursor.fetchone()[0]
+        cursor.execute('''
+            SELECT u.id, u.username, u.role, u.store_id, u.full_name, u.email, COALESCE(s.name, 'All Stores')
+            FROM users u LEFT JOIN stores s ON s.id = u.store_id WHERE u.id = ?
+        ''', (user_id,))
+        keys = ("id", "username", "role", "store_id", "full_name", "email", "store_name")
+        return dict(zip(keys, cursor.fetchone()))
+
+    def where(self, role):
+        """The where clause and params the analytics page builds for a role"""
+        sql, params = day_range_condition("j.created_day", self.start_date, self.end_date)
+        if role == "manager":
+            return f"{sql} AND j.store_id = ?", params + [self.store_id]
+        if role == "technician":
+            return f'''
+                {sql}
+                AND EXISTS (
+                    SELECT 1 FROM technician_assignments ta
+                    JOIN assignment_jobs aj ON ta.id = aj.assignment_id
+                    WHERE aj.job_id = j.id AND ta.technician_id = ?
+                )
+            ''', params + [self.users["technician"]["id"]]
+        return sql, params
+
+    def close(self):
+        self.conn.close()
+
+
+# --- Jobs page tabs, per role -------------------------------------------------
+
+JOB_TABS = {
+    "new": ("New", None),
+    "in_progress": ("In Progress", None),
+    "completed": ("Completed", None),
+    "payment_pending": ("Completed", "pending"),
+    "payment_completed": ("Completed", "completed"),
+}
+
+
+def _register_job_tab(role, tab, status, payment_filter):
+    @benchmark(f"jobs.by_status.{role}.{tab}")
+    def run(ctx):
+        fetch_jobs_by_status(ctx.conn, ctx.users[role], status, payment_filter)
+
+
+for _role in ("admin", "manager", "technician"):
+    for _tab, (_status, _payment) in JOB_TABS.items():
+        _register_job_tab(_role, _tab, _status, _payment)
+
+
+@benchmark("jobs.search.admin")
+def jobs_search(ctx):
+    fetch_jobs_by_status(ctx.conn, ctx.users["admin"], "Completed", search_term=ctx.customer_search)
+
+
+# --- Customers ----------------------------------------------------------------
+
+@benchmark("customers.search")
+def customers_search(ctx):
+    page = fetch_customer_page(ctx.conn, None, ctx.customer_search, include_store_name=True)
+    count_customers(ctx.conn, None, ctx.customer_search)
+    fetch_recent_jobs(ctx.conn, page["id"].tolist())
+
+
+@benchmark("customers.directory_page")
+def customers_directory(ctx):
+    page = fetch_customer_page(ctx.conn, ctx.store_id)
+    count_customers(ctx.conn, ctx.store_id)
+    fetch_recent_jobs(ctx.conn, page["id"].tolist())
+
+
+# --- Login and job writes -----------------------------------------------------
+
+@benchmark("auth.authenticate_user")
+def login(ctx):
+    authenticate_user(ctx.users["technician"]["username"], DEFAULT_PASSWORD)
+
+
+@benchmark("jobs.create_with_photos")
+def create_job(ctx):
+    ctx.created += 1
+    job_data = {
+        "customer_name": f"Bench Customer {ctx.created}",
+        "customer_phone": f"55500{ctx.created:05d}",
+        "customer_email": None,
+        "customer_address": None,
+        "device_type": "Smartphone",
+        "device_model": "iPhone 15",
+        "device_password_type": "None",
+        "device_password": "",
+        "problem_description": "Cracked screen",
+        "deposit_cost": 20,
+        "estimate_cost": 120,
+        "notification_methods": ["SMS"],
+        "assigned_by": ctx.users["staff"]["id"],
+        "selected_store_id": ctx.store_id,
+        "technician_id": ctx.users["technician"]["id"],
+    }
+    for photo in ctx.photos:
+        photo.seek(0)
+    create_job_in_database(ctx.conn, None, ctx.users["staff"], job_data, ctx.photos)
+
+
+@benchmark("jobs.update_status")
+def job_status(ctx):
+    job_id, status = next(ctx.status_targets)
+    update_job_status(ctx.conn, job_id, status, ctx.users["technician"]["id"])
+
+
+@benchmark("devices.history_lookup")
+def device_lookup(ctx):
+    device_history(ctx.conn, ctx.device_key)
+
+
+@benchmark("invoice.generate_pdf")
+def invoice(ctx):
+    generate_invoice_pdf_stream(ctx.completed_job_id, "Completed")
+
+
+# --- Technician dashboard -----------------------------------------------------
+
+@benchmark("technician.board_refresh")
+def technician_board(ctx):
+    # Warm after the first repeat: later runs only read jobs changed by the write benchmarks
+    board = get_technician_workspace().open(ctx.conn, ctx.users["technician"]["id"])
+    board.summary(ctx.conn)
+    board.active_jobs()
+
+
+# --- Reports ------------------------------------------------------------------
+
+@benchmark("report.admin.executive_dashboard")
+def admin_executive(ctx):
+    adminanalytics.executive_dashboard(ctx.conn, *ctx.where("admin"), "All Stores")
+
+
+@benchmark("report.admin.store_performance")
+def admin_store_performance(ctx):
+    adminanalytics.store_performance_analysis(ctx.conn, ctx.start_date, ctx.end_date)
+
+
+@benchmark("report.admin.customer_analytics")
+def admin_customers(ctx):
+    adminanalytics.customer_analytics(ctx.conn, *ctx.where("admin"))
+
+
+@benchmark("report.admin.operations_analysis")
+def admin_operations(ctx):
+    adminanalytics.operations_analysis(ctx.conn, *ctx.where("admin"))
+
+
+@benchmark("report.admin.financial_deep_dive")
+def admin_financial(ctx):
+    adminanalytics.financial_deep_dive(ctx.conn, *ctx.where("admin"))
+
+
+@benchmark("report.manager.store_dashboard")
+def manager_store(ctx):
+    manageranalytics.store_dashboard(ctx.conn, *ctx.where("manager"), ctx.store_id, ctx.users["manager"])
+
+
+@benchmark("report.manager.team_performance")
+def manager_team(ctx):
+    manageranalytics.team_performance(ctx.conn, *ctx.where("manager"), ctx.store_id)
+
+
+@benchmark("report.manager.customer_management")
+def manager_customers(ctx):
+    manageranalytics.customer_management(ctx.conn, *ctx.where("manager"), ctx.store_id)
+
+
+@benchmark("report.manager.revenue_analysis")
+def manager_revenue(ctx):
+    manageranalytics.revenue_analysis(ctx.conn, *ctx.where("manager"))
+
+
+@benchmark("report.technician.performance")
+def technician_performance(ctx):
+    techniciananalytics.technician_performance(ctx.conn, *ctx.where("technician"), ctx.users["technician"]["id"])
+
+
+@benchmark("report.technician.device_specialization")
+def technician_devices(ctx):
+    techniciananalytics.device_specialization(ctx.conn, *ctx.where("technician"), ctx.users["technician"]["id"])
+
+
+@benchmark("report.technician.work_efficiency")
+def technician_efficiency(ctx):
+    techniciananalytics.work_efficiency(ctx.conn, *ctx.where("technician"), ctx.users["technician"]["id"])
+
+
+@benchmark("report.admin.revenue_trend_full_history")
+def admin_revenue_history(ctx):
+    # Cold build: the whole history is bucketed and capped rather than drawn per day
+    get_timeseries_service().clear('jobs.revenue_trend')
+    adminanalytics.executive_dashboard(
+        ctx.conn, *day_range_condition("j.created_day", ctx.history_start, ctx.end_date), "All Stores"
+    )
+
+
+@benchmark("report.rollup_version")
+def report_rollup(ctx):
+    rollup_version(ctx.conn, ctx.users["admin"], ctx.start_date, ctx.end_date)
+
+
+# --- Store Management ---------------------------------------------------------
+
+@benchmark("stores.management_page")
+def stores_page(ctx):
+    st.session_state.user = ctx.users["admin"]
+    store_management()
+
+
+@benchmark("stores.technician_workload")
+def stores_workload(ctx):
+    get_technician_workload(ctx.conn)
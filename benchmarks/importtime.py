@@ -0,0 +1,110 @@
+"""Startup import-time report and budget check.
+
+    python benchmarks/importtime.py                 # check every scenario in import_budget.json
+    python benchmarks/importtime.py --top 20        # show more of the per-package breakdown
+
+Each scenario imports some modules in a fresh interpreter under `python -X importtime`,
+the same data `-X importtime` prints, summed per top-level package. A scenario fails when
+its best run is over budget_ms, or when it imports anything listed under "forbidden"
+(a module name also matches its submodules). Exits 1 on any failure; the CI workflow
+(.github/workflows/ci.yml) runs it on every push and pull request.
+"""
+import sys
+import os
+import re
+import json
+import argparse
+import subprocess
+from collections import defaultdict
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+BUDGET_PATH = os.path.join(BENCH_DIR, "import_budget.json")
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure(imports):
+    """Parse one -X importtime run: (total_ms, {module: (self_us, cumulative_us, depth)})"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(imports)}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, timeout=300
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {', '.join(imports)} failed:\n{proc.stderr[-2000:]}")
+    modules = {}
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = int(match[1]), int(match[2]), match[3], match[4]
+        depth = (len(indent) - 1) // 2
+        modules[name] = (self_us, cumulative_us, depth)
+        if depth == 0:
+            total_us += cumulative_us
+    return total_us / 1000, modules
+
+
+def by_package(modules):
+    """Self time per top-level package, in milliseconds"""
+    totals = defaultdict(float)
+    for name, (self_us, _, _) in modules.items():
+        totals[name.split(".")[0]] += self_us / 1000
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def forbidden_imports(modules, forbidden):
+    return sorted(name for name in modules
+                  if any(name == f or name.startswith(f + ".") for f in forbidden))
+
+
+def check_scenario(name, spec, runs, top):
+    # The first run also byte-compiles anything stale, so it is never the best one
+    measure(spec["imports"])
+    results = [measure(spec["imports"]) for _ in range(runs)]
+    best_ms, modules = min(results, key=lambda r: r[0])
+
+    print(f"\n{name}: import {', '.join(spec['imports'])}")
+    print(f"  {best_ms:8.1f} ms (best of {runs}), budget {spec['budget_ms']} ms, {len(modules)} modules")
+    for package, ms in by_package(modules)[:top]:
+        print(f"    {package:<30} {ms:8.1f} ms")
+
+    failures = []
+    if best_ms > spec["budget_ms"]:
+        failures.append(f"{best_ms:.0f} ms is over the {spec['budget_ms']} ms budget")
+    loaded = forbidden_imports(modules, spec.get("forbidden", []))
+    if loaded:
+        failures.append(f"imports {', '.join(loaded[:10])}{' ...' if len(loaded) > 10 else ''}")
+    for failure in failures:
+        print(f"  ❌ {failure}")
+    if not failures:
+        print("  ✅ within budget")
+    return {"ms": round(best_ms, 1), "budget_ms": spec["budget_ms"], "failures": failures,
+            "packages": {package: round(ms, 1) for package, ms in by_package(modules)}}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check startup import time against a budget")
+    parser.add_argument("--budget", default=BUDGET_PATH)
+    parser.add_argument("--scenario", default=None, help="Only run this scenario")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=8, help="Packages to list per scenario")
+    parser.add_argument("--output", default=None, help="Write the report as JSON")
+    args = parser.parse_args()
+
+    with open(args.budget) as f:
+        scenarios = json.load(f)["scenarios"]
+    if args.scenario:
+        scenarios = {args.scenario: scenarios[args.scenario]}
+
+    report = {name: check_scenario(name, spec, args.runs, args.top) for name, spec in scenarios.items()}
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    failed = [name for name, result in report.items() if result["failures"]]
+    if failed:
+        sys.exit(f"\nStartup budget exceeded: {', '.join(failed)}")
+    print("\nAll scenarios within budget")
@@ -0,0 +1,189 @@
+"""Benchmark suite for the data-access hot paths.
+
+    python benchmarks/suite.py                          # small and medium, compared to the baseline
+    python benchmarks/suite.py --scales large --filter report.
+    python benchmarks/suite.py --save-baseline          # store this run as the baseline
+    python benchmarks/suite.py --ci                     # as the default, but a missing baseline fails
+
+Benchmarks (benchmarks/hotpaths.py) call the same functions the pages use, against
+fixture databases built by components/utils/randomdata.py and cached under
+benchmarks/.fixtures. Each scale runs on a scratch copy, so write benchmarks never
+touch the cached fixture. Streamlit runs in bare mode; no server is needed.
+
+Results are written as JSON (--output). When a baseline exists, any benchmark whose
+median is more than --threshold slower is flagged and the exit status is 1. The
+baseline is checked in as benchmarks/baseline.json; re-record it with --save-baseline
+when a change is meant to move the numbers.
+"""
+import sys
+import os
+import json
+import time
+import shutil
+import sqlite3
+import platform
+import argparse
+import tempfile
+import traceback
+import statistics
+import subprocess
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(BENCH_DIR, ".fixtures")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+# Differences below this are timer noise, whatever the ratio
+MIN_REGRESSION_MS = 2.0
+
+
+def fixture_path(scale, seed):
+    """Cached fixture for a scale, generated on first use"""
+    from components.utils.randomdata import SCALES, generate
+    path = os.path.join(FIXTURE_DIR, f"{scale}-seed{seed}.db")
+    if not os.path.exists(path):
+        os.makedirs(FIXTURE_DIR, exist_ok=True)
+        print(f"Generating {scale} fixture (seed {seed})...")
+        partial = path + ".partial"
+        if os.path.exists(partial):
+            os.remove(partial)
+        generate(partial, seed=seed, **SCALES[scale])
+        os.replace(partial, path)
+    return path
+
+
+def time_call(func, ctx, repeat, warmup):
+    """Run func(ctx) warmup + repeat times; returns timing stats in milliseconds"""
+    for _ in range(warmup):
+        func(ctx)
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(ctx)
+        samples.append((time.perf_counter() - started) * 1000)
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "min_ms": round(min(samples), 3),
+        "max_ms": round(max(samples), 3),
+        "runs": repeat,
+    }
+
+
+def run_scale(scale, seed, benchmarks, repeat, warmup):
+    from benchmarks.hotpaths import BenchContext
+    workdir = tempfile.mkdtemp(prefix="repairpro-suite-")
+    db_path = os.path.join(workdir, f"{scale}.db")
+    shutil.copyfile(fixture_path(scale, seed), db_path)
+    # App code that opens its own DatabaseManager() follows the scratch copy
+    os.environ["REPAIRPRO_DB"] = db_path
+
+    ctx = BenchContext(db_path, scale)
+    results = {}
+    try:
+        for name, func in benchmarks:
+            try:
+                results[name] = time_call(func, ctx, repeat, warmup)
+                print(f"  {scale:>6}  {name:<45} {results[name]['median_ms']:10.2f} ms")
+            except Exception as e:
+                frame = traceback.extract_tb(e.__traceback__)[-1]
+                results[name] = {"error": f"{type(e).__name__}: {e} ({os.path.basename(frame.filename)}:{frame.lineno})"}
+                print(f"  {scale:>6}  {name:<45} ERROR {results[name]['error']}")
+    finally:
+        ctx.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Regressions as (scale, name, baseline_ms, current_ms) tuples"""
+    regressions = []
+    for scale, entries in results.items():
+        for name, current in entries.items():
+            previous = baseline.get("results", {}).get(scale, {}).get(name)
+            if not previous or "median_ms" not in previous or "median_ms" not in current:
+                continue
+            before, after = previous["median_ms"], current["median_ms"]
+            if after > before * (1 + threshold) and after - before > MIN_REGRESSION_MS:
+                regressions.append((scale, name, before, after))
+    return regressions
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the data-access hot paths at several dataset scales")
+    parser.add_argument("--scales", default="small,medium", help="Comma-separated: small, medium, large")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--filter", default="", help="Only benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--output", default=None, help="Results JSON (default benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown before flagging, as a fraction")
+    parser.add_argument("--save-baseline", action="store_true", help="Write this run to --baseline")
+    parser.add_argument("--ci", action="store_true", help="Fail instead of skipping the comparison when there is no baseline")
+    args = parser.parse_args()
+
+    from benchmarks.hotpaths import BENCHMARKS
+    # Silence bare-mode and deprecation warnings from the page code; the config must be
+    # parsed first or it resets the level on the first Streamlit call
+    from streamlit import config
+    from streamlit.logger import set_log_level
+    config.get_option("logger.level")
+    set_log_level("error")
+
+    selected = [(name, func) for name, func in BENCHMARKS if args.filter in name]
+    if not selected:
+        sys.exit(f"No benchmarks match '{args.filter}'")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git": git_revision(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": {},
+    }
+    for scale in [s.strip() for s in args.scales.split(",") if s.strip()]:
+        report["results"][scale] = run_scale(scale, args.seed, selected, args.repeat, args.warmup)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        sys.exit(0)
+
+    if not os.path.exists(args.baseline):
+        print("No baseline yet; run with --save-baseline to record one")
+        sys.exit(1 if args.ci else 0)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(report["results"], baseline, args.threshold)
+    errors = [(scale, name) for scale, entries in report["results"].items()
+              for name, result in entries.items() if "error" in result]
+    print(f"Compared with baseline from {baseline['meta'].get('timestamp')} ({baseline['meta'].get('git')})")
+    for scale, name, before, after in regressions:
+        print(f"  ⚠️  {scale:>6}  {name:<45} {before:9.2f} -> {after:9.2f} ms  (+{(after / before - 1) * 100:.0f}%)")
+    for scale, name in errors:
+        print(f"  ❌ {scale:>6}  {name} failed")
+    if regressions or errors:
+        sys.exit(1)
+    print("  No regressions")
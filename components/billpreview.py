@@ -2,7 +2,6 @@ import streamlit as st
 import pandas as pd
 import os
 import sys
-import qrcode
 import io
 from datetime import datetime
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -37,6 +36,7 @@ def display_bill_preview(conn, job_id, customer_name, customer_phone, device_typ
     col1, col2 = st.columns(2)
     st.markdown("#### Status QR Code")
     try:
+        import qrcode
         qr_url = f"https://jayanth119-refactored-jobsheet-main-vtllnj.streamlit.app//repair_status?job_id={job_id}"
         qr = qrcode.QRCode(
             version=1,
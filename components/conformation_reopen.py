@@ -1,5 +1,10 @@
 import streamlit as st 
 import pandas as pd
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.datamanager.jobstatus import apply_job_status
+from components.datamanager.repairstatus import invalidate_job_status
 def show_reopen_confirmation_modal(conn, job_id):
     """Show confirmation modal for reopening a completed job"""
     
@@ -44,9 +49,9 @@ def show_reopen_confirmation_modal(conn, job_id):
                     cursor = conn.cursor()
                     
                     # Update job status back to "In Progress"
-                    cursor.execute(
-                        "UPDATE jobs SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
-                        ("In Progress", job_id)
+                    apply_job_status(
+                        cursor, job_id, "In Progress",
+                        actor=st.session_state.get('user', {}).get('id')
                     )
                     
                     # Add a note to job history/comments if reason provided
@@ -62,6 +67,7 @@ def show_reopen_confirmation_modal(conn, job_id):
                             pass
                     
                     conn.commit()
+                    invalidate_job_status(job_id)
                     
                     # Clear session state
                     for key in list(st.session_state.keys()):
@@ -5,10 +5,25 @@ import os
 import sys 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from components.datamanager.databasemanger import DatabaseManager
+from components.datamanager.deviceregistry import normalize_device_key, is_imei, register_device
+from components.devicehistory import display_device_history
 
 def create_old_mobile_form():
     st.header("Register Old Mobile Phone")
     
+    # Set before the IMEI input exists, so a registered IMEI is not carried into the next record
+    if st.session_state.pop("old_mobile_saved", False):
+        st.session_state["old_mobile_imei"] = ""
+        st.success("✅ Old mobile record registered successfully!")
+    
+    # Outside the form so earlier trade-ins and repairs show as soon as the IMEI is typed
+    imei_number = st.text_input("IMEI Number (Optional)", placeholder="Enter 15-digit IMEI", key="old_mobile_imei")
+    imei_number = normalize_device_key(imei_number)
+    if imei_number:
+        conn = DatabaseManager().get_connection()
+        display_device_history(conn, imei_number)
+        conn.close()
+    
     with st.form("old_mobile_form", clear_on_submit=True):
         col1, col2 = st.columns(2)
         
@@ -33,7 +48,6 @@ def create_old_mobile_form():
                 mobile_brand = ""  # Set to empty if no brand selected
             
             mobile_model = st.text_input("Mobile Model *", placeholder="e.g., iPhone 14, Galaxy S23")
-            imei_number = st.text_input("IMEI Number (Optional)", placeholder="Enter 15-digit IMEI")
             
             repair_status = st.selectbox("Repair Status *", [
                 "Working", "Not Working", "Partially Working", "Screen Damaged", 
@@ -81,8 +95,8 @@ def create_old_mobile_form():
                 st.error("Please enter a valid 12-digit Aadhar number")
                 return
             
-            # Validate IMEI if provided
-            if imei_number and (len(imei_number) != 15 or not imei_number.isdigit()):
+            # Validate IMEI if provided, including its Luhn check digit
+            if imei_number and not is_imei(imei_number):
                 st.error("Please enter a valid 15-digit IMEI number")
                 return
             
@@ -92,7 +106,8 @@ def create_old_mobile_form():
                 mobile_brand, mobile_model, imei_number, repair_status, warranty_status, repair_description,
                 estimated_value, purchase_date, accessories_included, notes
             ):
-                st.success("✅ Old mobile record registered successfully!")
+                st.session_state.old_mobile_saved = True
+                st.rerun()
             else:
                 st.error("❌ Failed to register record. Please try again.")
 
@@ -122,6 +137,8 @@ def save_old_mobile_record(customer_name, customer_phone, customer_email, aadhar
         # Handle purchase_date - convert to string or None
         purchase_date_str = purchase_date.strftime('%Y-%m-%d') if purchase_date else None
         
+        created_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
         # Insert record
         cursor.execute('''
             INSERT INTO old_mobiles (
@@ -132,9 +149,13 @@ def save_old_mobile_record(customer_name, customer_phone, customer_email, aadhar
         ''', (
             customer_name, customer_phone, customer_email, aadhar_number, customer_address,
             mobile_brand, mobile_model, imei_number, repair_status, warranty_status, repair_description,
-            estimated_value, purchase_date_str, accessories_str, notes, store_id, datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            estimated_value, purchase_date_str, accessories_str, notes, store_id, created_at
         ))
         
+        # Link the record to its IMEI in the device registry
+        if imei_number:
+            register_device(cursor, imei_number, 'old_mobile', cursor.lastrowid, mobile_brand, mobile_model, created_at)
+        
         conn.commit()
         conn.close()
         return True
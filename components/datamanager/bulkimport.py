@@ -0,0 +1,464 @@
+"""Bulk import of historical jobs from CSV/XLSX.
+
+    python components/datamanager/bulkimport.py jobs.csv --store "Main Branch" --rejects rejects.csv
+
+Rows are streamed, validated (built-in rules plus the job_schema configuration
+when it exists), and inserted with executemany inside a single transaction.
+Customers are resolved by normalized phone number; serial numbers go to the
+device registry and custom job_schema fields to job_custom_values, through the
+same writers as a job created in the app. Per-row projection and
+table_versions triggers and secondary job indexes are suspended for the load and
+rebuilt (or bumped) once at the end.
+"""
+import sys
+import os
+import io
+import re
+import csv
+import time
+import argparse
+from datetime import datetime, date, timezone
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from components.datamanager.databasemanger import DatabaseManager
+from components.datamanager.technicianworkload import refresh_technician_workload
+from components.datamanager.technicianstats import refresh_technician_stats
+from components.datamanager.dimensions import get_stores, get_technicians
+from components.datamanager.jobschema import get_form_definition
+from components.datamanager.customfields import save_custom_values_batch
+from components.datamanager.deviceregistry import register_devices, normalize_device_key, validate_device_key
+
+IMPORT_BATCH_SIZE = 5000
+# Below this many existing jobs, dropping and rebuilding secondary indexes beats maintaining them
+DEFER_INDEX_THRESHOLD = 200000
+
+JOB_STATUSES = ("New", "In Progress", "Pending", "Completed")
+REQUIRED_COLUMNS = ("customer_name", "customer_phone", "device_type", "problem_description")
+IMPORT_COLUMNS = (
+    "customer_name", "customer_phone", "customer_email", "customer_address",
+    "device_type", "device_model", "device_password_type", "device_password",
+    "problem_description", "notification_methods",
+    "deposit_cost", "estimate_cost", "raw_cost", "actual_cost",
+    "payment_status", "payment_method", "status",
+    "created_at", "started_at", "completed_at",
+    "store", "assigned_technician", "serial_number",
+)
+COST_COLUMNS = ("deposit_cost", "estimate_cost", "raw_cost", "actual_cost")
+DATE_COLUMNS = ("created_at", "started_at", "completed_at")
+# job_schema field names that map onto a differently named import column
+FIELD_ALIASES = {
+    "phone_password": "device_password",
+    "notification_method": "notification_methods",
+    "received_date": "created_at",
+    "deposit_amount": "deposit_cost",
+}
+# Other headers accepted for an import column
+HEADER_ALIASES = {
+    "imei": "serial_number",
+    "imei_number": "serial_number",
+}
+DATE_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%d/%m/%Y", "%d-%m-%Y")
+# job_schema field types validated on import; the rest only need a value when required
+# (device passwords are free-form here and costs are parsed separately). Custom fields,
+# stored typed in job_custom_values, always run their full validation.
+CHECKED_TYPES = ("select", "email", "phone")
+
+
+class RowError(ValueError):
+    pass
+
+
+def normalize_phone(phone):
+    """Digits only, keeping a leading + for international numbers"""
+    text = str(phone or "").strip()
+    digits = re.sub(r"\D", "", text)
+    return ("+" + digits) if text.startswith("+") and digits else digits
+
+
+def read_rows(source, filename=None):
+    """Stream dict rows from a CSV or XLSX path or binary file object"""
+    name = (filename or (source if isinstance(source, str) else "")).lower()
+    if name.endswith((".xlsx", ".xlsm")):
+        from openpyxl import load_workbook
+        workbook = load_workbook(source, read_only=True, data_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(h).strip() if h is not None else "" for h in next(rows, [])]
+        for values in rows:
+            if any(v not in (None, "") for v in values):
+                yield dict(zip(header, values))
+        workbook.close()
+        return
+
+    if isinstance(source, str):
+        handle = open(source, newline="", encoding="utf-8-sig")
+    else:
+        handle = io.TextIOWrapper(source, newline="", encoding="utf-8-sig")
+    with handle:
+        for row in csv.DictReader(handle):
+            if any(_text(v) for v in row.values()):
+                yield row
+
+
+def load_schema_rules(conn, definition=None):
+    """Active compiled job_schema fields keyed by import column (custom fields by their own
+    name); empty when none are configured"""
+    definition = definition or get_form_definition(conn)
+    rules = {
+        FIELD_ALIASES.get(field.name, field.name): field
+        for field in definition.fields
+        if FIELD_ALIASES.get(field.name, field.name) in IMPORT_COLUMNS
+    }
+    rules.update((field.name, field) for field in definition.custom_fields)
+    return rules
+
+
+def map_header(header, rules):
+    """Map file headers to import columns by column name, schema field name or schema label"""
+    lookup = {c: c for c in IMPORT_COLUMNS}
+    lookup.update(FIELD_ALIASES)
+    lookup.update(HEADER_ALIASES)
+    for column, rule in rules.items():
+        lookup.setdefault(column, column)
+        lookup[rule.label.strip().lower()] = column
+    mapping = {}
+    for raw in header:
+        key = str(raw or "").strip().lower()
+        column = lookup.get(key) or lookup.get(key.replace(" ", "_"))
+        if column and column not in mapping.values():
+            mapping[raw] = column
+    return mapping
+
+
+def _text(value):
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def _parse_date(value, column):
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, date):
+        return value.strftime("%Y-%m-%d 00:00:00")
+    text = _text(value)
+    if not text:
+        return None
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).strftime("%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            pass
+    raise RowError(f"{column}: unrecognised date '{text}'")
+
+
+def _parse_cost(value, column):
+    text = _text(value).replace(",", "").lstrip("$₹")
+    if not text:
+        return 0.0
+    try:
+        cost = float(text)
+    except ValueError:
+        raise RowError(f"{column}: not a number '{text}'")
+    if cost < 0:
+        raise RowError(f"{column}: must not be negative")
+    return cost
+
+
+def validate_row(raw, mapping, rules, stores, technicians, default_store_id):
+    """Return a clean job dict or raise RowError"""
+    row = {column: raw.get(header) for header, column in mapping.items()}
+
+    for column in REQUIRED_COLUMNS:
+        if not _text(row.get(column)):
+            raise RowError(f"{column} is required")
+
+    for column, rule in rules.items():
+        if column not in row:
+            continue
+        value = _text(row.get(column))
+        if rule.type in CHECKED_TYPES or column not in IMPORT_COLUMNS:
+            error = rule.validate(value)
+        else:
+            error = f"{rule.label} is required" if rule.required and not value else None
+        if error:
+            raise RowError(error)
+
+    phone = normalize_phone(row.get("customer_phone"))
+    if not 7 <= len(phone.lstrip("+")) <= 15:
+        raise RowError(f"customer_phone: invalid phone '{_text(row.get('customer_phone'))}'")
+
+    status = _text(row.get("status")) or "New"
+    matched = [s for s in JOB_STATUSES if s.lower() == status.lower()]
+    if not matched:
+        raise RowError(f"status: '{status}' is not one of {', '.join(JOB_STATUSES)}")
+    status = matched[0]
+
+    store_name = _text(row.get("store"))
+    if store_name:
+        store_id = stores.get(store_name.lower())
+        if store_id is None:
+            raise RowError(f"store: unknown store '{store_name}'")
+    else:
+        store_id = default_store_id
+
+    technician_name = _text(row.get("assigned_technician"))
+    technician_id = None
+    if technician_name:
+        technician_id = technicians.get(technician_name.lower())
+        if technician_id is None:
+            raise RowError(f"assigned_technician: unknown technician '{technician_name}'")
+
+    # Historical IMEIs are kept even when their check digit fails, as the registry backfill does
+    device_key = normalize_device_key(row.get("serial_number"))
+    device_error = validate_device_key(device_key, check_digit=False)
+    if device_error:
+        raise RowError(f"serial_number: {device_error}")
+
+    job = {column: _text(row.get(column)) or None for column in (
+        "customer_name", "customer_email", "customer_address", "device_type", "device_model",
+        "device_password_type", "device_password", "problem_description", "notification_methods",
+        "payment_method",
+    )}
+    job["customer_phone"] = _text(row.get("customer_phone"))
+    job["phone_key"] = phone
+    job["status"] = status
+    job["payment_status"] = _text(row.get("payment_status")) or "Pending"
+    job["store_id"] = store_id
+    job["technician_id"] = technician_id
+    job["device_key"] = device_key or None
+    job["custom_values"] = {}
+    for column, rule in rules.items():
+        value = _text(row.get(column))
+        if column in IMPORT_COLUMNS or not value:
+            continue
+        if rule.value_column == "value_date":
+            # Stored as a bare date, as the create form's date input saves it
+            value = _parse_date(value, column)[:10]
+        job["custom_values"][column] = value
+    for column in COST_COLUMNS:
+        job[column] = _parse_cost(row.get(column), column)
+    for column in DATE_COLUMNS:
+        job[column] = _parse_date(row.get(column), column)
+    # UTC, like the CURRENT_TIMESTAMP every other write path stamps
+    job["created_at"] = job["created_at"] or datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    if status == "Completed":
+        job["completed_at"] = job["completed_at"] or job["created_at"]
+    return job
+
+
+def _insert_batch(cursor, batch, customers, user_id, definition):
+    """Insert one validated batch; returns the number of new customers"""
+    new_customers = {}
+    for job in batch:
+        if job["phone_key"] not in customers and job["phone_key"] not in new_customers:
+            new_customers[job["phone_key"]] = job
+
+    if new_customers:
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM customers")
+        last_id = cursor.fetchone()[0]
+        cursor.executemany('''
+            INSERT INTO customers (name, phone, email, address, store_id, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', [
+            (j["customer_name"], j["customer_phone"], j["customer_email"], j["customer_address"], j["store_id"], j["created_at"])
+            for j in new_customers.values()
+        ])
+        cursor.execute("SELECT id, phone FROM customers WHERE id > ?", (last_id,))
+        for customer_id, phone in cursor.fetchall():
+            customers[normalize_phone(phone)] = customer_id
+
+    cursor.execute("SELECT COALESCE(MAX(id), 0) FROM jobs")
+    last_job_id = cursor.fetchone()[0]
+    cursor.executemany('''
+        INSERT INTO jobs (
+            customer_id, store_id, device_type, device_model,
+            device_password_type, device_password, notification_methods,
+            problem_description, deposit_cost, raw_cost, estimate_cost, actual_cost,
+            payment_status, payment_method, status, assigned_by,
+            created_at, updated_at, started_at, completed_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', [
+        (
+            customers[j["phone_key"]], j["store_id"], j["device_type"], j["device_model"],
+            j["device_password_type"], j["device_password"], j["notification_methods"],
+            j["problem_description"], j["deposit_cost"], j["raw_cost"], j["estimate_cost"], j["actual_cost"],
+            j["payment_status"], j["payment_method"], j["status"], user_id,
+            j["created_at"], j["completed_at"] or j["started_at"] or j["created_at"], j["started_at"], j["completed_at"]
+        )
+        for j in batch
+    ])
+
+    # The write lock is held for the whole import, so ids follow insertion order
+    cursor.execute("SELECT id FROM jobs WHERE id > ? ORDER BY id", (last_job_id,))
+    job_ids = [r[0] for r in cursor.fetchall()]
+
+    cursor.executemany('''
+        INSERT INTO job_events (job_id, from_status, to_status, actor, ts) VALUES (?, ?, ?, ?, ?)
+    ''', [(job_id, None, "New", user_id, j["created_at"]) for job_id, j in zip(job_ids, batch)] + [
+        (job_id, "New", j["status"], user_id, j["completed_at"] or j["started_at"] or j["created_at"])
+        for job_id, j in zip(job_ids, batch) if j["status"] != "New"
+    ])
+
+    # Same registry and custom field writers as a job created in the app
+    register_devices(cursor, [
+        (j["device_key"], "job", job_id, None, j["device_model"], j["created_at"])
+        for job_id, j in zip(job_ids, batch) if j["device_key"]
+    ])
+    save_custom_values_batch(cursor, [
+        (job_id, j["custom_values"]) for job_id, j in zip(job_ids, batch) if j["custom_values"]
+    ], definition)
+
+    assigned = [(job_id, j) for job_id, j in zip(job_ids, batch) if j["technician_id"]]
+    for job_id, j in assigned:
+        cursor.execute('''
+            INSERT INTO technician_assignments (technician_id, assigned_by, status, notes, assigned_at)
+            VALUES (?, ?, ?, 'Imported', ?)
+        ''', (j["technician_id"], user_id, "completed" if j["status"] == "Completed" else "active", j["created_at"]))
+        cursor.execute("INSERT INTO assignment_jobs (assignment_id, job_id) VALUES (?, ?)", (cursor.lastrowid, job_id))
+    return len(new_customers)
+
+
+def import_jobs(conn, rows, user_id=None, default_store_id=None, reject_writer=None,
+                batch_size=IMPORT_BATCH_SIZE, dry_run=False, progress=None):
+    """Validate and insert jobs from an iterable of dict rows in one transaction.
+
+    reject_writer, when given, is a csv.writer that receives the header and one
+    line per rejected row (original values plus row number and reason).
+    """
+    started = time.perf_counter()
+    cursor = conn.cursor()
+    summary = {"read": 0, "imported": 0, "rejected": 0, "customers_created": 0, "missing_fields": []}
+
+    definition = get_form_definition(conn)
+    rules = load_schema_rules(conn, definition)
+    stores = {store.name.strip().lower(): store.id for store in get_stores(conn)}
+    if default_store_id is None:
+        default_store_id = min(stores.values()) if stores else None
+    technicians = {}
+    for tech_id, username, full_name, _ in get_technicians(conn):
+        technicians[username.lower()] = tech_id
+        if full_name:
+            technicians.setdefault(full_name.strip().lower(), tech_id)
+
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        summary["seconds"] = time.perf_counter() - started
+        return summary
+    header = list(first.keys())
+    mapping = map_header(header, rules)
+    mapped = set(mapping.values())
+    summary["missing_fields"] = sorted(
+        [c for c in REQUIRED_COLUMNS if c not in mapped]
+        + [rule.label for column, rule in rules.items() if rule.required and column not in mapped and column not in REQUIRED_COLUMNS]
+    )
+    if reject_writer is not None:
+        reject_writer.writerow(header + ["_row", "_error"])
+
+    # Existing customers keyed by normalized phone, resolved once instead of per row
+    customers = {}
+    cursor.execute("SELECT id, phone FROM customers ORDER BY id")
+    for customer_id, phone in cursor.fetchall():
+        customers.setdefault(normalize_phone(phone), customer_id)
+
+    conn.commit()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        cursor.execute("SELECT COUNT(*) FROM jobs")
+        deferred_indexes = DatabaseManager.drop_secondary_indexes(cursor, ["jobs"]) if cursor.fetchone()[0] < DEFER_INDEX_THRESHOLD else []
+        DatabaseManager.drop_customer_stats_triggers(cursor)
+        # Version triggers would probe jobs per row (some without their index while it is
+        # dropped); each counter moves once at the end instead
+        versioned = DatabaseManager.drop_version_triggers(cursor, ("jobs", "customers"))
+
+        batch = []
+        row_number = 1
+        for raw in _chain(first, rows):
+            row_number += 1
+            summary["read"] += 1
+            try:
+                batch.append(validate_row(raw, mapping, rules, stores, technicians, default_store_id))
+            except RowError as e:
+                summary["rejected"] += 1
+                if reject_writer is not None:
+                    reject_writer.writerow([raw.get(h) for h in header] + [row_number, str(e)])
+            if len(batch) >= batch_size:
+                summary["customers_created"] += _insert_batch(cursor, batch, customers, user_id, definition)
+                summary["imported"] += len(batch)
+                batch = []
+                if progress:
+                    progress(summary)
+        if batch:
+            summary["customers_created"] += _insert_batch(cursor, batch, customers, user_id, definition)
+            summary["imported"] += len(batch)
+
+        for sql in deferred_indexes:
+            cursor.execute(sql)
+        DatabaseManager.rebuild_customer_stats(cursor)
+        DatabaseManager.create_customer_stats_triggers(cursor)
+        if summary["imported"]:
+            DatabaseManager.bump_table_versions(cursor, versioned)
+        DatabaseManager.create_version_triggers(cursor)
+        refresh_technician_workload(cursor)
+        refresh_technician_stats(cursor)
+
+        if dry_run:
+            conn.rollback()
+        else:
+            conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    summary["seconds"] = time.perf_counter() - started
+    if progress:
+        progress(summary)
+    return summary
+
+
+def _chain(first, rest):
+    yield first
+    yield from rest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import jobs from CSV/XLSX")
+    parser.add_argument("file", help="CSV or XLSX file with one job per row")
+    parser.add_argument("--db", default=None, help="Database path (default REPAIRPRO_DB or repairpro.db)")
+    parser.add_argument("--store", default=None, help="Store name for rows without a store column")
+    parser.add_argument("--user", default="admin", help="Username recorded as the importer")
+    parser.add_argument("--rejects", default=None, help="Where to write rejected rows (default <file>.rejects.csv)")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="Validate and roll back")
+    args = parser.parse_args()
+
+    db = DatabaseManager(args.db)
+    conn = db.get_connection()
+    user_row = conn.execute("SELECT id FROM users WHERE username = ?", (args.user,)).fetchone()
+    if not user_row:
+        sys.exit(f"Unknown user: {args.user}")
+    store_id = None
+    if args.store:
+        store_row = conn.execute("SELECT id FROM stores WHERE name = ?", (args.store,)).fetchone()
+        if not store_row:
+            sys.exit(f"Unknown store: {args.store}")
+        store_id = store_row[0]
+
+    rejects_path = args.rejects or os.path.splitext(args.file)[0] + ".rejects.csv"
+    with open(rejects_path, "w", newline="", encoding="utf-8") as rejects:
+        result = import_jobs(
+            conn, read_rows(args.file), user_id=user_row[0], default_store_id=store_id,
+            reject_writer=csv.writer(rejects), batch_size=args.batch_size, dry_run=args.dry_run,
+            progress=lambda s: print(f"  {s['read']} read, {s['imported']} imported, {s['rejected']} rejected", end="\r")
+        )
+    conn.close()
+
+    rate = result["imported"] / result["seconds"] * 60 if result.get("seconds") else 0
+    print(f"\n{'Validated' if args.dry_run else 'Imported'} {result['imported']} jobs "
+          f"({result['customers_created']} new customers), rejected {result['rejected']} "
+          f"in {result.get('seconds', 0):.1f}s ({rate:,.0f} rows/min)")
+    if result["missing_fields"]:
+        print("Columns not in file:", ", ".join(result["missing_fields"]))
+    if result["rejected"]:
+        print("Rejected rows written to", rejects_path)
+    else:
+        os.remove(rejects_path)
@@ -0,0 +1,60 @@
+import sys
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.datamanager.databasemanger import DatabaseManager
+from components.datamanager.querystats import connection_factory
+
+
+class ConnectionPool:
+    """Fixed-size pool of SQLite connections shareable across worker threads"""
+
+    def __init__(self, db_path=None, size=8, timeout=30):
+        # Bootstraps the schema once before any pooled connection is handed out
+        self.db_path = DatabaseManager(db_path).db_path
+        self.size = size
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=size)
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False,
+                               factory=connection_factory())
+        conn.execute("PRAGMA busy_timeout = 30000")
+        return conn
+
+    def acquire(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                return self._connect()
+        return self._pool.get(timeout=self.timeout)
+
+    def release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        self._pool.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a with-block"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
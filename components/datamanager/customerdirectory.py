@@ -0,0 +1,97 @@
+import sys
+import os
+import pandas as pd
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CUSTOMER_PAGE_SIZE = 25
+RECENT_JOBS_PER_CUSTOMER = 5
+
+
+def build_customer_filters(store_id=None, search_term=""):
+    """Build the WHERE clause and params for the customer directory"""
+    conditions = []
+    params = []
+
+    if store_id is not None:
+        conditions.append("c.store_id = ?")
+        params.append(store_id)
+
+    if search_term:
+        conditions.append("""(
+            c.name LIKE ?
+            OR c.email LIKE ?
+            OR c.phone LIKE ?
+            OR c.address LIKE ?
+            OR CAST(c.id AS TEXT) LIKE ?
+        )""")
+        like = f"%{search_term}%"
+        params.extend([like] * 5)
+
+    where_clause = " AND ".join(conditions) if conditions else "1 = 1"
+    return where_clause, params
+
+
+def count_customers(conn, store_id=None, search_term=""):
+    """Number of customers matching the directory filters"""
+    where_clause, params = build_customer_filters(store_id, search_term)
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT COUNT(*) FROM customers c WHERE {where_clause}", params)
+    return cursor.fetchone()[0]
+
+
+def fetch_customer_page(conn, store_id=None, search_term="", page=1,
+                        page_size=CUSTOMER_PAGE_SIZE, include_store_name=False):
+    """One page of the directory with job count, lifetime spend and last visit from customer_stats"""
+    where_clause, params = build_customer_filters(store_id, search_term)
+    store_col = "s.name AS store_name," if include_store_name else ""
+    store_join = "LEFT JOIN stores s ON c.store_id = s.id" if include_store_name else ""
+
+    query = f"""
+        SELECT
+            c.id, c.name, c.phone, c.email, c.address,
+            c.created_at,
+            {store_col}
+            COALESCE(cs.job_count, 0) AS total_jobs,
+            COALESCE(cs.lifetime_spend, 0) AS lifetime_spend,
+            cs.last_visit
+        FROM customers c
+        LEFT JOIN customer_stats cs ON cs.customer_id = c.id
+        {store_join}
+        WHERE {where_clause}
+        ORDER BY c.created_at DESC
+        LIMIT ? OFFSET ?
+    """
+    offset = max(page - 1, 0) * page_size
+    return pd.read_sql(query, conn, params=params + [page_size, offset])
+
+
+def fetch_recent_jobs(conn, customer_ids, per_customer=RECENT_JOBS_PER_CUSTOMER):
+    """Recent jobs for many customers in a single query, keyed by customer id"""
+    history = {int(customer_id): [] for customer_id in customer_ids}
+    if not history:
+        return history
+
+    placeholders = ",".join("?" * len(history))
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT customer_id, id, device_type, device_model, status, created_at
+        FROM (
+            SELECT
+                customer_id, id, device_type, device_model, status, created_at,
+                ROW_NUMBER() OVER (PARTITION BY customer_id ORDER BY created_at DESC, id DESC) AS rn
+            FROM jobs
+            WHERE customer_id IN ({placeholders})
+        )
+        WHERE rn <= ?
+        ORDER BY customer_id, rn
+    """, list(history) + [per_customer])
+
+    for customer_id, job_id, device_type, device_model, status, created_at in cursor.fetchall():
+        history[customer_id].append({
+            'id': job_id,
+            'device_type': device_type,
+            'device_model': device_model,
+            'status': status,
+            'created_at': created_at,
+        })
+    return history
@@ -0,0 +1,111 @@
+import sys
+import os
+import json
+from datetime import date, datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.datamanager.jobschema import get_form_definition, value_column
+
+# job_custom_values holds one row per (job, job_schema field) with the value in the
+# column its field type maps to (VALUE_COLUMNS); the other two stay NULL. Fields an
+# admin marks as indexed get a partial index on that column for their field_id only.
+INDEX_PREFIX = "idx_job_custom_values_field_"
+
+
+def encode_value(field, value):
+    """(value_text, value_number, value_date) for a form value; None when it is empty"""
+    if value is None or value == "" or (isinstance(value, (list, tuple)) and not value):
+        return None
+    if field.value_column == 'value_number':
+        return None, float(value), None
+    if field.value_column == 'value_date':
+        if isinstance(value, (date, datetime)):
+            value = value.strftime('%Y-%m-%d')
+        return None, None, str(value)
+    if isinstance(value, bool):
+        value = "Yes" if value else "No"
+    elif isinstance(value, (list, tuple)):
+        value = ", ".join(str(v) for v in value)
+    text = str(value).strip()
+    return (text, None, None) if text else None
+
+
+def save_custom_values(cursor, job_id, values, definition):
+    """Write {field name: value} for a job's custom fields in one executemany"""
+    return save_custom_values_batch(cursor, [(job_id, values)], definition)
+
+
+def save_custom_values_batch(cursor, jobs, definition):
+    """Write the custom fields of (job_id, {field name: value}) pairs in one executemany"""
+    rows = []
+    for job_id, values in jobs:
+        for field in definition.custom_fields:
+            encoded = encode_value(field, values.get(field.name))
+            if encoded is not None:
+                rows.append((job_id, field.id) + encoded)
+    if rows:
+        cursor.executemany('''
+            INSERT INTO job_custom_values (job_id, field_id, value_text, value_number, value_date)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(job_id, field_id) DO UPDATE SET
+                value_text = excluded.value_text,
+                value_number = excluded.value_number,
+                value_date = excluded.value_date
+        ''', rows)
+    return len(rows)
+
+
+def load_custom_values(conn, job_ids):
+    """{job_id: [(label, value), ...]} in field order for the given jobs, one query for all"""
+    job_ids = [int(j) for j in job_ids]
+    if not job_ids:
+        return {}
+    definition = get_form_definition(conn)
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT job_id, field_id, COALESCE(value_text, value_number, value_date)
+        FROM job_custom_values
+        WHERE job_id IN (SELECT value FROM json_each(?))
+    ''', (json.dumps(job_ids),))
+    values = {}
+    for job_id, field_id, value in cursor.fetchall():
+        field = definition.by_id.get(field_id)
+        if field is not None:
+            values.setdefault(job_id, []).append((field, value))
+    return {
+        job_id: [(field.label, value) for field, value in sorted(pairs, key=lambda p: (p[0].order, p[0].id))]
+        for job_id, pairs in values.items()
+    }
+
+
+def indexed_value_filters(conn, job_column='j.id'):
+    """SQL conditions, one ? each, matching jobs whose indexed text field equals a value.
+
+    The field id is inlined so SQLite can use the field's partial index.
+    """
+    return [
+        f"{job_column} IN (SELECT job_id FROM job_custom_values WHERE field_id = {int(field.id)} AND value_text = ?)"
+        for field in get_form_definition(conn).custom_fields
+        if field.indexed and field.value_column == 'value_text'
+    ]
+
+
+def sync_custom_value_indexes(cursor):
+    """Create the partial index of every job_schema field marked indexed and drop the rest"""
+    cursor.execute("SELECT id, field_type FROM job_schema WHERE is_indexed")
+    wanted = {}
+    for field_id, field_type in cursor.fetchall():
+        column = value_column(field_type)
+        wanted[f"{INDEX_PREFIX}{int(field_id)}_{column}"] = (int(field_id), column)
+
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'job_custom_values' AND name LIKE ?",
+        (INDEX_PREFIX + "%",),
+    )
+    for (name,) in cursor.fetchall():
+        if name not in wanted:
+            cursor.execute(f"DROP INDEX IF EXISTS {name}")
+    for name, (field_id, column) in wanted.items():
+        cursor.execute(f'''
+            CREATE INDEX IF NOT EXISTS {name}
+            ON job_custom_values ({column}, job_id) WHERE field_id = {field_id}
+        ''')
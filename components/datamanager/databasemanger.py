@@ -1,13 +1,32 @@
+import os
 import sqlite3
-import hashlib
+import threading
+from components.datamanager.technicianworkload import refresh_technician_workload
+from components.datamanager.technicianstats import refresh_technician_stats
+from components.datamanager.customfields import sync_custom_value_indexes
+from components.datamanager.deviceregistry import backfill_device_registry
+from components.datamanager.querystats import connection_factory
+from components.utils.passwordhash import hash_password
 
 class DatabaseManager:
-    def __init__(self, db_path="repairpro.db"):
-        self.db_path = db_path
-        self.init_database()
+    # Databases whose schema has been bootstrapped by this process
+    _initialized_paths = set()
+    _init_lock = threading.Lock()
+
+    @staticmethod
+    def default_path():
+        return os.environ.get("REPAIRPRO_DB", "repairpro.db")
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or DatabaseManager.default_path()
+        path_key = os.path.abspath(self.db_path)
+        with DatabaseManager._init_lock:
+            if path_key not in DatabaseManager._initialized_paths:
+                self.init_database()
+                DatabaseManager._initialized_paths.add(path_key)
 
     def get_connection(self):
-        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn = sqlite3.connect(self.db_path, timeout=30, factory=connection_factory())
         conn.execute("PRAGMA busy_timeout = 30000")
         return conn
 
@@ -177,31 +196,520 @@ class DatabaseManager:
                         ); 
                            ''')
 
+            # Indexes backing server-side old mobile filtering and facets
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_old_mobiles_store_created ON old_mobiles (store_id, created_at)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_old_mobiles_brand ON old_mobiles (mobile_brand)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_old_mobiles_status ON old_mobiles (repair_status)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_old_mobiles_imei ON old_mobiles (imei_number)")
+
+            # Customer lookup by phone (create-job form and the jobs API)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_customers_phone ON customers (phone)")
+
+            # A job's notes, newest last (technician analytics recent notes)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_notes_job ON job_notes (job_id, created_at)")
+
+            # Technician board refreshes: active assignment ids, and jobs changed since a watermark
+            # (also the API's updated_since filter)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_technician_assignments_technician_status ON technician_assignments (technician_id, status)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_updated_at ON jobs (updated_at)")
+
+            self._create_customer_stats(cursor)
+            self._create_technician_workload(cursor)
+            self._create_job_events(cursor)
+            self._create_time_keys(cursor)
+            self._create_technician_stats(cursor)
+            self._create_job_schema(cursor)
+            self._create_device_registry(cursor)
+            self._create_table_versions(cursor)
+
             cursor.execute("SELECT COUNT(*) FROM stores")
             if cursor.fetchone()[0] == 0:
                 self._insert_default_data(cursor)
 
             conn.commit()
-        def _insert_default_data(self, cursor):
-            # Step 1: Insert default store
-            cursor.execute(
-                "INSERT INTO stores (name, location, phone, email) VALUES (?, ?, ?, ?)",
-                ("Main Branch", "Head Office", "1234567890", "store@repairpro.com")
+
+    def _insert_default_data(self, cursor):
+        # Step 1: Insert default store
+        cursor.execute(
+            "INSERT INTO stores (name, location, phone, email) VALUES (?, ?, ?, ?)",
+            ("Main Branch", "Head Office", "1234567890", "store@repairpro.com")
+        )
+        store_id = cursor.lastrowid
+
+        # Step 2: Insert admin user
+        admin_pw = hash_password("admin123")
+        cursor.execute(
+            "INSERT INTO users (username, password, role, full_name, email, store_id) VALUES (?, ?, ?, ?, ?, ?)",
+            ("admin", admin_pw, "admin", "System Admin", "admin@repairpro.com", store_id)
+        )
+        user_id = cursor.lastrowid
+
+        # Step 3: Assign store to admin in user_stores table
+        cursor.execute(
+            "INSERT INTO user_stores (user_id, store_id, is_primary) VALUES (?, ?, ?)",
+            (user_id, store_id, True)
+        )
+
+    def _create_customer_stats(self, cursor):
+        """Customer directory projection kept current by triggers on jobs"""
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_customer_created ON jobs (customer_id, created_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_customers_store_created ON customers (store_id, created_at)")
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS customer_stats (
+                customer_id INTEGER PRIMARY KEY,
+                job_count INTEGER NOT NULL DEFAULT 0,
+                lifetime_spend REAL NOT NULL DEFAULT 0,
+                last_visit TIMESTAMP,
+                FOREIGN KEY (customer_id) REFERENCES customers(id) ON DELETE CASCADE
             )
-            store_id = cursor.lastrowid
+        ''')
+
+        self.create_customer_stats_triggers(cursor)
+
+        # Backfill once for databases created before the projection existed
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM customer_stats) OR NOT EXISTS (SELECT 1 FROM jobs)")
+        if not cursor.fetchone()[0]:
+            self.rebuild_customer_stats(cursor)
 
-            # Step 2: Insert admin user
-            admin_pw = hashlib.sha256("admin123".encode()).hexdigest()
-            cursor.execute(
-                "INSERT INTO users (username, password, role, full_name, email, store_id) VALUES (?, ?, ?, ?, ?, ?)",
-                ("admin", admin_pw, "admin", "System Admin", "admin@repairpro.com", store_id)
+    @staticmethod
+    def rebuild_customer_stats(cursor):
+        """Recompute the customer_stats projection from the jobs table"""
+        cursor.execute("DELETE FROM customer_stats")
+        cursor.execute('''
+            INSERT INTO customer_stats (customer_id, job_count, lifetime_spend, last_visit)
+            SELECT
+                customer_id,
+                COUNT(*),
+                COALESCE(SUM(CASE WHEN status = 'Completed' THEN actual_cost ELSE 0 END), 0),
+                MAX(created_at)
+            FROM jobs
+            GROUP BY customer_id
+        ''')
+
+    @staticmethod
+    def create_customer_stats_triggers(cursor):
+        """Triggers keeping customer_stats in step with single-row job writes"""
+        # Lifetime spend counts the final cost of completed jobs only
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_customer_stats_job_insert
+            AFTER INSERT ON jobs
+            BEGIN
+                INSERT INTO customer_stats (customer_id, job_count, lifetime_spend, last_visit)
+                VALUES (
+                    NEW.customer_id, 1,
+                    CASE WHEN NEW.status = 'Completed' THEN COALESCE(NEW.actual_cost, 0) ELSE 0 END,
+                    NEW.created_at
+                )
+                ON CONFLICT(customer_id) DO UPDATE SET
+                    job_count = job_count + 1,
+                    lifetime_spend = lifetime_spend + excluded.lifetime_spend,
+                    last_visit = MAX(COALESCE(last_visit, ''), excluded.last_visit);
+            END
+        ''')
+
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_customer_stats_job_delete
+            AFTER DELETE ON jobs
+            BEGIN
+                UPDATE customer_stats SET
+                    job_count = job_count - 1,
+                    lifetime_spend = lifetime_spend
+                        - CASE WHEN OLD.status = 'Completed' THEN COALESCE(OLD.actual_cost, 0) ELSE 0 END,
+                    last_visit = (SELECT MAX(created_at) FROM jobs WHERE customer_id = OLD.customer_id)
+                WHERE customer_id = OLD.customer_id;
+            END
+        ''')
+
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_customer_stats_job_update
+            AFTER UPDATE OF customer_id, status, actual_cost, created_at ON jobs
+            BEGIN
+                UPDATE customer_stats SET
+                    job_count = job_count - 1,
+                    lifetime_spend = lifetime_spend
+                        - CASE WHEN OLD.status = 'Completed' THEN COALESCE(OLD.actual_cost, 0) ELSE 0 END
+                WHERE customer_id = OLD.customer_id;
+
+                INSERT INTO customer_stats (customer_id, job_count, lifetime_spend, last_visit)
+                VALUES (
+                    NEW.customer_id, 1,
+                    CASE WHEN NEW.status = 'Completed' THEN COALESCE(NEW.actual_cost, 0) ELSE 0 END,
+                    NEW.created_at
+                )
+                ON CONFLICT(customer_id) DO UPDATE SET
+                    job_count = job_count + 1,
+                    lifetime_spend = lifetime_spend + excluded.lifetime_spend;
+
+                UPDATE customer_stats
+                SET last_visit = (SELECT MAX(created_at) FROM jobs WHERE customer_id = customer_stats.customer_id)
+                WHERE customer_id IN (OLD.customer_id, NEW.customer_id);
+            END
+        ''')
+
+    @staticmethod
+    def drop_customer_stats_triggers(cursor):
+        """Suspend customer_stats maintenance for bulk loads; rebuild and recreate in the same transaction"""
+        for name in ("trg_customer_stats_job_insert", "trg_customer_stats_job_delete", "trg_customer_stats_job_update"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+    def _create_technician_workload(self, cursor):
+        """Per-technician workload projection refreshed by job writes"""
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_assignment_jobs_job ON assignment_jobs (job_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_assignment_jobs_assignment ON assignment_jobs (assignment_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_technician_assignments_technician ON technician_assignments (technician_id)")
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS technician_workload (
+                technician_id INTEGER PRIMARY KEY,
+                new_jobs INTEGER NOT NULL DEFAULT 0,
+                in_progress_jobs INTEGER NOT NULL DEFAULT 0,
+                pending_jobs INTEGER NOT NULL DEFAULT 0,
+                open_jobs INTEGER NOT NULL DEFAULT 0,
+                completed_jobs INTEGER NOT NULL DEFAULT 0,
+                completion_hours_total REAL NOT NULL DEFAULT 0,
+                timed_completions INTEGER NOT NULL DEFAULT 0,
+                avg_completion_hours REAL,
+                last_assigned_at TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (technician_id) REFERENCES users(id) ON DELETE CASCADE
             )
-            user_id = cursor.lastrowid
+        ''')
 
-            # Step 3: Assign store to admin in user_stores table
-            cursor.execute(
-                "INSERT INTO user_stores (user_id, store_id, is_primary) VALUES (?, ?, ?)",
-                (user_id, store_id, True)
+        # Completion time is kept as a sum and count so job writes apply deltas
+        cursor.execute("PRAGMA table_info(technician_workload)")
+        existing = {row[1] for row in cursor.fetchall()}
+        missing_sums = 'timed_completions' not in existing
+        if missing_sums:
+            cursor.execute("ALTER TABLE technician_workload ADD COLUMN completion_hours_total REAL NOT NULL DEFAULT 0")
+            cursor.execute("ALTER TABLE technician_workload ADD COLUMN timed_completions INTEGER NOT NULL DEFAULT 0")
+
+        # Backfill once for databases created before the projection (or its sums) existed
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM technician_workload) OR NOT EXISTS (SELECT 1 FROM assignment_jobs)")
+        if missing_sums or not cursor.fetchone()[0]:
+            refresh_technician_workload(cursor)
+
+    def _create_job_events(self, cursor):
+        """Append-only job status log and change-feed consumer offsets"""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS job_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id INTEGER NOT NULL,
+                from_status TEXT,
+                to_status TEXT NOT NULL,
+                actor INTEGER,
+                ts TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE,
+                FOREIGN KEY (actor) REFERENCES users(id) ON DELETE SET NULL
             )
+        ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_events_job ON job_events (job_id, id)")
 
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS change_feed_offsets (
+                consumer TEXT PRIMARY KEY,
+                last_event_id INTEGER NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        # Seed history for existing jobs from their lifecycle timestamps
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM job_events) OR NOT EXISTS (SELECT 1 FROM jobs)")
+        if not cursor.fetchone()[0]:
+            self.backfill_job_events(cursor)
+
+    # table -> {key column: (source timestamp column, strftime format)}
+    TIME_KEYS = {
+        "jobs": {
+            "created_day": ("created_at", "%Y%m%d"),
+            "created_month": ("created_at", "%Y%m"),
+            "completed_day": ("completed_at", "%Y%m%d"),
+            "completed_month": ("completed_at", "%Y%m"),
+        },
+        "technician_assignments": {
+            "assigned_day": ("assigned_at", "%Y%m%d"),
+            "assigned_month": ("assigned_at", "%Y%m"),
+            "completed_day": ("completed_at", "%Y%m%d"),
+        },
+    }
+
+    def _create_time_keys(self, cursor):
+        """Integer day/month keys as virtual generated columns, indexed for range scans"""
+        for table, keys in self.TIME_KEYS.items():
+            cursor.execute(f"PRAGMA table_xinfo({table})")
+            existing = {row[1] for row in cursor.fetchall()}
+            for column, (source, fmt) in keys.items():
+                if column not in existing:
+                    cursor.execute(f"""
+                        ALTER TABLE {table} ADD COLUMN {column} INTEGER
+                        GENERATED ALWAYS AS (CAST(strftime('{fmt}', {source}) AS INTEGER)) VIRTUAL
+                    """)
+
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created_day ON jobs (created_day)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_store_created_day ON jobs (store_id, created_day)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_completed_day ON jobs (completed_day)")
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_technician_assignments_technician_assigned_day
+            ON technician_assignments (technician_id, assigned_day)
+        ''')
+
+    def _create_technician_stats(self, cursor):
+        """Technician x day x store x device cube behind the technician reports, refreshed by job writes"""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS technician_daily_stats (
+                technician_id INTEGER NOT NULL,
+                day INTEGER,
+                store_id INTEGER,
+                device_type TEXT,
+                device_model TEXT,
+                jobs INTEGER NOT NULL DEFAULT 0,
+                completed_jobs INTEGER NOT NULL DEFAULT 0,
+                in_progress_jobs INTEGER NOT NULL DEFAULT 0,
+                new_jobs INTEGER NOT NULL DEFAULT 0,
+                failed_jobs INTEGER NOT NULL DEFAULT 0,
+                completed_assignments INTEGER NOT NULL DEFAULT 0,
+                revenue REAL NOT NULL DEFAULT 0,
+                actual_cost_total REAL NOT NULL DEFAULT 0,
+                deposit_total REAL NOT NULL DEFAULT 0,
+                job_hours REAL NOT NULL DEFAULT 0,
+                timed_jobs INTEGER NOT NULL DEFAULT 0,
+                assignment_hours REAL NOT NULL DEFAULT 0,
+                timed_assignments INTEGER NOT NULL DEFAULT 0,
+                FOREIGN KEY (technician_id) REFERENCES users(id) ON DELETE CASCADE
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_technician_daily_stats_technician_day
+            ON technician_daily_stats (technician_id, day)
+        ''')
+
+        # Backfill once for databases created before the cube existed
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM technician_daily_stats) OR NOT EXISTS (SELECT 1 FROM assignment_jobs)")
+        if not cursor.fetchone()[0]:
+            refresh_technician_stats(cursor)
+
+    # Job sheet fields the Job Schema page starts an empty job_schema with:
+    # (field_name, field_label, field_type, is_required, is_active, is_paused, field_order, options, pattern)
+    DEFAULT_JOB_FIELDS = (
+        ('customer_name', 'Customer Name', 'text', True, True, False, 1, '', ''),
+        ('customer_phone', 'Customer Phone', 'phone', True, True, False, 2, '', ''),
+        ('customer_email', 'Customer Email', 'email', False, True, False, 3, '', ''),
+        ('phone_password', 'Phone Password/PIN', 'pattern', False, True, False, 4, '', '8-3-4'),
+        ('device_type', 'Device Type', 'select', True, True, False, 5, 'Smartphone,Laptop,Desktop,Tablet,Smart Watch,Gaming Console,TV,Other Electronics', ''),
+        ('device_model', 'Device Model', 'text', True, True, False, 6, '', ''),
+        ('serial_number', 'Serial/IMEI Number', 'text', False, True, False, 7, '', ''),
+        ('problem_description', 'Problem Description', 'textarea', True, True, False, 8, '', ''),
+        ('diagnostic_notes', 'Initial Diagnostic Notes', 'textarea', False, True, False, 9, '', ''),
+        ('deposit_cost', 'Deposit Cost ($)', 'number', True, True, False, 10, '', ''),
+        ('deposit_amount', 'Deposit Amount ($)', 'number', False, True, False, 11, '', ''),
+        ('notification_method', 'Notification Method', 'checkbox', False, True, False, 12, 'Email,WhatsApp,SMS,Phone Call', ''),
+        ('phone_received_by', 'Phone Received By', 'text', True, True, False, 13, '', ''),
+        ('assigned_technician', 'Assigned Technician', 'select', False, True, False, 14, '', ''),
+        ('technician_phone', 'Technician Phone', 'phone', False, True, False, 15, '', ''),
+        ('status', 'Initial Status', 'select', True, True, False, 16, 'New,In Progress,Pending,Completed,Cancelled', ''),
+        ('received_date', 'Received Date', 'date', True, True, False, 17, '', ''),
+        ('terms_accepted', 'Terms and Conditions', 'checkbox', True, True, False, 18, '', ''),
+    )
+
+    def _create_job_schema(self, cursor):
+        """Configurable job sheet fields; the Job Schema page seeds the defaults on first use"""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS job_schema (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                field_name TEXT NOT NULL,
+                field_label TEXT NOT NULL,
+                field_type TEXT NOT NULL,
+                is_required BOOLEAN DEFAULT FALSE,
+                is_active BOOLEAN DEFAULT TRUE,
+                is_paused BOOLEAN DEFAULT FALSE,
+                field_order INTEGER DEFAULT 0,
+                options TEXT,
+                pattern TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        # Columns added after the table was first shipped
+        cursor.execute("PRAGMA table_info(job_schema)")
+        existing = {row[1] for row in cursor.fetchall()}
+        if 'is_paused' not in existing:
+            cursor.execute('ALTER TABLE job_schema ADD COLUMN is_paused BOOLEAN DEFAULT FALSE')
+        if 'pattern' not in existing:
+            cursor.execute('ALTER TABLE job_schema ADD COLUMN pattern TEXT')
+        if 'is_indexed' not in existing:
+            cursor.execute('ALTER TABLE job_schema ADD COLUMN is_indexed BOOLEAN DEFAULT FALSE')
+
+        # Typed values of fields without a jobs column (see components/datamanager/customfields.py)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS job_custom_values (
+                job_id INTEGER NOT NULL,
+                field_id INTEGER NOT NULL,
+                value_text TEXT,
+                value_number REAL,
+                value_date DATE,
+                PRIMARY KEY (job_id, field_id),
+                FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE,
+                FOREIGN KEY (field_id) REFERENCES job_schema(id) ON DELETE CASCADE
+            ) WITHOUT ROWID
+        ''')
+        sync_custom_value_indexes(cursor)
+
+    def _create_device_registry(self, cursor):
+        """Devices by normalized IMEI/serial, linked to their repair jobs and trade-ins"""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS devices (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                device_key TEXT NOT NULL,
+                brand TEXT,
+                model TEXT,
+                first_seen TIMESTAMP,
+                last_seen TIMESTAMP
+            )
+        ''')
+        cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_devices_key ON devices (device_key)")
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS device_links (
+                device_id INTEGER NOT NULL,
+                source TEXT NOT NULL,
+                record_id INTEGER NOT NULL,
+                PRIMARY KEY (device_id, source, record_id),
+                FOREIGN KEY (device_id) REFERENCES devices(id) ON DELETE CASCADE
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_device_links_record ON device_links (source, record_id)")
+
+        # Backfill once for databases created before the registry existed
+        cursor.execute("SELECT EXISTS (SELECT 1 FROM devices)")
+        if not cursor.fetchone()[0]:
+            backfill_device_registry(cursor)
+
+    @classmethod
+    def insert_default_job_fields(cls, cursor):
+        """Seed an empty job_schema with DEFAULT_JOB_FIELDS"""
+        cursor.executemany('''
+            INSERT INTO job_schema (field_name, field_label, field_type, is_required, is_active, is_paused, field_order, options, pattern)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', cls.DEFAULT_JOB_FIELDS)
+
+    # table_versions row -> (table, trigger event, WHEN condition) that bump it. Only the
+    # columns dropdowns show count: last_login and status updates leave the caches alone,
+    # and jobs.device_type moves only when a type appears or disappears.
+    VERSIONED_WRITES = {
+        "stores": [("stores", "INSERT", None), ("stores", "DELETE", None), ("stores", "UPDATE", None)],
+        "users": [
+            ("users", "INSERT", None), ("users", "DELETE", None),
+            ("users", "UPDATE OF username, full_name, role, store_id", None),
+        ],
+        "jobs.device_type": [
+            ("jobs", "INSERT",
+             "NOT EXISTS (SELECT 1 FROM jobs WHERE device_type = NEW.device_type AND id != NEW.id)"),
+            ("jobs", "DELETE", "NOT EXISTS (SELECT 1 FROM jobs WHERE device_type = OLD.device_type)"),
+            ("jobs", "UPDATE OF device_type", "OLD.device_type IS NOT NEW.device_type"),
+        ],
+        "old_mobiles": [
+            ("old_mobiles", "INSERT", None), ("old_mobiles", "DELETE", None),
+            ("old_mobiles", "UPDATE OF mobile_brand, repair_status, store_id", None),
+        ],
+        "jobs": [("jobs", "INSERT", None), ("jobs", "DELETE", None), ("jobs", "UPDATE", None)],
+        "technician_daily_stats": [
+            ("technician_daily_stats", "INSERT", None), ("technician_daily_stats", "DELETE", None),
+        ],
+        "technician_workload": [
+            ("technician_workload", "INSERT", None), ("technician_workload", "DELETE", None),
+        ],
+        "store_technicians": [
+            ("store_technicians", "INSERT", None), ("store_technicians", "DELETE", None),
+            ("store_technicians", "UPDATE", None),
+        ],
+        "customers": [
+            ("customers", "INSERT", None), ("customers", "DELETE", None), ("customers", "UPDATE OF store_id", None),
+        ],
+        "job_schema": [("job_schema", "INSERT", None), ("job_schema", "DELETE", None), ("job_schema", "UPDATE", None)],
+        # Customer details shown on repair status lookups
+        "customers.contact": [("customers", "UPDATE OF name, phone", None)],
+    }
+
+    def _create_table_versions(self, cursor):
+        """Write counters bumped by triggers; dimension lists and cached charts reload when theirs move"""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS table_versions (
+                name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        # Keeps the device type triggers to an index probe per job write
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_device_type ON jobs (device_type)")
+
+        self.create_version_triggers(cursor)
+
+    @staticmethod
+    def _version_trigger(name, event):
+        return f"trg_version_{name.replace('.', '_')}_{event.split()[0].lower()}"
+
+    @classmethod
+    def create_version_triggers(cls, cursor):
+        """Triggers bumping each VERSIONED_WRITES counter; existing ones are kept"""
+        for name, writes in cls.VERSIONED_WRITES.items():
+            for table, event, condition in writes:
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS {cls._version_trigger(name, event)}
+                    AFTER {event} ON {table}
+                    {f"WHEN {condition}" if condition else ""}
+                    BEGIN
+                        INSERT INTO table_versions (name, version) VALUES ('{name}', 1)
+                        ON CONFLICT(name) DO UPDATE SET version = version + 1;
+                    END
+                ''')
+
+    @classmethod
+    def drop_version_triggers(cls, cursor, tables):
+        """Suspend the version triggers on the given tables for a bulk load; returns the
+        counter names to bump once with bump_table_versions before create_version_triggers"""
+        names = []
+        for name, writes in cls.VERSIONED_WRITES.items():
+            for table, event, _ in writes:
+                if table in tables:
+                    cursor.execute(f"DROP TRIGGER IF EXISTS {cls._version_trigger(name, event)}")
+                    if name not in names:
+                        names.append(name)
+        return names
+
+    @staticmethod
+    def bump_table_versions(cursor, names):
+        """Move the given table_versions counters once, as a single write to their tables would"""
+        cursor.executemany('''
+            INSERT INTO table_versions (name, version) VALUES (?, 1)
+            ON CONFLICT(name) DO UPDATE SET version = version + 1
+        ''', [(name,) for name in names])
+
+    @staticmethod
+    def backfill_job_events(cursor):
+        """Derive job_events history for jobs from their created/started/completed timestamps"""
+        cursor.execute('''
+            INSERT INTO job_events (job_id, from_status, to_status, actor, ts)
+            SELECT job_id, from_status, to_status, NULL, ts FROM (
+                SELECT id AS job_id, NULL AS from_status, 'New' AS to_status, created_at AS ts, 0 AS step
+                FROM jobs
+                UNION ALL
+                SELECT id, 'New', 'In Progress', started_at, 1
+                FROM jobs WHERE started_at IS NOT NULL
+                UNION ALL
+                SELECT id, CASE WHEN started_at IS NOT NULL THEN 'In Progress' ELSE 'New' END,
+                       'Completed', completed_at, 2
+                FROM jobs WHERE completed_at IS NOT NULL AND status = 'Completed'
+            )
+            ORDER BY ts, job_id, step
+        ''')
 
+    @staticmethod
+    def drop_secondary_indexes(cursor, tables):
+        """Drop explicit indexes on the given tables for a bulk load; returns their DDL to recreate"""
+        placeholders = ",".join("?" * len(tables))
+        cursor.execute(f"""
+            SELECT name, sql FROM sqlite_master
+            WHERE type = 'index' AND sql IS NOT NULL AND tbl_name IN ({placeholders})
+        """, list(tables))
+        indexes = cursor.fetchall()
+        for name, _ in indexes:
+            cursor.execute(f'DROP INDEX "{name}"')
+        return [sql for _, sql in indexes]
@@ -0,0 +1,144 @@
+import sys
+import os
+import re
+from collections import namedtuple
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Rows read per backfill batch
+DEVICE_BACKFILL_BATCH = 5000
+DEVICE_KEY_PATTERN = re.compile(r"^[A-Z0-9]{5,32}$")
+
+# One earlier repair job ('job') or trade-in ('old_mobile') of a registered device
+DeviceRecord = namedtuple('DeviceRecord', ['source', 'record_id', 'seen_at', 'device', 'status', 'store_name'])
+
+
+def normalize_device_key(value):
+    """IMEI or serial as typed -> registry key: separators and whitespace dropped, upper case"""
+    return re.sub(r"[\s\-/.:]", "", str(value or "")).upper()
+
+
+def luhn_valid(digits):
+    """Luhn check digit test, as used by the 15th digit of an IMEI"""
+    total = 0
+    for i, ch in enumerate(reversed(digits)):
+        d = int(ch)
+        if i % 2:
+            d *= 2
+            if d > 9:
+                d -= 9
+        total += d
+    return total % 10 == 0
+
+
+def is_imei(key):
+    return len(key) == 15 and key.isdigit() and luhn_valid(key)
+
+
+def validate_device_key(key, check_digit=True):
+    """Error message for a normalized key, None when it can be registered (or is empty)"""
+    if not key:
+        return None
+    if not DEVICE_KEY_PATTERN.match(key):
+        return f"IMEI/serial '{key}' must be 5 to 32 letters or digits"
+    if check_digit and len(key) == 15 and key.isdigit() and not luhn_valid(key):
+        return f"IMEI '{key}' is not valid (check digit does not match)"
+    return None
+
+
+def register_devices(cursor, items):
+    """items: (key, source, record_id, brand, model, seen_at); upserts devices then links records.
+
+    A device keeps the first brand and model recorded for it.
+    """
+    cursor.executemany('''
+        INSERT INTO devices (device_key, brand, model, first_seen, last_seen)
+        VALUES (?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), COALESCE(?, CURRENT_TIMESTAMP))
+        ON CONFLICT(device_key) DO UPDATE SET
+            brand = COALESCE(brand, excluded.brand),
+            model = COALESCE(model, excluded.model),
+            first_seen = MIN(first_seen, excluded.first_seen),
+            last_seen = MAX(last_seen, excluded.last_seen)
+    ''', [(key, brand, model, seen_at, seen_at) for key, _, _, brand, model, seen_at in items])
+    cursor.executemany('''
+        INSERT OR IGNORE INTO device_links (device_id, source, record_id)
+        SELECT id, ?, ? FROM devices WHERE device_key = ?
+    ''', [(source, record_id, key) for key, source, record_id, _, _, _ in items])
+
+
+def register_device(cursor, key, source, record_id, brand=None, model=None, seen_at=None):
+    """Link a job or old mobile to the device with this normalized key, in the caller's transaction"""
+    register_devices(cursor, [(key, source, record_id, brand, model, seen_at)])
+
+
+def unregister_record(cursor, source, record_id):
+    """Remove a deleted job's or old mobile's device links, in the caller's transaction"""
+    cursor.execute("DELETE FROM device_links WHERE source = ? AND record_id = ?", (source, record_id))
+
+
+def device_history(conn, key):
+    """Every job and trade-in linked to a device, newest first; three index probes per record"""
+    if not key:
+        return []
+    cursor = conn.cursor()
+    cursor.execute('''
+        SELECT 'job', j.id, j.created_at, TRIM(j.device_type || ' ' || COALESCE(j.device_model, '')),
+               j.status, s.name
+        FROM devices d
+        JOIN device_links l ON l.device_id = d.id AND l.source = 'job'
+        JOIN jobs j ON j.id = l.record_id
+        LEFT JOIN stores s ON s.id = j.store_id
+        WHERE d.device_key = ?
+        UNION ALL
+        SELECT 'old_mobile', om.id, om.created_at, TRIM(om.mobile_brand || ' ' || om.mobile_model),
+               om.repair_status, s.name
+        FROM devices d
+        JOIN device_links l ON l.device_id = d.id AND l.source = 'old_mobile'
+        JOIN old_mobiles om ON om.id = l.record_id
+        LEFT JOIN stores s ON s.id = om.store_id
+        WHERE d.device_key = ?
+        ORDER BY 3 DESC
+    ''', (key, key))
+    return [DeviceRecord(*row) for row in cursor.fetchall()]
+
+
+def backfill_device_registry(cursor, batch_size=DEVICE_BACKFILL_BATCH):
+    """Register old_mobiles IMEIs and job serial numbers, batch_size source rows at a time.
+
+    Existing values are registered when they have a key's shape even if an IMEI
+    fails its check digit, so the history of what was typed before stays findable.
+    Returns the number of records linked.
+    """
+    sources = (
+        ('old_mobile', '''
+            SELECT id, imei_number, mobile_brand, mobile_model, created_at
+            FROM old_mobiles
+            WHERE id > ? AND imei_number IS NOT NULL AND imei_number != ''
+            ORDER BY id LIMIT ?
+        '''),
+        ('job', '''
+            SELECT v.job_id, v.value_text, NULL, j.device_model, j.created_at
+            FROM job_custom_values v
+            JOIN jobs j ON j.id = v.job_id
+            WHERE v.job_id > ? AND v.value_text IS NOT NULL
+              AND v.field_id IN (SELECT id FROM job_schema WHERE field_name = 'serial_number')
+            ORDER BY v.job_id LIMIT ?
+        '''),
+    )
+    linked = 0
+    for source, query in sources:
+        last_id = 0
+        while True:
+            cursor.execute(query, (last_id, batch_size))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            items = []
+            for record_id, value, brand, model, seen_at in rows:
+                key = normalize_device_key(value)
+                if key and validate_device_key(key, check_digit=False) is None:
+                    items.append((key, source, record_id, brand, model, seen_at))
+            if items:
+                register_devices(cursor, items)
+                linked += len(items)
+            last_id = rows[-1][0]
+    return linked
@@ -0,0 +1,96 @@
+import sys
+import os
+import threading
+from collections import namedtuple
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+Store = namedtuple('Store', ['id', 'name', 'location'])
+Technician = namedtuple('Technician', ['id', 'username', 'full_name', 'store_id'])
+
+
+class DimensionCache:
+    """Small lookup lists for dropdowns, loaded once per database and reloaded only
+    when the table_versions row of the table they come from has moved.
+
+    Triggers bump table_versions (see DatabaseManager.VERSIONED_WRITES), so writes
+    from any page, the API or another process are seen on the next lookup. A lookup
+    costs one primary key read of table_versions.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, conn, key, table, load):
+        """Cached load(cursor) for key, reloaded when table's version changes"""
+        cursor = conn.cursor()
+        cursor.execute("SELECT file FROM pragma_database_list WHERE name = 'main'")
+        path = cursor.fetchone()[0]
+        cursor.execute("SELECT version FROM table_versions WHERE name = ?", (table,))
+        row = cursor.fetchone()
+        version = row[0] if row else 0
+
+        entry_key = (path, key)
+        with self._lock:
+            entry = self._entries.get(entry_key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        value = load(cursor)
+        with self._lock:
+            self._entries[entry_key] = (version, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = DimensionCache()
+
+
+def cached_dimension(conn, key, table, load):
+    """Process-wide DimensionCache lookup; key must be hashable and unique per list"""
+    return _cache.get(conn, key, table, load)
+
+
+def clear_dimensions():
+    _cache.clear()
+
+
+def get_stores(conn):
+    """All stores in id order"""
+    def load(cursor):
+        cursor.execute("SELECT id, name, location FROM stores ORDER BY id")
+        return tuple(Store(*row) for row in cursor.fetchall())
+    return cached_dimension(conn, 'stores', 'stores', load)
+
+
+def get_store_options(conn, store_id=None):
+    """{store name: id} for store dropdowns, optionally just one store"""
+    return {s.name: s.id for s in get_stores(conn) if store_id is None or s.id == store_id}
+
+
+def get_store_name(conn, store_id):
+    return next((s.name for s in get_stores(conn) if s.id == store_id), None)
+
+
+def get_device_types(conn):
+    """Device types present on jobs, alphabetically"""
+    def load(cursor):
+        cursor.execute("SELECT DISTINCT device_type FROM jobs WHERE device_type IS NOT NULL ORDER BY device_type")
+        return tuple(row[0] for row in cursor.fetchall())
+    return list(cached_dimension(conn, 'device_types', 'jobs.device_type', load))
+
+
+def get_technicians(conn, store_id=None):
+    """Technician users in id order, optionally only those of one store"""
+    def load(cursor):
+        cursor.execute("""
+            SELECT id, username, full_name, store_id FROM users
+            WHERE role = 'technician'
+            ORDER BY id
+        """)
+        return tuple(Technician(*row) for row in cursor.fetchall())
+    technicians = cached_dimension(conn, 'technicians', 'users', load)
+    return [t for t in technicians if store_id is None or t.store_id == store_id]
@@ -0,0 +1,64 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FEED_BATCH_SIZE = 500
+
+_EVENT_COLUMNS = ['id', 'job_id', 'from_status', 'to_status', 'actor', 'ts']
+
+
+def record_job_event(cursor, job_id, from_status, to_status, actor=None):
+    """Append a status transition to job_events in the caller's transaction"""
+    cursor.execute('''
+        INSERT INTO job_events (job_id, from_status, to_status, actor)
+        VALUES (?, ?, ?, ?)
+    ''', (job_id, from_status, to_status, actor))
+    return cursor.lastrowid
+
+
+def fetch_job_events(conn, since_id=0, limit=FEED_BATCH_SIZE, job_id=None):
+    """Events with id greater than since_id, oldest first"""
+    query = "SELECT id, job_id, from_status, to_status, actor, ts FROM job_events WHERE id > ?"
+    params = [since_id]
+    if job_id is not None:
+        query += " AND job_id = ?"
+        params.append(job_id)
+    query += " ORDER BY id LIMIT ?"
+    params.append(limit)
+
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+    return [dict(zip(_EVENT_COLUMNS, row)) for row in cursor.fetchall()]
+
+
+def latest_event_id(conn):
+    """Id of the newest event (0 when the log is empty)"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT COALESCE(MAX(id), 0) FROM job_events")
+    return cursor.fetchone()[0]
+
+
+def get_feed_offset(conn, consumer):
+    """Last event id a named consumer has acknowledged"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT last_event_id FROM change_feed_offsets WHERE consumer = ?", (consumer,))
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+
+def read_change_feed(conn, consumer, limit=FEED_BATCH_SIZE):
+    """Next batch of events for a consumer, starting after its stored offset"""
+    return fetch_job_events(conn, get_feed_offset(conn, consumer), limit)
+
+
+def ack_change_feed(conn, consumer, last_event_id):
+    """Store a consumer's offset once it has processed events up to last_event_id"""
+    cursor = conn.cursor()
+    cursor.execute('''
+        INSERT INTO change_feed_offsets (consumer, last_event_id, updated_at)
+        VALUES (?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(consumer) DO UPDATE SET
+            last_event_id = MAX(last_event_id, excluded.last_event_id),
+            updated_at = excluded.updated_at
+    ''', (consumer, last_event_id))
+    conn.commit()
@@ -0,0 +1,90 @@
+import sys
+import os
+import pandas as pd
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.datamanager.customfields import indexed_value_filters
+from components.datamanager.deviceregistry import normalize_device_key
+
+
+def fetch_jobs_by_status(conn, user, status, payment_filter=None, search_term=None, device_filter="All"):
+    """Jobs in one status for the jobs page tabs, scoped by the user's role"""
+    base_query = '''
+    SELECT 
+        j.id,
+        j.created_at,
+        c.name AS customer_name,
+        c.phone AS customer_phone,
+        c.email AS customer_email,
+        j.device_type,
+        j.device_model,
+        j.problem_description,
+        j.status,
+        j.deposit_cost,
+        j.raw_cost,
+        j.estimate_cost,
+        j.actual_cost,
+        j.payment_status,
+        j.payment_method,
+        u.full_name AS technician,
+        s.name AS store_name,
+        s.location AS store_location,
+        j.completed_at
+    FROM jobs j
+    JOIN customers c ON j.customer_id = c.id
+    LEFT JOIN stores s ON j.store_id = s.id
+    LEFT JOIN assignment_jobs aj ON aj.job_id = j.id
+    LEFT JOIN technician_assignments ta ON ta.id = aj.assignment_id AND ta.status = 'active'
+    LEFT JOIN users u ON u.id = ta.technician_id
+    WHERE j.status = ?
+    '''
+
+    params = [status]
+
+    # Add payment filter
+    if payment_filter:
+        if payment_filter == "completed":
+            base_query += " AND j.payment_status = 'Completed'"
+        elif payment_filter == "pending":
+            base_query += " AND j.payment_status != 'Completed'"
+
+    # Role-based filtering
+    if user['role'] == 'admin':
+        pass
+    elif user['role'] in ['manager', 'staff']:
+        if user.get('store_id'):
+            base_query += " AND j.store_id = ?"
+            params.append(user['store_id'])
+    elif user['role'] == 'technician':
+        base_query += " AND ta.technician_id = ?"
+        params.append(user['id'])
+
+    # Enhanced search filter; IMEI/serial and indexed custom fields match exactly
+    if search_term:
+        custom_filters = indexed_value_filters(conn)
+        base_query += '''
+        AND (
+            c.name LIKE ? OR
+            c.email LIKE ? OR
+            c.phone LIKE ? OR
+            j.device_type LIKE ? OR
+            j.problem_description LIKE ? OR
+            CAST(j.id AS TEXT) LIKE ? OR
+            j.id IN (
+                SELECT l.record_id FROM devices d
+                JOIN device_links l ON l.device_id = d.id AND l.source = 'job'
+                WHERE d.device_key = ?
+            )
+        ''' + "".join(f" OR {condition}" for condition in custom_filters) + ")"
+        search_pattern = f"%{search_term}%"
+        params.extend([search_pattern]*6)
+        params.append(normalize_device_key(search_term))
+        params.extend([search_term.strip()] * len(custom_filters))
+
+    # Optional device filter
+    if device_filter != "All":
+        base_query += " AND j.device_type = ?"
+        params.append(device_filter)
+
+    base_query += " ORDER BY j.created_at DESC"
+
+    return pd.read_sql(base_query, conn, params=params)
@@ -0,0 +1,82 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.datamanager.technicianworkload import apply_workload_delta, job_workload_state, technicians_for_job
+from components.datamanager.technicianstats import refresh_technician_stats
+from components.datamanager.jobevents import record_job_event
+
+
+def insert_job_record(cursor, user, job_data):
+    """Create or update the customer and insert a 'New' job in the caller's transaction; returns the job id"""
+    # Use selected store instead of user's store
+    store_id = job_data.get('selected_store_id') or user.get('store_id')
+
+    if job_data.get('existing_customer_id'):
+        customer_id = job_data['existing_customer_id']
+        cursor.execute('''
+            UPDATE customers SET
+                name = ?, email = ?, address = ?
+            WHERE id = ?
+        ''', (
+            job_data['customer_name'],
+            job_data.get('customer_email'),
+            job_data.get('customer_address'),
+            customer_id
+        ))
+    else:
+        # Create new customer with selected store
+        cursor.execute('''
+            INSERT INTO customers (name, phone, email, address, store_id, created_at)
+            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ''', (
+            job_data['customer_name'],
+            job_data['customer_phone'],
+            job_data.get('customer_email'),
+            job_data.get('customer_address'),
+            store_id
+        ))
+        customer_id = cursor.lastrowid
+
+    cursor.execute('''
+        INSERT INTO jobs (
+            customer_id, store_id, device_type, device_model,
+            device_password_type, device_password,
+            problem_description, deposit_cost, estimate_cost,
+            notification_methods, assigned_by, status, created_at, updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'New', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+    ''', (
+        customer_id, store_id, job_data['device_type'], job_data.get('device_model'),
+        job_data.get('device_password_type'), job_data.get('device_password'),
+        job_data['problem_description'], job_data.get('deposit_cost', 0),
+        job_data.get('estimate_cost', 0), ','.join(job_data.get('notification_methods') or []),
+        job_data.get('assigned_by')
+    ))
+    job_id = cursor.lastrowid
+    record_job_event(cursor, job_id, None, 'New', user.get('id'))
+    return job_id
+
+
+def assign_technician(cursor, job_id, technician_id, assigned_by):
+    """Assign a technician to a job in the caller's transaction; returns the assignment id"""
+    already_assigned = technician_id in technicians_for_job(cursor, job_id)
+    cursor.execute('''
+        INSERT INTO technician_assignments
+        (technician_id, assigned_by, status, notes, assigned_at)
+        VALUES (?, ?, 'active', 'Initial assignment', CURRENT_TIMESTAMP)
+    ''', (technician_id, assigned_by))
+    assignment_id = cursor.lastrowid
+
+    # Link assignment to job
+    cursor.execute('''
+        INSERT INTO assignment_jobs (assignment_id, job_id)
+        VALUES (?, ?)
+    ''', (assignment_id, job_id))
+
+    # Same transaction as the job, so the workload never lags the assignment;
+    # a job counts once per technician however often it is assigned to them
+    apply_workload_delta(
+        cursor, [technician_id], None,
+        None if already_assigned else job_workload_state(cursor, job_id), assigned=True,
+    )
+    refresh_technician_stats(cursor, [job_id])
+    return assignment_id
@@ -0,0 +1,169 @@
+import sys
+import os
+import re
+from functools import partial
+from collections import namedtuple
+from types import MappingProxyType
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.datamanager.dimensions import cached_dimension
+
+FIELD_TYPES = ('text', 'email', 'phone', 'password', 'pattern', 'number', 'textarea',
+               'select', 'multiselect', 'checkbox', 'date')
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+# Fields the create form already stores on jobs, customers or the device registry;
+# every other field's values go to job_custom_values
+JOB_COLUMN_FIELDS = frozenset((
+    'customer_name', 'customer_phone', 'customer_email', 'phone_password', 'device_type',
+    'device_model', 'serial_number', 'problem_description', 'deposit_cost', 'deposit_amount',
+    'notification_method', 'assigned_technician', 'status',
+))
+# job_custom_values column a field type's values are stored (and indexed) in
+VALUE_COLUMNS = {'number': 'value_number', 'date': 'value_date'}
+
+# One compiled job_schema row. options and pattern are parsed once at compile time
+# (pattern "8-3-4" -> (8, 3, 4), None when unset or malformed); validate(value)
+# returns an error message or None. indexed fields get a partial index on their
+# value_column in job_custom_values.
+FormField = namedtuple('FormField', [
+    'id', 'name', 'label', 'type', 'required', 'active', 'paused', 'order',
+    'options', 'pattern', 'pattern_text', 'indexed', 'value_column', 'validate',
+])
+
+
+def parse_options(options):
+    """'a, b,c' -> ('a', 'b', 'c'), blanks dropped"""
+    return tuple(o.strip() for o in (options or "").split(",") if o.strip())
+
+
+def parse_pattern(pattern):
+    """'8-3-4' -> (8, 3, 4); None when empty or not positive numbers separated by dashes"""
+    try:
+        parts = tuple(int(x) for x in (pattern or "").split('-'))
+    except ValueError:
+        return None
+    return parts if parts and all(p > 0 for p in parts) else None
+
+
+def _check_select(field, value):
+    if field.options and value not in field.options:
+        return f"{field.label}: '{value}' is not one of {', '.join(field.options)}"
+
+
+def _check_choices(field, value):
+    if isinstance(value, bool):
+        return None
+    chosen = value if isinstance(value, (list, tuple)) else parse_options(value)
+    unknown = [v for v in chosen if field.options and v not in field.options]
+    if unknown:
+        return f"{field.label}: '{', '.join(unknown)}' is not one of {', '.join(field.options)}"
+
+
+def _check_email(field, value):
+    if not EMAIL_RE.match(value):
+        return f"{field.label}: invalid email '{value}'"
+
+
+def _check_phone(field, value):
+    if not 7 <= len(re.sub(r"\D", "", value)) <= 15:
+        return f"{field.label}: invalid phone '{value}'"
+
+
+def _check_number(field, value):
+    try:
+        float(value)
+    except ValueError:
+        return f"{field.label}: '{value}' is not a number"
+
+
+def _check_pattern(field, value):
+    parts = value.split('-')
+    if field.pattern and (len(parts) != len(field.pattern)
+                          or any(len(p) > n for p, n in zip(parts, field.pattern))):
+        return f"{field.label}: '{value}' does not match {field.pattern_text}"
+
+
+TYPE_CHECKS = {
+    'select': _check_select,
+    'multiselect': _check_choices,
+    'checkbox': _check_choices,
+    'email': _check_email,
+    'phone': _check_phone,
+    'number': _check_number,
+    'pattern': _check_pattern,
+}
+
+
+def _validate(field, value):
+    if isinstance(value, (bool, list, tuple)):
+        empty = not value
+    else:
+        value = "" if value is None else str(value).strip()
+        empty = not value
+    if empty:
+        return f"{field.label} is required" if field.required else None
+    check = TYPE_CHECKS.get(field.type)
+    return check(field, value) if check else None
+
+
+def value_column(field_type):
+    return VALUE_COLUMNS.get(field_type, 'value_text')
+
+
+def compile_field(row):
+    """FormField from a job_schema row (id, field_name, field_label, field_type, is_required,
+    is_active, is_paused, field_order, options, pattern, is_indexed)"""
+    field_id, name, label, field_type, required, active, paused, order, options, pattern, indexed = row
+    field = FormField(
+        field_id, name, label, field_type, bool(required), bool(active), bool(paused), order or 0,
+        parse_options(options), parse_pattern(pattern) if field_type == 'pattern' else None,
+        pattern or '', bool(indexed), value_column(field_type), None,
+    )
+    return field._replace(validate=partial(_validate, field))
+
+
+class FormDefinition:
+    """Immutable compiled job_schema: every row for the configuration page and the
+    active, unpaused ones in display order for job forms and import validation.
+    custom_fields are the active ones without a jobs column, by_id covers every row.
+
+    version is the job_schema table_versions counter it was compiled at; any write
+    to job_schema bumps it and the next get_form_definition recompiles.
+    """
+
+    __slots__ = ('version', 'all_fields', 'fields', 'by_name', 'by_id', 'custom_fields')
+
+    def __init__(self, version, all_fields):
+        all_fields = tuple(sorted(all_fields, key=lambda f: (f.order, f.id)))
+        fields = tuple(f for f in all_fields if f.active and not f.paused)
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, 'all_fields', all_fields)
+        object.__setattr__(self, 'fields', fields)
+        object.__setattr__(self, 'by_name', MappingProxyType({f.name: f for f in fields}))
+        object.__setattr__(self, 'by_id', MappingProxyType({f.id: f for f in all_fields}))
+        object.__setattr__(self, 'custom_fields', tuple(f for f in fields if f.name not in JOB_COLUMN_FIELDS))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FormDefinition is immutable")
+
+    def validate(self, values):
+        """Error messages for a {field name: value} mapping against the active fields"""
+        errors = []
+        for field in self.fields:
+            error = field.validate(values.get(field.name))
+            if error:
+                errors.append(error)
+        return errors
+
+
+def get_form_definition(conn):
+    """Compiled job_schema, recompiled only after a write to job_schema"""
+    def load(cursor):
+        cursor.execute("SELECT version FROM table_versions WHERE name = 'job_schema'")
+        row = cursor.fetchone()
+        cursor.execute('''
+            SELECT id, field_name, field_label, field_type, is_required, is_active,
+                   COALESCE(is_paused, 0), field_order, options, pattern, COALESCE(is_indexed, 0)
+            FROM job_schema
+        ''')
+        return FormDefinition(row[0] if row else 0, [compile_field(r) for r in cursor.fetchall()])
+    return cached_dimension(conn, 'job_schema', 'job_schema', load)
@@ -0,0 +1,45 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.datamanager.technicianworkload import apply_workload_delta, job_workload_state, technicians_for_job
+from components.datamanager.technicianstats import refresh_technician_stats
+from components.datamanager.jobevents import record_job_event
+
+
+# Default for a cost apply_job_status leaves as it is; None clears it
+UNCHANGED = object()
+
+
+def apply_job_status(cursor, job_id, new_status, raw_cost=UNCHANGED, actual_cost=UNCHANGED, actor=None):
+    """Write a job status change and its dependent rows in the caller's transaction; returns the previous status"""
+    old_state = job_workload_state(cursor, job_id)
+    if old_state is None:
+        raise ValueError(f"Job #{job_id} not found")
+    previous_status = old_state[0]
+
+    costs = [(column, value) for column, value in (('raw_cost', raw_cost), ('actual_cost', actual_cost))
+             if value is not UNCHANGED]
+    cursor.execute(f'''
+        UPDATE jobs
+        SET status = ?,
+            {"".join(f"{column} = ?, " for column, _ in costs)}
+            started_at = CASE WHEN ? = 'In Progress' THEN COALESCE(started_at, CURRENT_TIMESTAMP) ELSE started_at END,
+            completed_at = CASE WHEN ? = 'Completed' THEN CURRENT_TIMESTAMP END,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    ''', (new_status, *(value for _, value in costs), new_status, new_status, job_id))
+
+    # Keep the job's active technician assignment in step with the job
+    cursor.execute('''
+        UPDATE technician_assignments
+        SET status = ?
+        WHERE status = 'active' AND id IN (SELECT assignment_id FROM assignment_jobs WHERE job_id = ?)
+    ''', ('completed' if new_status == 'Completed' else 'active', job_id))
+
+    if previous_status != new_status:
+        record_job_event(cursor, job_id, previous_status, new_status, actor)
+
+    # Moves the job between its technicians' status buckets; no history scan under the write lock
+    apply_workload_delta(cursor, technicians_for_job(cursor, job_id), old_state, job_workload_state(cursor, job_id))
+    refresh_technician_stats(cursor, [job_id])
+    return previous_status
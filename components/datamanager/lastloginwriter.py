@@ -0,0 +1,86 @@
+import sys
+import os
+import atexit
+import sqlite3
+import threading
+from datetime import datetime, timezone
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Seconds between batched last_login flushes
+FLUSH_INTERVAL = float(os.environ.get("REPAIRPRO_LAST_LOGIN_FLUSH_SECONDS", "3"))
+
+
+class LastLoginWriter:
+    """Coalesces users.last_login updates and writes them in one transaction per interval"""
+
+    def __init__(self, db_path, interval=FLUSH_INTERVAL):
+        self.db_path = db_path
+        self.interval = interval
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self.flushed_batches = 0
+        self.flushed_rows = 0
+        self._thread = threading.Thread(target=self._run, name="last-login-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def record(self, user_id, when=None):
+        """Queue a login; only the latest time per user is written"""
+        # Same format and timezone as CURRENT_TIMESTAMP
+        when = when or datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        with self._lock:
+            self._pending[user_id] = when
+
+    def flush(self):
+        """Write all queued logins now; returns the number of users updated"""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA busy_timeout = 30000")
+            with conn:
+                conn.executemany(
+                    "UPDATE users SET last_login = ? WHERE id = ?",
+                    [(when, user_id) for user_id, when in batch.items()]
+                )
+            conn.close()
+        except sqlite3.Error as e:
+            print("last_login flush failed:", e)
+            # Keep the batch for the next attempt unless newer logins replaced it
+            with self._lock:
+                for user_id, when in batch.items():
+                    self._pending.setdefault(user_id, when)
+            return 0
+        self.flushed_batches += 1
+        self.flushed_rows += len(batch)
+        return len(batch)
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def stop(self):
+        """Flush remaining logins and stop the background thread"""
+        self._stopped = True
+        self._wake.set()
+        self._thread.join(timeout=5)
+        self.flush()
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_last_login_writer(db_path):
+    """Process-wide writer for a database"""
+    key = os.path.abspath(db_path)
+    with _writers_lock:
+        if key not in _writers:
+            _writers[key] = LastLoginWriter(db_path)
+        return _writers[key]
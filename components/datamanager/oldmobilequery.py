@@ -0,0 +1,101 @@
+import sys
+import os
+import re
+import pandas as pd
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.datamanager.dimensions import cached_dimension
+
+OLD_MOBILE_PAGE_SIZE = 20
+
+IMEI_PATTERN = re.compile(r"^\d{15}$")
+
+
+def build_old_mobile_filters(store_id=None, search_term="", brand="All", status="All"):
+    """Build the WHERE clause and params for old mobile filters"""
+    conditions = []
+    params = []
+
+    if store_id is not None:
+        conditions.append("om.store_id = ?")
+        params.append(store_id)
+
+    search_term = (search_term or "").strip()
+    if search_term:
+        if IMEI_PATTERN.match(search_term):
+            # Full IMEI typed: exact match served by the IMEI index
+            conditions.append("om.imei_number = ?")
+            params.append(search_term)
+        else:
+            conditions.append("(om.customer_name LIKE ? OR om.customer_phone LIKE ? OR om.mobile_brand LIKE ?)")
+            like = f"%{search_term}%"
+            params.extend([like, like, like])
+
+    if brand and brand != "All":
+        conditions.append("om.mobile_brand = ?")
+        params.append(brand)
+
+    if status and status != "All":
+        conditions.append("om.repair_status = ?")
+        params.append(status)
+
+    where_clause = " AND ".join(conditions) if conditions else "1 = 1"
+    return where_clause, params
+
+
+def count_old_mobiles(conn, where_clause, params):
+    """Total, working and not-working counts for the filtered records"""
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT
+            COUNT(*),
+            COALESCE(SUM(CASE WHEN om.repair_status = 'Working' THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN om.repair_status = 'Not Working' THEN 1 ELSE 0 END), 0)
+        FROM old_mobiles om
+        WHERE {where_clause}
+    """, params)
+    total, working, not_working = cursor.fetchone()
+    return {'total': total, 'working': working, 'not_working': not_working}
+
+
+def search_old_mobiles(conn, store_id=None, search_term="", brand="All", status="All",
+                       page=1, page_size=OLD_MOBILE_PAGE_SIZE, include_store_name=False):
+    """Return (page DataFrame, counts) for old mobile records matching the filters"""
+    where_clause, params = build_old_mobile_filters(store_id, search_term, brand, status)
+    counts = count_old_mobiles(conn, where_clause, params)
+
+    offset = max(page - 1, 0) * page_size
+    if include_store_name:
+        query = f"""
+            SELECT om.*, s.name as store_name
+            FROM old_mobiles om
+            LEFT JOIN stores s ON om.store_id = s.id
+            WHERE {where_clause}
+            ORDER BY om.created_at DESC
+            LIMIT ? OFFSET ?
+        """
+    else:
+        query = f"""
+            SELECT om.* FROM old_mobiles om
+            WHERE {where_clause}
+            ORDER BY om.created_at DESC
+            LIMIT ? OFFSET ?
+        """
+    df = pd.read_sql_query(query, conn, params=params + [page_size, offset])
+    return df, counts
+
+
+def get_old_mobile_facets(conn, store_id=None):
+    """Brand and status options with record counts per store scope, reloaded after old_mobiles writes"""
+    def load(cursor):
+        where_clause, params = build_old_mobile_filters(store_id)
+        facets = {}
+        for key, column in (('brands', 'mobile_brand'), ('statuses', 'repair_status')):
+            cursor.execute(f"""
+                SELECT om.{column}, COUNT(*) FROM old_mobiles om
+                WHERE {where_clause} AND om.{column} IS NOT NULL AND om.{column} != ''
+                GROUP BY om.{column}
+                ORDER BY COUNT(*) DESC, om.{column}
+            """, params)
+            facets[key] = cursor.fetchall()
+        return facets
+    return cached_dimension(conn, ('old_mobile_facets', store_id), 'old_mobiles', load)
@@ -0,0 +1,369 @@
+import sys
+import os
+import re
+import bisect
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from functools import lru_cache
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set REPAIRPRO_QUERY_STATS=0 to hand out plain sqlite3 connections
+ENABLED = os.environ.get("REPAIRPRO_QUERY_STATS", "1") != "0"
+# Queries at or above this many milliseconds are appended to the slow-query log
+SLOW_QUERY_MS = float(os.environ.get("REPAIRPRO_SLOW_QUERY_MS", "250"))
+SLOW_QUERY_LOG = os.environ.get("REPAIRPRO_SLOW_QUERY_LOG", "slow_queries.log")
+# Most recent executions kept individually; older ones only live on in the per-query totals
+RING_SIZE = int(os.environ.get("REPAIRPRO_QUERY_RING_SIZE", "5000"))
+MAX_FINGERPRINTS = 2000
+
+# Histogram bucket upper bounds: 10us growing by 25% per bucket up to ~10 minutes
+BUCKET_BOUNDS_MS = [0.01 * 1.25 ** i for i in range(81)]
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+WRITE_KEYWORDS = {"INSERT", "UPDATE", "DELETE", "REPLACE"}
+LOCK_KEYWORDS = {"BEGIN", "COMMIT", "END"}
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(sql):
+    """SQL with literals, IN-lists and whitespace normalized, so one query shape is one entry"""
+    text = _COMMENTS.sub(" ", sql)
+    text = _STRINGS.sub("?", text)
+    text = _NUMBERS.sub("?", text)
+    text = _IN_LISTS.sub("(?+)", text)
+    return _SPACES.sub(" ", text).strip().rstrip(";").strip()
+
+
+def fingerprint_id(text):
+    return hashlib.md5(text.encode()).hexdigest()[:10]
+
+
+# code object -> repo-relative path, or None for stdlib / site-packages / this module
+_code_paths = {}
+
+
+def _repo_path(code):
+    try:
+        return _code_paths[code]
+    except KeyError:
+        path = os.path.abspath(code.co_filename)
+        if (not path.startswith(REPO_ROOT + os.sep) or "site-packages" in path
+                or path == os.path.abspath(__file__)):
+            rel = None
+        else:
+            rel = os.path.relpath(path, REPO_ROOT)
+        _code_paths[code] = rel
+        return rel
+
+
+def find_caller():
+    """(caller, page) for the innermost app frame and the page module it runs under"""
+    frame = sys._getframe(2)
+    caller = page = None
+    while frame is not None:
+        rel = _repo_path(frame.f_code)
+        if rel:
+            if caller is None:
+                caller = f"{os.path.splitext(rel)[0].replace(os.sep, '.')}.{frame.f_code.co_name}"
+            if rel.startswith("pages" + os.sep):
+                page = os.path.splitext(os.path.basename(rel))[0]
+                break
+        frame = frame.f_back
+    caller = caller or "unknown"
+    return caller, page or caller.rsplit(".", 1)[0].rsplit(".", 1)[-1]
+
+
+class QueryStats:
+    """Totals and a latency histogram for one query fingerprint"""
+
+    __slots__ = ("fingerprint", "id", "calls", "total_ms", "max_ms", "rows", "lock_ms",
+                 "errors", "callers", "pages", "buckets")
+
+    def __init__(self, text):
+        self.fingerprint = text
+        self.id = fingerprint_id(text)
+        self.calls = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.lock_ms = 0.0
+        self.errors = 0
+        self.callers = Counter()
+        self.pages = Counter()
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+
+    def add(self, ms, rows, lock_ms, caller, page, error):
+        self.calls += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.rows += max(rows, 0)
+        self.lock_ms += lock_ms
+        self.errors += bool(error)
+        self.callers[caller] += 1
+        self.pages[page] += 1
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+
+    def percentile(self, q):
+        """Upper bound of the histogram bucket holding the q-th percentile (capped at the max)"""
+        target = q * self.calls
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                return min(BUCKET_BOUNDS_MS[i] if i < len(BUCKET_BOUNDS_MS) else self.max_ms, self.max_ms)
+        return self.max_ms
+
+    def as_dict(self):
+        return {
+            "id": self.id,
+            "fingerprint": self.fingerprint,
+            "calls": self.calls,
+            "total_ms": self.total_ms,
+            "avg_ms": self.total_ms / self.calls if self.calls else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": self.max_ms,
+            "rows": self.rows,
+            "avg_rows": self.rows / self.calls if self.calls else 0.0,
+            "lock_ms": self.lock_ms,
+            "errors": self.errors,
+            "top_caller": self.callers.most_common(1)[0][0] if self.callers else None,
+            "top_page": self.pages.most_common(1)[0][0] if self.pages else None,
+        }
+
+
+class QueryRecorder:
+    """Process-wide store of recent executions and per-fingerprint statistics"""
+
+    def __init__(self, ring_size=RING_SIZE, slow_ms=SLOW_QUERY_MS, slow_log=SLOW_QUERY_LOG):
+        self.slow_ms = slow_ms
+        self.slow_log = slow_log
+        self._recent = deque(maxlen=ring_size)
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self.started = datetime.now()
+
+    def record(self, sql, ms, rows, lock_ms=0.0, error=None):
+        text = fingerprint(sql)
+        caller, page = find_caller()
+        entry = {
+            "at": time.time(),
+            "id": fingerprint_id(text),
+            "ms": ms,
+            "rows": rows,
+            "lock_ms": lock_ms,
+            "caller": caller,
+            "page": page,
+            "error": error,
+        }
+        _thread_totals.count = getattr(_thread_totals, "count", 0) + 1
+        _thread_totals.ms = getattr(_thread_totals, "ms", 0.0) + ms
+        with self._lock:
+            stats = self._stats.get(text)
+            if stats is None:
+                if len(self._stats) >= MAX_FINGERPRINTS:
+                    # Keep memory bounded when something builds SQL with unbound literals
+                    del self._stats[min(self._stats, key=lambda k: self._stats[k].total_ms)]
+                stats = self._stats[text] = QueryStats(text)
+            stats.add(ms, rows, lock_ms, caller, page, error)
+            self._recent.append(entry)
+        if ms >= self.slow_ms and self.slow_log:
+            self._log_slow(entry, text)
+
+    def _log_slow(self, entry, text):
+        line = dict(entry, at=datetime.fromtimestamp(entry["at"]).isoformat(timespec="milliseconds"),
+                    ms=round(entry["ms"], 3), lock_ms=round(entry["lock_ms"], 3), sql=text)
+        try:
+            with self._log_lock, open(self.slow_log, "a") as f:
+                f.write(json.dumps(line) + "\n")
+        except OSError:
+            # A read-only deployment still gets the in-memory statistics
+            pass
+
+    def top(self, limit=50, order_by="total_ms"):
+        """Per-fingerprint statistics as dicts, largest order_by first"""
+        with self._lock:
+            rows = [stats.as_dict() for stats in self._stats.values()]
+        rows.sort(key=lambda r: r[order_by], reverse=True)
+        return rows[:limit]
+
+    def recent(self, min_ms=0.0):
+        with self._lock:
+            return [dict(e) for e in self._recent if e["ms"] >= min_ms]
+
+    def reset(self):
+        with self._lock:
+            self._recent.clear()
+            self._stats.clear()
+            self.started = datetime.now()
+
+
+_recorder = QueryRecorder()
+_thread_totals = threading.local()
+
+
+def get_query_recorder():
+    return _recorder
+
+
+def thread_query_totals():
+    """(queries, milliseconds) recorded so far on the calling thread"""
+    return getattr(_thread_totals, "count", 0), getattr(_thread_totals, "ms", 0.0)
+
+
+def _keyword(sql):
+    word = sql.lstrip().split(None, 1)
+    return word[0].upper() if word else ""
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that reports each statement's time, rows and lock wait to the recorder.
+
+    SQLite does most of a SELECT's work while rows are fetched, so a statement is
+    recorded once its results are exhausted, the cursor is closed or reused.
+    """
+
+    _pending = None
+
+    def _start(self, sql, run):
+        self._finish()
+        acquires_lock = _keyword(sql) in LOCK_KEYWORDS or (
+            _keyword(sql) in WRITE_KEYWORDS and not self.connection.in_transaction
+        )
+        started = time.perf_counter()
+        try:
+            run()
+        except sqlite3.Error as e:
+            ms = (time.perf_counter() - started) * 1000
+            locked = "locked" in str(e) or "busy" in str(e)
+            _recorder.record(sql, ms, 0, ms if locked or acquires_lock else 0.0, type(e).__name__)
+            raise
+        ms = (time.perf_counter() - started) * 1000
+        # The busy handler waits inside the statement that takes the write lock
+        lock_ms = ms if acquires_lock else 0.0
+        if self.description is None:
+            _recorder.record(sql, ms, self.rowcount, lock_ms)
+        else:
+            self._pending = [sql, ms, 0, lock_ms]
+        return self
+
+    def _fetched(self, started, count, exhausted):
+        pending = self._pending
+        if pending is not None:
+            pending[1] += (time.perf_counter() - started) * 1000
+            pending[2] += count
+            if exhausted:
+                self._finish()
+
+    def _finish(self):
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            _recorder.record(pending[0], pending[1], pending[2], pending[3])
+
+    def execute(self, sql, parameters=()):
+        return self._start(sql, lambda: super(InstrumentedCursor, self).execute(sql, parameters))
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._start(sql, lambda: super(InstrumentedCursor, self).executemany(sql, seq_of_parameters))
+
+    def executescript(self, sql_script):
+        return self._start(sql_script, lambda: super(InstrumentedCursor, self).executescript(sql_script))
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(started, row is not None, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        size = self.arraysize if size is None else size
+        rows = super().fetchmany(size)
+        self._fetched(started, len(rows), len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(started, len(rows), True)
+        return rows
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(started, 0, True)
+            raise
+        self._fetched(started, 1, False)
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors, shortcut execute methods and commits are instrumented.
+
+    pd.read_sql goes through cursor(), so DataFrame queries are recorded too.
+    """
+
+    def cursor(self, factory=None):
+        return super().cursor(factory or InstrumentedCursor)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+    def _timed_commit(self, commit):
+        if not self.in_transaction:
+            return commit()
+        started = time.perf_counter()
+        try:
+            result = commit()
+        except sqlite3.Error as e:
+            ms = (time.perf_counter() - started) * 1000
+            _recorder.record("COMMIT", ms, 0, ms, type(e).__name__)
+            raise
+        ms = (time.perf_counter() - started) * 1000
+        _recorder.record("COMMIT", ms, 0, ms)
+        return result
+
+    def commit(self):
+        return self._timed_commit(super().commit)
+
+    def __exit__(self, exc_type, exc_value, tb):
+        # "with conn:" commits in C without going through commit()
+        if exc_type is not None:
+            return super().__exit__(exc_type, exc_value, tb)
+        return self._timed_commit(lambda: super(InstrumentedConnection, self).__exit__(None, None, None))
+
+
+def connection_factory():
+    """Factory to pass to sqlite3.connect"""
+    return InstrumentedConnection if ENABLED else sqlite3.Connection
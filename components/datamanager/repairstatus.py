@@ -0,0 +1,215 @@
+import sys
+import os
+import time
+import sqlite3
+import threading
+from collections import namedtuple
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.datamanager.databasemanger import DatabaseManager
+from components.datamanager.jobevents import fetch_job_events, latest_event_id
+
+# Same field order as the tuple display_job_info unpacks
+JobStatusRecord = namedtuple('JobStatusRecord', [
+    'job_id', 'device_model', 'problem_description', 'actual_cost', 'status',
+    'customer_name', 'customer_phone', 'store_name', 'store_phone',
+])
+
+STATUS_TTL_SECONDS = 30
+MISSING_TTL_SECONDS = 5
+MAX_CACHED_JOBS = 50000
+# How often lookups check job_events and table_versions for writes made by other processes
+EVENT_POLL_SECONDS = 1.0
+# Seconds of jobs.updated_at re-read when the jobs counter moves: updated_at is stamped
+# when a statement runs, and its transaction may commit after a poll
+UPDATED_OVERLAP_SECONDS = 120
+# table_versions counters covering the columns a status record shows
+RECORD_VERSIONS = ('jobs', 'customers.contact', 'stores')
+
+RATE_LIMIT_PER_SECOND = 5
+RATE_LIMIT_BURST = 20
+
+
+# Fields the unauthenticated status endpoint returns. Job ids are sequential, so
+# anything about the customer or the repair itself (name, phone, problem, cost) stays out.
+PUBLIC_STATUS_FIELDS = ('job_id', 'device_model', 'status', 'store_name', 'store_phone')
+
+
+def public_status(record):
+    """JSON-safe view of a status record without customer or repair details"""
+    return {field: getattr(record, field) for field in PUBLIC_STATUS_FIELDS}
+
+
+class RateLimiter:
+    """Token bucket per client key"""
+
+    def __init__(self, rate=RATE_LIMIT_PER_SECOND, burst=RATE_LIMIT_BURST, max_keys=100000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key):
+        """Take one token for key; returns (allowed, retry_after_seconds)"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                allowed, retry_after = True, 0
+            else:
+                self._buckets[key] = (tokens, now)
+                allowed, retry_after = False, (1 - tokens) / self.rate
+
+            if len(self._buckets) > self.max_keys:
+                # Drop buckets that have fully refilled
+                idle = self.burst / self.rate
+                self._buckets = {k: v for k, v in self._buckets.items() if now - v[1] < idle}
+        return allowed, retry_after
+
+
+class RepairStatusService:
+    """Read-optimized job status lookups with a TTL cache invalidated on writes"""
+
+    def __init__(self, db_path=None, ttl=STATUS_TTL_SECONDS):
+        # Bootstraps the schema once; lookups then use plain read connections
+        self.db_path = DatabaseManager(db_path).db_path
+        self.ttl = ttl
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._last_event_id = None
+        self._versions = None
+        self._updated_since = None
+        self._next_poll = 0.0
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA busy_timeout = 30000")
+            conn.execute("PRAGMA query_only = 1")
+            self._local.conn = conn
+        return conn
+
+    def _read_versions(self, conn):
+        placeholders = ",".join("?" * len(RECORD_VERSIONS))
+        rows = dict(conn.execute(
+            f"SELECT name, version FROM table_versions WHERE name IN ({placeholders})", RECORD_VERSIONS
+        ).fetchall())
+        updated_since = conn.execute(
+            f"SELECT datetime('now', '-{UPDATED_OVERLAP_SECONDS} seconds')"
+        ).fetchone()[0]
+        return {name: rows.get(name, 0) for name in RECORD_VERSIONS}, updated_since
+
+    def _poll_events(self, conn):
+        """Evict jobs changed by other processes since the last poll.
+
+        Status changes arrive as job_events. Other edits to what a record shows move a
+        table_versions counter: for jobs the rows updated since the last poll (less the
+        overlap) are evicted, a customer or store edit clears the whole cache.
+        """
+        now = time.monotonic()
+        if now < self._next_poll:
+            return
+        self._next_poll = now + EVENT_POLL_SECONDS
+
+        if self._last_event_id is None:
+            self._last_event_id = latest_event_id(conn)
+            self._versions, self._updated_since = self._read_versions(conn)
+            return
+        while True:
+            events = fetch_job_events(conn, self._last_event_id)
+            if not events:
+                break
+            with self._lock:
+                for event in events:
+                    self._cache.pop(event['job_id'], None)
+            self._last_event_id = events[-1]['id']
+
+        # Read before the changed rows, so a later commit moves the counters again
+        versions, updated_since = self._read_versions(conn)
+        if versions == self._versions:
+            self._updated_since = updated_since
+            return
+        if any(versions[name] != self._versions[name] for name in RECORD_VERSIONS if name != 'jobs'):
+            with self._lock:
+                self._cache.clear()
+        elif versions['jobs'] != self._versions['jobs']:
+            changed = conn.execute(
+                "SELECT id FROM jobs WHERE updated_at >= ?", (self._updated_since,)
+            ).fetchall()
+            with self._lock:
+                for (job_id,) in changed:
+                    self._cache.pop(job_id, None)
+        self._versions, self._updated_since = versions, updated_since
+
+    def _load(self, conn, job_id):
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT j.id, j.device_model, j.problem_description, j.actual_cost, j.status,
+                   c.name AS customer_name, c.phone AS customer_phone,
+                   s.name AS store_name, s.phone AS store_phone
+            FROM jobs j
+            LEFT JOIN customers c ON j.customer_id = c.id
+            LEFT JOIN stores s ON j.store_id = s.id
+            WHERE j.id = ?
+        ''', (job_id,))
+        row = cursor.fetchone()
+        return JobStatusRecord(*row) if row else None
+
+    def get(self, job_id):
+        """Status record for a job, or None when it does not exist"""
+        job_id = int(job_id)
+        conn = self._connection()
+        self._poll_events(conn)
+
+        now = time.monotonic()
+        entry = self._cache.get(job_id)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        record = self._load(conn, job_id)
+        expires = now + (self.ttl if record else MISSING_TTL_SECONDS)
+        with self._lock:
+            if len(self._cache) >= MAX_CACHED_JOBS:
+                self._cache = {k: v for k, v in self._cache.items() if v[0] > now}
+                if len(self._cache) >= MAX_CACHED_JOBS:
+                    self._cache.clear()
+            self._cache[job_id] = (expires, record)
+        return record
+
+    def invalidate(self, job_id):
+        """Drop a job's cached record after it was written"""
+        with self._lock:
+            self._cache.pop(int(job_id), None)
+
+
+_service = None
+_limiter = None
+_service_lock = threading.Lock()
+
+
+def get_status_service(db_path=None):
+    """Process-wide repair status service"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = RepairStatusService(db_path)
+        return _service
+
+
+def get_status_rate_limiter():
+    """Process-wide per-client limiter for public status lookups"""
+    global _limiter
+    with _service_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+        return _limiter
+
+
+def invalidate_job_status(job_id):
+    """Invalidate a job in this process's status cache, if the service is running"""
+    if _service is not None:
+        _service.invalidate(job_id)
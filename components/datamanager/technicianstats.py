@@ -0,0 +1,69 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# technician_daily_stats: one row per technician, assignment day, job store, device type
+# and model. Counts are over assignment-job pairs, as the report joins counted them.
+# Durations are stored as sums with a count so any range of rows averages exactly.
+_STATS_COLUMNS = """
+    technician_id, day, store_id, device_type, device_model,
+    jobs, completed_jobs, in_progress_jobs, new_jobs, failed_jobs, completed_assignments,
+    revenue, actual_cost_total, deposit_total,
+    job_hours, timed_jobs, assignment_hours, timed_assignments
+"""
+
+_STATS_SELECT = """
+    SELECT
+        ta.technician_id, ta.assigned_day, j.store_id, j.device_type, j.device_model,
+        COUNT(*),
+        SUM(j.status = 'Completed'),
+        SUM(j.status = 'In Progress'),
+        SUM(j.status = 'New'),
+        SUM(j.status = 'Failed'),
+        SUM(ta.status = 'completed'),
+        SUM(CASE WHEN j.status = 'Completed' THEN COALESCE(j.actual_cost, 0) ELSE 0 END),
+        SUM(COALESCE(j.actual_cost, 0)),
+        SUM(COALESCE(j.deposit_cost, 0)),
+        COALESCE(SUM(CASE WHEN j.status = 'Completed' AND j.started_at IS NOT NULL AND j.completed_at IS NOT NULL
+                          THEN (julianday(j.completed_at) - julianday(j.started_at)) * 24 END), 0),
+        SUM(j.status = 'Completed' AND j.started_at IS NOT NULL AND j.completed_at IS NOT NULL),
+        COALESCE(SUM(CASE WHEN ta.started_at IS NOT NULL AND ta.completed_at IS NOT NULL
+                          THEN (julianday(ta.completed_at) - julianday(ta.started_at)) * 24 END), 0),
+        SUM(ta.started_at IS NOT NULL AND ta.completed_at IS NOT NULL)
+    FROM technician_assignments ta
+    JOIN assignment_jobs aj ON aj.assignment_id = ta.id
+    JOIN jobs j ON j.id = aj.job_id
+"""
+
+_STATS_GROUP = " GROUP BY ta.technician_id, ta.assigned_day, j.store_id, j.device_type, j.device_model"
+
+
+def refresh_technician_stats(cursor, job_ids=None):
+    """Recompute the (technician, day) slices holding the given jobs (everything when None) in the caller's transaction"""
+    if job_ids is None:
+        cursor.execute("DELETE FROM technician_daily_stats")
+        cursor.execute(f"INSERT INTO technician_daily_stats ({_STATS_COLUMNS})" + _STATS_SELECT + _STATS_GROUP)
+        return
+
+    job_ids = sorted({int(j) for j in job_ids if j is not None})
+    if not job_ids:
+        return
+    placeholders = ",".join("?" * len(job_ids))
+    cursor.execute(f"""
+        SELECT DISTINCT ta.technician_id, ta.assigned_day
+        FROM assignment_jobs aj
+        JOIN technician_assignments ta ON ta.id = aj.assignment_id
+        WHERE aj.job_id IN ({placeholders})
+    """, job_ids)
+    # Each slice is one technician's assignments for one day, read through
+    # idx_technician_assignments_technician_assigned_day
+    for technician_id, day in cursor.fetchall():
+        cursor.execute(
+            "DELETE FROM technician_daily_stats WHERE technician_id = ? AND day IS ?",
+            (technician_id, day),
+        )
+        cursor.execute(
+            f"INSERT INTO technician_daily_stats ({_STATS_COLUMNS})" + _STATS_SELECT
+            + " WHERE ta.technician_id = ? AND ta.assigned_day IS ?" + _STATS_GROUP,
+            (technician_id, day),
+        )
@@ -0,0 +1,167 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Hours a completed job took, NULL for other jobs; averaged into avg_completion_hours
+COMPLETION_HOURS = """
+    CASE WHEN j.status = 'Completed' AND j.completed_at IS NOT NULL
+         THEN (julianday(j.completed_at) - julianday(COALESCE(j.started_at, j.created_at))) * 24 END
+"""
+
+# Status -> workload count column; any other non-null status counts as pending
+_STATUS_COLUMNS = {'New': 'new_jobs', 'In Progress': 'in_progress_jobs', 'Completed': 'completed_jobs'}
+_COUNT_COLUMNS = ('new_jobs', 'in_progress_jobs', 'pending_jobs', 'open_jobs', 'completed_jobs')
+
+# Aggregates one row per technician from their distinct assigned jobs
+_WORKLOAD_SELECT = f"""
+    SELECT
+        tj.technician_id,
+        SUM(j.status = 'New'),
+        SUM(j.status = 'In Progress'),
+        SUM(j.status NOT IN ('New', 'In Progress', 'Completed')),
+        SUM(j.status != 'Completed'),
+        SUM(j.status = 'Completed'),
+        COALESCE(SUM({COMPLETION_HOURS}), 0),
+        COUNT({COMPLETION_HOURS}),
+        AVG({COMPLETION_HOURS}),
+        MAX(tj.last_assigned_at),
+        CURRENT_TIMESTAMP
+    FROM (
+        SELECT ta.technician_id, aj.job_id, MAX(ta.assigned_at) AS last_assigned_at
+        FROM technician_assignments ta
+        JOIN assignment_jobs aj ON aj.assignment_id = ta.id
+        {{where}}
+        GROUP BY ta.technician_id, aj.job_id
+    ) tj
+    JOIN jobs j ON j.id = tj.job_id
+    GROUP BY tj.technician_id
+"""
+
+_WORKLOAD_INSERT = """
+    INSERT INTO technician_workload (
+        technician_id, new_jobs, in_progress_jobs, pending_jobs, open_jobs, completed_jobs,
+        completion_hours_total, timed_completions, avg_completion_hours, last_assigned_at, updated_at
+    )
+"""
+
+
+def refresh_technician_workload(cursor, technician_ids=None):
+    """Rebuild workload rows for the given technicians (all when None) in the caller's transaction.
+
+    Reads each technician's whole history; for rebuilds after bulk loads only. Single job
+    writes go through apply_workload_delta.
+    """
+    if technician_ids is None:
+        cursor.execute("DELETE FROM technician_workload")
+        cursor.execute(_WORKLOAD_INSERT + _WORKLOAD_SELECT.format(where=""))
+        return
+
+    technician_ids = sorted({int(t) for t in technician_ids if t is not None})
+    if not technician_ids:
+        return
+    placeholders = ",".join("?" * len(technician_ids))
+    cursor.execute(f"DELETE FROM technician_workload WHERE technician_id IN ({placeholders})", technician_ids)
+    cursor.execute(
+        _WORKLOAD_INSERT + _WORKLOAD_SELECT.format(where=f"WHERE ta.technician_id IN ({placeholders})"),
+        technician_ids,
+    )
+
+
+def job_workload_state(cursor, job_id):
+    """(status, completion hours or None) of a job, as the workload projection counts it"""
+    cursor.execute(f"SELECT j.status, {COMPLETION_HOURS} FROM jobs j WHERE j.id = ?", (job_id,))
+    return cursor.fetchone()
+
+
+def apply_workload_delta(cursor, technician_ids, old_state=None, new_state=None, assigned=False):
+    """Move one job's contribution on its technicians' workload rows from old_state to new_state.
+
+    States are job_workload_state tuples; old_state None adds the job (a new assignment),
+    new_state None removes it. assigned also stamps last_assigned_at. Costs one primary key
+    update per technician, whatever their history.
+    """
+    technician_ids = sorted({int(t) for t in technician_ids if t is not None})
+    if not technician_ids:
+        return
+    counts = dict.fromkeys(_COUNT_COLUMNS, 0)
+    hours, timed = 0.0, 0
+    for state, sign in ((old_state, -1), (new_state, 1)):
+        if not state or state[0] is None:
+            continue
+        status, completion_hours = state
+        counts[_STATUS_COLUMNS.get(status, 'pending_jobs')] += sign
+        if status != 'Completed':
+            counts['open_jobs'] += sign
+        if completion_hours is not None:
+            hours += sign * completion_hours
+            timed += sign
+
+    placeholders = ",".join("?" * len(technician_ids))
+    cursor.executemany(
+        "INSERT OR IGNORE INTO technician_workload (technician_id) VALUES (?)",
+        [(t,) for t in technician_ids],
+    )
+    # Right-hand sides see the row before the update; the hour sum resets to exactly 0
+    # with its last timed job so float residue never outlives it
+    cursor.execute(f"""
+        UPDATE technician_workload SET
+            {", ".join(f"{c} = {c} + ?" for c in _COUNT_COLUMNS)},
+            completion_hours_total = CASE WHEN timed_completions + ? = 0 THEN 0
+                                          ELSE completion_hours_total + ? END,
+            avg_completion_hours = (completion_hours_total + ?) / NULLIF(timed_completions + ?, 0),
+            timed_completions = timed_completions + ?,
+            last_assigned_at = CASE WHEN ? THEN CURRENT_TIMESTAMP ELSE last_assigned_at END,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE technician_id IN ({placeholders})
+    """, [counts[c] for c in _COUNT_COLUMNS] + [timed, hours, hours, timed, timed, int(assigned)] + technician_ids)
+
+
+def technicians_for_job(cursor, job_id):
+    """Ids of the technicians assigned to a job"""
+    cursor.execute("""
+        SELECT DISTINCT ta.technician_id
+        FROM assignment_jobs aj
+        JOIN technician_assignments ta ON ta.id = aj.assignment_id
+        WHERE aj.job_id = ?
+    """, (job_id,))
+    return [row[0] for row in cursor.fetchall()]
+
+
+def get_technician_workload(conn, store_id=None):
+    """Workload per active technician (optionally for one store), as a list of dicts"""
+    query = """
+        SELECT
+            u.id, u.full_name, u.email, s.id, s.name,
+            COALESCE(tw.new_jobs, 0), COALESCE(tw.in_progress_jobs, 0),
+            COALESCE(tw.pending_jobs, 0), COALESCE(tw.open_jobs, 0),
+            COALESCE(tw.completed_jobs, 0), tw.avg_completion_hours, tw.last_assigned_at
+        FROM store_technicians st
+        JOIN users u ON u.id = st.technician_id
+        LEFT JOIN stores s ON s.id = st.store_id
+        LEFT JOIN technician_workload tw ON tw.technician_id = u.id
+        WHERE st.is_active = 1 AND u.role = 'technician'
+    """
+    params = []
+    if store_id is not None:
+        query += " AND st.store_id = ?"
+        params.append(store_id)
+    query += " ORDER BY u.full_name"
+
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+    columns = [
+        'id', 'full_name', 'email', 'store_id', 'store_name',
+        'new_jobs', 'in_progress_jobs', 'pending_jobs', 'open_jobs',
+        'completed_jobs', 'avg_completion_hours', 'last_assigned_at',
+    ]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def least_loaded_technician(workload):
+    """Pick the technician with the fewest open jobs; ties go to the longest since last assignment"""
+    if not workload:
+        return None
+    return min(
+        workload,
+        key=lambda t: (t['open_jobs'], t['in_progress_jobs'], t['last_assigned_at'] or '', t['id']),
+    )
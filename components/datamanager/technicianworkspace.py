@@ -0,0 +1,209 @@
+import sys
+import os
+import time
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.report.daterange import today_key
+
+# Technicians whose boards stay in memory; the least recently opened is dropped past this
+MAX_BOARDS = 500
+
+# Seconds of jobs.updated_at re-read on every refresh. updated_at is stamped when a
+# statement runs, not when its transaction commits, so a write committed after a
+# refresh can carry a time before that refresh's watermark.
+REFRESH_OVERLAP_SECONDS = 120
+
+# "My Current Jobs" order: work in hand first, then oldest first
+STATUS_ORDER = {'In Progress': 1, 'New': 2, 'Pending': 3}
+
+BOARD_COLUMNS = (
+    'id', 'device_type', 'device_model', 'problem_description', 'status', 'created_at',
+    'actual_cost', 'deposit_cost', 'customer_name', 'customer_phone', 'assigned_at',
+    'started_at', 'assignment_notes', 'updated_at',
+)
+
+_BOARD_FIELDS = """
+    SELECT j.id, j.device_type, j.device_model, j.problem_description,
+           j.status, j.created_at, j.actual_cost, j.deposit_cost,
+           c.name as customer_name, c.phone as customer_phone,
+           ta.assigned_at, ta.started_at, ta.notes as assignment_notes, j.updated_at
+"""
+
+# All of a technician's active jobs, through idx_technician_assignments_technician_status
+_BOARD_SELECT = _BOARD_FIELDS + """
+    FROM technician_assignments ta
+    JOIN assignment_jobs aj ON aj.assignment_id = ta.id
+    JOIN jobs j ON j.id = aj.job_id
+    JOIN customers c ON j.customer_id = c.id
+    WHERE ta.technician_id = ? AND ta.status = 'active'
+"""
+
+# Active jobs of a technician updated since a watermark, driven by idx_jobs_updated_at:
+# only jobs changed since then are read, then joined back to their assignment
+_BOARD_CHANGED = _BOARD_FIELDS + """
+    FROM jobs j
+    CROSS JOIN assignment_jobs aj ON aj.job_id = j.id
+    CROSS JOIN technician_assignments ta ON ta.id = aj.assignment_id
+    JOIN customers c ON j.customer_id = c.id
+    WHERE j.updated_at >= ? AND ta.technician_id = ? AND ta.status = 'active'
+"""
+
+
+class TechnicianBoard:
+    """One technician's active jobs, kept current from the jobs.updated_at watermark.
+
+    A refresh reads the active job ids through the (technician_id, status) index and,
+    when the jobs table_versions counter moved (bumped in the committing transaction of
+    every jobs write), the full rows of jobs updated since the last refresh less
+    REFRESH_OVERLAP_SECONDS, found through the updated_at index. Re-read rows are
+    deduplicated by job id; unchanged jobs are not read again. Every jobs UPDATE in
+    the app sets updated_at. Edits to an assignment's own notes are picked up when its
+    job next changes.
+    """
+
+    def __init__(self, technician_id):
+        self.technician_id = technician_id
+        self.jobs = {}
+        self.assigned = 0
+        self.watermark = None
+        self.jobs_version = None
+        self.version = 0
+        self.last_used = 0.0
+        self.lock = threading.Lock()
+        self._summary = (None, None)
+
+    def _fetch(self, cursor, query, params):
+        cursor.execute(query, params)
+        return [dict(zip(BOARD_COLUMNS, row)) for row in cursor.fetchall()]
+
+    def refresh(self, conn):
+        """Apply changes since the last refresh; returns True when the board changed"""
+        cursor = conn.cursor()
+        # Counter and clock are read before the rows: a write committing after this
+        # point moves the counter, and its updated_at falls within the overlap
+        cursor.execute("SELECT version FROM table_versions WHERE name = 'jobs'")
+        row = cursor.fetchone()
+        jobs_version = row[0] if row else 0
+        cursor.execute(f"SELECT datetime('now', '-{REFRESH_OVERLAP_SECONDS} seconds')")
+        watermark = cursor.fetchone()[0]
+
+        if self.watermark is None:
+            rows = self._fetch(cursor, _BOARD_SELECT, (self.technician_id,))
+            self.jobs = {row['id']: row for row in rows}
+            self.assigned = len(rows)
+            changed = True
+        else:
+            cursor.execute("""
+                SELECT aj.job_id
+                FROM technician_assignments ta
+                JOIN assignment_jobs aj ON aj.assignment_id = ta.id
+                WHERE ta.technician_id = ? AND ta.status = 'active'
+            """, (self.technician_id,))
+            active_ids = [row[0] for row in cursor.fetchall()]
+            active = set(active_ids)
+
+            rows = []
+            if jobs_version != self.jobs_version:
+                rows = self._fetch(cursor, _BOARD_CHANGED, (self.watermark, self.technician_id))
+            # Newly assigned jobs that were not themselves updated
+            missing = sorted(active - self.jobs.keys() - {row['id'] for row in rows})
+            if missing:
+                placeholders = ",".join("?" * len(missing))
+                rows += self._fetch(
+                    cursor, _BOARD_SELECT + f" AND j.id IN ({placeholders})", (self.technician_id, *missing)
+                )
+
+            gone = self.jobs.keys() - active
+            changed = bool(gone) or self.assigned != len(active_ids)
+            for job_id in gone:
+                del self.jobs[job_id]
+            for row in rows:
+                if row['id'] in active and self.jobs.get(row['id']) != row:
+                    self.jobs[row['id']] = row
+                    changed = True
+            self.assigned = len(active_ids)
+
+        self.watermark = watermark
+        self.jobs_version = jobs_version
+        if changed:
+            self.version += 1
+        return changed
+
+    def active_jobs(self):
+        """Active jobs in board order, as dicts keyed by BOARD_COLUMNS"""
+        with self.lock:
+            jobs = list(self.jobs.values())
+        return sorted(jobs, key=lambda job: (STATUS_ORDER.get(job['status'], 4), job['created_at'] or ''))
+
+    def summary(self, conn):
+        """Header metrics; recomputed only when the board changed or the day rolled over"""
+        with self.lock:
+            key, summary = self._summary
+            if key == (self.version, today_key()):
+                return summary
+
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT in_progress_jobs, completed_jobs FROM technician_workload WHERE technician_id = ?
+            """, (self.technician_id,))
+            in_progress, total_completed = cursor.fetchone() or (0, 0)
+            cursor.execute("""
+                SELECT COUNT(*)
+                FROM jobs j
+                JOIN assignment_jobs aj ON j.id = aj.job_id
+                JOIN technician_assignments ta ON aj.assignment_id = ta.id
+                WHERE ta.technician_id = ? AND j.status = 'Completed' AND j.completed_day = ?
+            """, (self.technician_id, today_key()))
+            summary = {
+                'assigned': self.assigned,
+                'in_progress': in_progress,
+                'completed_today': cursor.fetchone()[0],
+                'total_completed': total_completed,
+            }
+            self._summary = ((self.version, today_key()), summary)
+            return summary
+
+
+class TechnicianWorkspace:
+    """Process-wide TechnicianBoard per technician, shared by all of their sessions"""
+
+    def __init__(self, max_boards=MAX_BOARDS):
+        self.max_boards = max_boards
+        self._boards = {}
+        self._lock = threading.Lock()
+
+    def open(self, conn, technician_id):
+        """The technician's board, refreshed from the database"""
+        # Boards are per database file, so a process can serve more than one
+        key = (conn.execute("PRAGMA database_list").fetchall()[0][2], int(technician_id))
+        with self._lock:
+            board = self._boards.get(key)
+            if board is None:
+                if len(self._boards) >= self.max_boards:
+                    oldest = min(self._boards, key=lambda k: self._boards[k].last_used)
+                    del self._boards[oldest]
+                board = self._boards[key] = TechnicianBoard(int(technician_id))
+            board.last_used = time.monotonic()
+        with board.lock:
+            board.refresh(conn)
+        return board
+
+    def invalidate(self, technician_id=None):
+        """Forget a technician's boards (all when None) so the next open reloads them"""
+        with self._lock:
+            for key in list(self._boards):
+                if technician_id is None or key[1] == int(technician_id):
+                    del self._boards[key]
+
+
+_workspace = None
+_workspace_lock = threading.Lock()
+
+
+def get_technician_workspace():
+    """Process-wide technician workspace"""
+    global _workspace
+    with _workspace_lock:
+        if _workspace is None:
+            _workspace = TechnicianWorkspace()
+        return _workspace
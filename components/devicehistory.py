@@ -0,0 +1,24 @@
+import os
+import sys
+import streamlit as st
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.datamanager.deviceregistry import device_history
+
+
+def display_device_history(conn, device_key):
+    """Earlier repairs and trade-ins of the device being entered, shown as the IMEI/serial is typed"""
+    if not device_key:
+        return []
+    history = device_history(conn, device_key)
+    if not history:
+        st.caption(f"🆕 No earlier records for {device_key}")
+        return history
+
+    st.warning(f"⚠️ {device_key} has {len(history)} earlier record(s)")
+    for record in history:
+        kind = "🔧 Repair job" if record.source == 'job' else "📱 Trade-in"
+        st.markdown(
+            f"- {kind} #{record.record_id} · {record.device} · `{record.status}` · "
+            f"{record.store_name or 'N/A'} · {str(record.seen_at or '')[:10]}"
+        )
+    return history
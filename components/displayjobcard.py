@@ -33,7 +33,7 @@ def update_raw_cost(job_id, raw_cost):
  # Helper function to display job card with action buttons
 def display_job_card(jobs_df, tab_status, payment_section=False, user = None):
         if len(jobs_df) > 0:
-            for idx, job in jobs_df.iterrows():
+            for job in jobs_df.to_dict('records'):
                 with st.container():
                     st.markdown("---")
                     
@@ -1,7 +1,6 @@
 import streamlit as st
 import pandas as pd 
 import io 
-from PIL import Image
 
 def visualize_pattern(pattern_str):
     grid = [["①", "②", "③"],
@@ -159,6 +158,7 @@ def show_job_details_modal(conn, job_id ,editable=True):
 
             # Job Photos (if any)
             if photos:
+                from PIL import Image
                 st.markdown("### 📷 Attached Photos")
                 for i, (photo_blob,) in enumerate(photos):
                     try:
@@ -1,5 +1,4 @@
 import sqlite3
-import smtplib
 from io import BytesIO
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
@@ -8,7 +7,6 @@ import sys
 import os 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from components.datamanager.databasemanger import DatabaseManager
-from components.utils.pdf import generate_invoice_pdf_stream 
 
 def send_job_status_email(conn: sqlite3.Connection, job_id: int, base_url="https://jayanth119-refactored-jobsheet-main-vtllnj.streamlit.app//repair_status?job_id="):
     """
@@ -19,6 +17,10 @@ def send_job_status_email(conn: sqlite3.Connection, job_id: int, base_url="https
         job_id (int): Job ID to send email for
         base_url (str): Base URL to generate repair tracking link
     """
+    # Loaded on first send so pages that only import this module skip smtplib and reportlab
+    import smtplib
+    from components.utils.pdf import generate_invoice_pdf_stream
+
     # --- SMTP CONFIG ---
     SMTP_SERVER   = "smtp.gmail.com"
     SMTP_PORT     = 587
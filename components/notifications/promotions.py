@@ -1,8 +1,7 @@
-import sendgrid
-from sendgrid.helpers.mail import Mail
-
-
 def promotions(from_email, to_emails , subject, plain_text_content):
+    import sendgrid
+    from sendgrid.helpers.mail import Mail
+
     sg = sendgrid.SendGridAPIClient(api_key="YOUR_API_KEY")
     email = Mail(
         from_email=from_email,
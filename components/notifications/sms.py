@@ -1,7 +1,6 @@
-from twilio.rest import Client
-
-
 def send_sms_message(message, phone ):
+    from twilio.rest import Client
+
     account_sid = 'YOUR_TWILIO_SID'
     auth_token = 'YOUR_TWILIO_AUTH_TOKEN'
     client = Client(account_sid, auth_token)
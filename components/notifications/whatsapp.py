@@ -1,10 +1,10 @@
-import requests
-
 access_token = "YOUR_ACCESS_TOKEN"
 phone_number_id = "YOUR_PHONE_NUMBER_ID"
 recipient_number = "91XXXXXXXXXX"  # Include country code
 
 def send_whatsapp_message(message, recipient_number):
+    import requests
+
     url = f"https://graph.facebook.com/v19.0/{phone_number_id}/messages"
     headers = {
         "Authorization": f"Bearer {access_token}",
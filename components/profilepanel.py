@@ -0,0 +1,60 @@
+import streamlit as st
+import pandas as pd
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.utils.profiler import recent_profiles, summarize, folded_stacks
+
+COLUMNS = {
+    "section": "Section",
+    "runs": "Runs",
+    "wall_p50_ms": st.column_config.NumberColumn("Wall p50 (ms)", format="%.1f"),
+    "wall_p95_ms": st.column_config.NumberColumn("Wall p95 (ms)", format="%.1f"),
+    "cpu_ms": st.column_config.NumberColumn("CPU (ms)", format="%.1f"),
+    "sql_ms": st.column_config.NumberColumn("SQL (ms)", format="%.1f"),
+    "queries": st.column_config.NumberColumn("Queries", format="%.0f"),
+    "df_mb": st.column_config.NumberColumn("DataFrames (MB)", format="%.2f"),
+    "elements": st.column_config.NumberColumn("Elements", format="%.0f"),
+    "widgets": st.column_config.NumberColumn("Widgets", format="%.0f"),
+}
+
+
+def _section_table(rows):
+    df = pd.DataFrame(rows)
+    df['section'] = [" " * depth + name.rsplit(" / ", 1)[-1] for depth, name in zip(df['depth'], df['section'])]
+    return df[list(COLUMNS.keys())]
+
+
+def profile_panel(profile):
+    """Timings for this rerun and the rolling window, shown below the page"""
+    root = profile.root
+    with st.expander(f"⏱️ Render profile: {root.name} — {root.wall_ms:,.0f} ms", expanded=False):
+        col1, col2, col3, col4, col5 = st.columns(5)
+        with col1:
+            st.metric("Wall", f"{root.wall_ms:,.0f} ms")
+        with col2:
+            st.metric("CPU", f"{root.cpu_ms:,.0f} ms")
+        with col3:
+            st.metric("SQL", f"{root.sql_ms:,.0f} ms", f"{root.sql_count} queries", delta_color="off")
+        with col4:
+            st.metric("DataFrames", f"{root.df_bytes / 1024 ** 2:,.1f} MB", f"{root.df_count} loaded", delta_color="off")
+        with col5:
+            st.metric("Elements", f"{root.elements:,}", f"{root.widgets} widgets", delta_color="off")
+
+        st.markdown("#### This rerun")
+        st.dataframe(_section_table(summarize([profile])), column_config=COLUMNS,
+                     hide_index=True, use_container_width=True)
+        st.caption("Wall time not spent in SQL is pandas, Plotly figure building and element serialization.")
+
+        window = recent_profiles(root.name)
+        st.markdown(f"#### Last {len(window)} reruns of this page")
+        st.dataframe(_section_table(summarize(window)), column_config=COLUMNS,
+                     hide_index=True, use_container_width=True)
+
+        st.download_button(
+            "⬇️ Download Flame Graph (folded stacks)",
+            data=folded_stacks(recent_profiles()),
+            file_name=f"repairpro-profile-{profile.started:%Y%m%d-%H%M%S}.folded",
+            mime="text/plain",
+            help="Open with speedscope.app, inferno or flamegraph.pl"
+        )
@@ -4,34 +4,27 @@ import pandas as pd
 import streamlit as st
 from datetime import datetime, timedelta
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.utils.profiler import profiled
+from components.report.daterange import day_range_condition, day_range
 from components.datamanager.databasemanger import DatabaseManager
+from components.datamanager.dimensions import get_store_options
+from components.report.frames import read_frame, read_row, rate, margin, money
+from components.report.timeseries import get_timeseries_service, rebucket, downsample, BUCKET_LABELS
 import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import io 
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-
-def validate_numeric_data(df, numeric_columns):
-    """Ensure specified columns are numeric, converting if necessary"""
-    for col in numeric_columns:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-    return df
 
+@profiled()
 def admin_analytics(conn, start_date_str, end_date_str, user):
     """Complete business analytics for admin users - all stores overview"""
     
     st.markdown("### 🏢 Multi-Store Business Overview")
     
     # Store selector for detailed analysis
-    stores = pd.read_sql("SELECT id, name, location FROM stores", conn)
-    store_options = dict(zip(stores['name'], stores['id']))
+    store_options = get_store_options(conn)
     selected_store = st.selectbox("Focus on Store (Optional)", ["All Stores"] + list(store_options.keys()))
     
     # Build query conditions
-    date_condition = "j.created_at BETWEEN ? AND ?"
-    params = [start_date_str, end_date_str]
+    date_condition, params = day_range_condition("j.created_day", start_date_str, end_date_str)
     
     if selected_store != "All Stores":
         store_condition = "j.store_id = ?"
@@ -65,6 +58,7 @@ def admin_analytics(conn, start_date_str, end_date_str, user):
         financial_deep_dive(conn, where_clause, params)
 
 
+@profiled()
 def executive_dashboard(conn, where_clause, params, selected_store):
     """Executive level KPIs and metrics"""
     
@@ -83,21 +77,18 @@ def executive_dashboard(conn, where_clause, params, selected_store):
         WHERE {where_clause}
     """
     
-    kpis = pd.read_sql(kpi_query, conn, params=params).iloc[0]
-    kpis = validate_numeric_data(pd.DataFrame([kpis]), kpis.keys()).iloc[0]
+    kpis = read_row(conn, kpi_query, params)
     
     # Display KPIs in columns
     col1, col2, col3, col4 = st.columns(4)
     with col1:
         st.metric("Total Jobs", f"{kpis['total_jobs']:,}")
-        completion_rate = (kpis['completed_jobs'] / kpis['total_jobs'] * 100) if kpis['total_jobs'] > 0 else 0
+        completion_rate = rate(kpis['completed_jobs'], kpis['total_jobs'])
         st.metric("Completion Rate", f"{completion_rate:.1f}%")
     
     with col2:
-        revenue = kpis['total_revenue'] if kpis['total_revenue'] is not None else 0
-        st.metric("Total Revenue", f"₹{revenue:,.2f}")
-        avg_value = kpis['avg_job_value'] if kpis['avg_job_value'] is not None else 0
-        st.metric("Avg. Job Value", f"₹{avg_value:,.2f}")
+        st.metric("Total Revenue", f"₹{kpis['total_revenue']:,.2f}")
+        st.metric("Avg. Job Value", f"₹{kpis['avg_job_value']:,.2f}")
     
     with col3:
         st.metric("Unique Customers", f"{kpis['unique_customers']:,}")
@@ -109,43 +100,52 @@ def executive_dashboard(conn, where_clause, params, selected_store):
     
     st.markdown("---")
     
-    # Revenue trend analysis
+    # Revenue trend analysis, bucketed by the length of the range
     revenue_trend_query = f"""
         SELECT 
-            strftime('%Y-%m-%d', j.created_at) as date,
-            SUM(CASE WHEN status = 'Completed' THEN actual_cost ELSE 0 END) as daily_revenue,
+            date(MIN(j.created_at)) as date,
+            SUM(CASE WHEN status = 'Completed' THEN actual_cost ELSE 0 END) as revenue,
             COUNT(*) as jobs_created,
             SUM(CASE WHEN status = 'Completed' THEN 1 ELSE 0 END) as jobs_completed
         FROM jobs j
         WHERE {where_clause}
-        GROUP BY strftime('%Y-%m-%d', j.created_at)
-        ORDER BY date
+        GROUP BY j.created_day
+        ORDER BY j.created_day
     """
     
-    revenue_trend = pd.read_sql(revenue_trend_query, conn, params=params)
-    revenue_trend = validate_numeric_data(revenue_trend, ['daily_revenue', 'jobs_created', 'jobs_completed'])
+    def load(conn):
+        return read_frame(conn, revenue_trend_query, params, ['revenue', 'jobs_created', 'jobs_completed'])
     
-    if not revenue_trend.empty:
-        col1, col2 = st.columns(2)
+    def build(revenue_trend, bucket):
+        if revenue_trend.empty:
+            return None
+        revenue_trend = rebucket(revenue_trend, bucket, ['revenue', 'jobs_created', 'jobs_completed'])
+        label = BUCKET_LABELS[bucket]
         
-        with col1:
-            try:
-                fig = px.line(revenue_trend, x='date', y='daily_revenue',
-                             title="Daily Revenue Trend", markers=True)
-                fig.update_layout(xaxis_title="Date", yaxis_title="Revenue (₹)")
-                st.plotly_chart(fig, use_container_width=True)
-            except Exception as e:
-                st.error(f"Error creating revenue trend chart: {str(e)}")
+        revenue_fig = px.line(downsample(revenue_trend, 'revenue'), x='date', y='revenue',
+                              title=f"{label} Revenue Trend", markers=True)
+        revenue_fig.update_layout(xaxis_title="Date", yaxis_title="Revenue (₹)")
         
+        jobs_fig = px.bar(downsample(revenue_trend, 'jobs_created'), x='date', y='jobs_created',
+                          title=f"{label} Job Creation", color='jobs_completed')
+        jobs_fig.update_layout(xaxis_title="Date", yaxis_title="Number of Jobs")
+        return revenue_fig, jobs_fig
+    
+    try:
+        figures = get_timeseries_service().chart(conn, 'jobs.revenue_trend', (where_clause, tuple(params[2:])),
+                                                 params[0], params[1], ('jobs',), load, build)
+    except Exception as e:
+        st.error(f"Error creating revenue trend charts: {str(e)}")
+        figures = None
+    
+    if figures:
+        col1, col2 = st.columns(2)
+        with col1:
+            st.plotly_chart(figures[0], use_container_width=True)
         with col2:
-            try:
-                fig = px.bar(revenue_trend, x='date', y='jobs_created',
-                            title="Daily Job Creation", color='jobs_completed')
-                fig.update_layout(xaxis_title="Date", yaxis_title="Number of Jobs")
-                st.plotly_chart(fig, use_container_width=True)
-            except Exception as e:
-                st.error(f"Error creating job creation chart: {str(e)}")
+            st.plotly_chart(figures[1], use_container_width=True)
 
+@profiled()
 def store_performance_analysis(conn, start_date_str, end_date_str):
     """Detailed store-by-store performance comparison"""
     
@@ -159,13 +159,13 @@ def store_performance_analysis(conn, start_date_str, end_date_str):
             AVG(CASE WHEN j.status = 'Completed' THEN j.actual_cost ELSE NULL END) as avg_job_value,
             COUNT(DISTINCT j.customer_id) as unique_customers
         FROM stores s
-        LEFT JOIN jobs j ON s.id = j.store_id AND j.created_at BETWEEN ? AND ?
+        LEFT JOIN jobs j ON s.id = j.store_id AND j.created_day >= ? AND j.created_day < ?
         GROUP BY s.id, s.name, s.location
         ORDER BY total_revenue DESC
     """
     
-    store_data = pd.read_sql(store_performance_query, conn, params=[start_date_str, end_date_str])
-    store_data = validate_numeric_data(store_data, ['total_jobs', 'completed_jobs', 'total_revenue', 'avg_job_value'])
+    store_data = read_frame(conn, store_performance_query, list(day_range(start_date_str, end_date_str)),
+                            ['total_jobs', 'completed_jobs', 'total_revenue', 'avg_job_value'])
     
     if not store_data.empty:
         # Store performance comparison
@@ -191,13 +191,14 @@ def store_performance_analysis(conn, start_date_str, end_date_str):
         
         # Store performance table
         st.markdown("#### Store Performance Summary")
-        store_data['completion_rate'] = (store_data['completed_jobs'] / store_data['total_jobs'] * 100).round(1)
-        store_data['avg_job_value'] = store_data['avg_job_value'].round(2)
-        store_data['total_revenue'] = store_data['total_revenue'].round(2)
+        store_data['completion_rate'] = rate(store_data['completed_jobs'], store_data['total_jobs'], 1)
+        store_data['avg_job_value'] = money(store_data['avg_job_value'])
+        store_data['total_revenue'] = money(store_data['total_revenue'])
         
         st.dataframe(store_data[['store_name', 'location', 'total_jobs', 'completed_jobs', 
                                 'completion_rate', 'total_revenue', 'avg_job_value', 'unique_customers']])
 
+@profiled()
 def customer_analytics(conn, where_clause, params):
     """Customer behavior and loyalty analysis"""
     
@@ -220,8 +221,7 @@ def customer_analytics(conn, where_clause, params):
         LIMIT 20
     """
     
-    top_customers = pd.read_sql(top_customers_query, conn, params=params)
-    top_customers = validate_numeric_data(top_customers, ['total_jobs', 'total_spent', 'avg_job_value'])
+    top_customers = read_frame(conn, top_customers_query, params, ['total_jobs', 'total_spent', 'avg_job_value'])
     
     if not top_customers.empty:
         col1, col2 = st.columns(2)
@@ -254,6 +254,7 @@ def customer_analytics(conn, where_clause, params):
         st.dataframe(top_customers)
 
 
+@profiled()
 def operations_analysis(conn, where_clause, params):
     """Operations and workflow analysis"""
     
@@ -291,21 +292,22 @@ def operations_analysis(conn, where_clause, params):
                             title="Average Completion Time by Status")
                 st.plotly_chart(fig, use_container_width=True)
 
+@profiled()
 def financial_deep_dive(conn, where_clause, params):
     """Deep financial analysis for admin users"""
     
     # Monthly revenue trend
     monthly_revenue_query = f"""
         SELECT 
-            strftime('%Y-%m', j.created_at) as month,
+            strftime('%Y-%m', MIN(j.created_at)) as month,
             COUNT(*) as total_jobs,
             SUM(CASE WHEN status = 'Completed' THEN actual_cost ELSE 0 END) as revenue,
             SUM(CASE WHEN status = 'Completed' THEN raw_cost ELSE 0 END) as cost,
             SUM(CASE WHEN status = 'Completed' THEN (actual_cost - raw_cost) ELSE 0 END) as profit
         FROM jobs j
         WHERE {where_clause} AND status = 'Completed'
-        GROUP BY strftime('%Y-%m', j.created_at)
-        ORDER BY month
+        GROUP BY j.created_month
+        ORDER BY j.created_month
     """
     
     monthly_data = pd.read_sql(monthly_revenue_query, conn, params=params)
@@ -314,7 +316,7 @@ def financial_deep_dive(conn, where_clause, params):
         st.markdown("#### Monthly Financial Performance")
         
         # Calculate profit margins
-        monthly_data['profit_margin'] = ((monthly_data['profit'] / monthly_data['revenue']) * 100).round(2)
+        monthly_data['profit_margin'] = margin(monthly_data['profit'], monthly_data['revenue'], 2)
         
         col1, col2 = st.columns(2)
         
@@ -348,7 +350,7 @@ def financial_deep_dive(conn, where_clause, params):
         total_revenue = monthly_data['revenue'].sum()
         total_cost = monthly_data['cost'].sum()
         total_profit = total_revenue - total_cost
-        overall_margin = (total_profit / total_revenue * 100) if total_revenue > 0 else 0
+        overall_margin = margin(total_profit, total_revenue)
         
         col1, col2, col3, col4 = st.columns(4)
         with col1:
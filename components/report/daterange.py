@@ -0,0 +1,80 @@
+import sys
+import os
+from datetime import date, datetime, timedelta, timezone
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Integer keys maintained by SQLite as virtual generated columns (see
+# DatabaseManager._create_time_keys). A day key is YYYYMMDD and a month key YYYYMM,
+# both taken from the stored UTC timestamp, so they agree with DATE(col) and DATE('now').
+DAY_KEY_COLUMNS = {
+    "jobs": {"created_day": "created_at", "created_month": "created_at",
+             "completed_day": "completed_at", "completed_month": "completed_at"},
+    "technician_assignments": {"assigned_day": "assigned_at", "assigned_month": "assigned_at",
+                               "completed_day": "completed_at"},
+}
+
+
+def to_date(value):
+    """date for a date, datetime or 'YYYY-MM-DD[ HH:MM:SS]' string"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def day_key(value):
+    d = to_date(value)
+    return d.year * 10000 + d.month * 100 + d.day
+
+
+def month_key(value):
+    d = to_date(value)
+    return d.year * 100 + d.month
+
+
+def utc_today():
+    """Today as SQLite's DATE('now') sees it"""
+    return datetime.now(timezone.utc).date()
+
+
+def today_key():
+    return day_key(utc_today())
+
+
+def days_ago_key(days, today=None):
+    """Day key for DATE('now', '-N days')"""
+    return day_key((today or utc_today()) - timedelta(days=days))
+
+
+def months_ago_key(months, today=None):
+    """Month key for the month N months before today's"""
+    today = today or utc_today()
+    index = today.year * 12 + today.month - 1 - months
+    return (index // 12) * 100 + index % 12 + 1
+
+
+def month_start_key(months, today=None):
+    """Day key for the first day of the month N months before today's"""
+    return months_ago_key(months, today) * 100 + 1
+
+
+def day_range(start, end):
+    """Half-open [start, day after end) day keys; both ends are whole days, end included"""
+    return day_key(start), day_key(to_date(end) + timedelta(days=1))
+
+
+def day_range_condition(column, start, end):
+    """(sql, params) selecting rows whose day key falls from start through end"""
+    low, high = day_range(start, end)
+    return f"{column} >= ? AND {column} < ?", [low, high]
+
+
+def format_day_key(key):
+    """'YYYY-MM-DD' for a day key"""
+    return f"{key // 10000:04d}-{key // 100 % 100:02d}-{key % 100:02d}"
+
+
+def format_month_key(key):
+    """'YYYY-MM' for a month key"""
+    return f"{key // 100:04d}-{key % 100:02d}"
@@ -0,0 +1,75 @@
+import sys
+import os
+import threading
+from collections import OrderedDict
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Built charts kept across reruns and sessions; the least recently used is dropped past this
+MAX_FIGURES = 500
+
+
+class FigureCache:
+    """Charts and the frames drawn with them, keyed by (builder, scope) and fingerprinted
+    by the table_versions counters of the tables the builder reads.
+
+    A rerun where only an unrelated widget changed finds every chart's fingerprint
+    unchanged and runs neither the chart's SQL nor its figure construction; the
+    check is one primary key read per table. Entries are shared across sessions,
+    so callers draw what they get back and never modify it.
+
+    Figures are kept as built Figure objects: st.plotly_chart validates a dict
+    spec back into a Figure, so a serialized spec would not skip construction.
+    """
+
+    def __init__(self, max_figures=MAX_FIGURES):
+        self.max_figures = max_figures
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(conn, tables):
+        """(database path, versions of tables) a cached chart is valid for"""
+        cursor = conn.cursor()
+        cursor.execute("SELECT file FROM pragma_database_list WHERE name = 'main'")
+        path = cursor.fetchone()[0]
+        placeholders = ",".join("?" * len(tables))
+        cursor.execute(f"SELECT name, version FROM table_versions WHERE name IN ({placeholders})", list(tables))
+        versions = dict(cursor.fetchall())
+        return path, tuple(versions.get(table, 0) for table in tables)
+
+    def get(self, conn, builder, scope, tables, build):
+        """build(conn) for (builder, scope), reused until one of tables is written"""
+        path, versions = self.fingerprint(conn, tables)
+        key = (path, builder, scope)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == versions:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        value = build(conn)
+        with self._lock:
+            self._entries[key] = (versions, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_figures:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self, builder=None):
+        """Drop every entry of one builder (all when None)"""
+        with self._lock:
+            for key in list(self._entries):
+                if builder is None or key[1] == builder:
+                    del self._entries[key]
+
+
+_cache = FigureCache()
+
+
+def cached_figures(conn, builder, scope, tables, build):
+    """Process-wide FigureCache lookup; scope must be hashable and hold every input of build"""
+    return _cache.get(conn, builder, scope, tables, build)
+
+
+def clear_figures(builder=None):
+    _cache.clear(builder)
@@ -0,0 +1,78 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Vectorized helpers for report post-processing. Each works on whole columns
+# (Series or arrays) and on plain scalars alike, so a KPI row and a per-store
+# table go through the same code.
+
+
+def read_frame(conn, query, params=None, numeric=()):
+    """pd.read_sql with the numeric columns as float64/int64 and NULL read as 0"""
+    return numeric_columns(pd.read_sql(query, conn, params=params), numeric)
+
+
+def read_row(conn, query, params=()):
+    """First row of an aggregate query as a dict, NULL read as 0; no DataFrame is built"""
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+    row = cursor.fetchone()
+    columns = [d[0] for d in cursor.description]
+    cursor.close()
+    return {column: 0 if value is None else value for column, value in zip(columns, row or [None] * len(columns))}
+
+
+def numeric_columns(df, columns):
+    """Make the given columns numeric in place, unparseable values and NULL as 0.
+
+    Columns that already have a numeric dtype only have their NaNs filled;
+    to_numeric runs just for object columns.
+    """
+    columns = [c for c in columns if c in df.columns]
+    if not columns:
+        return df
+    for column in columns:
+        if not is_numeric_dtype(df[column]):
+            df[column] = pd.to_numeric(df[column], errors='coerce')
+    df[columns] = df[columns].fillna(0)
+    return df
+
+
+def _result(value, like):
+    if isinstance(like, pd.Series):
+        return pd.Series(value, index=like.index)
+    if np.ndim(value) == 0:
+        return float(value)
+    return value
+
+
+def ratio(part, whole, scale=1.0, decimals=None):
+    """part / whole * scale, 0 where whole is 0, NULL or missing"""
+    part_values = np.asarray(part, dtype='float64')
+    whole_values = np.asarray(whole, dtype='float64')
+    out = np.zeros(np.broadcast(part_values, whole_values).shape)
+    np.divide(part_values * scale, whole_values, out=out, where=whole_values > 0)
+    out = np.nan_to_num(out, nan=0.0, posinf=0.0, neginf=0.0)
+    if decimals is not None:
+        out = np.round(out, decimals)
+    return _result(out, part if isinstance(part, pd.Series) else whole)
+
+
+def rate(part, whole, decimals=None):
+    """Percentage of part in whole, 0 where whole is 0"""
+    return ratio(part, whole, 100.0, decimals)
+
+
+def margin(profit, revenue, decimals=None):
+    """Profit as a percentage of revenue, 0 without revenue"""
+    return ratio(profit, revenue, 100.0, decimals)
+
+
+def money(values, decimals=2):
+    """Amounts rounded for display, NULL as 0"""
+    if isinstance(values, pd.Series):
+        return values.fillna(0).round(decimals)
+    return 0.0 if pd.isna(values) else round(float(values), decimals)
@@ -3,16 +3,22 @@ import os
 import pandas as pd 
 import streamlit as st
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.utils.profiler import profiled
+from components.report.daterange import day_range_condition, month_start_key
+from components.report.frames import read_frame, rate, ratio, money
+from components.report.timeseries import get_timeseries_service, rebucket, downsample, BUCKET_LABELS
 import plotly.express as px
 
+@profiled()
 def manager_analytics(conn, start_date_str, end_date_str, user):
     """Store-specific analytics for manager users"""
     
     st.markdown(f"### 🏪 Store Analytics - {user.get('store_name', 'Your Store')}")
     
     # Manager sees only their store data
-    where_clause = "j.created_at BETWEEN ? AND ? AND j.store_id = ?"
-    params = [start_date_str, end_date_str, user['store_id']]
+    date_condition, params = day_range_condition("j.created_day", start_date_str, end_date_str)
+    where_clause = f"{date_condition} AND j.store_id = ?"
+    params.append(user['store_id'])
     
     # Get store information
     store_info = pd.read_sql("SELECT name, location, phone, email FROM stores WHERE id = ?", 
@@ -41,6 +47,7 @@ def manager_analytics(conn, start_date_str, end_date_str, user):
     #     revenue_analysis(conn, where_clause, params)
 
 
+@profiled()
 def store_dashboard(conn, where_clause, params, store_id, user):
     """Store-specific dashboard for managers"""
 
@@ -133,14 +140,14 @@ def store_dashboard(conn, where_clause, params, store_id, user):
         st.markdown("### 📈 Monthly Revenue Trend")
         try:
             monthly_revenue = pd.read_sql("""
-                SELECT strftime('%Y-%m', completed_at) as month,
+                SELECT strftime('%Y-%m', MIN(completed_at)) as month,
                        SUM(actual_cost) as revenue
                 FROM jobs
-                WHERE status = 'Completed' AND store_id = ? AND completed_at IS NOT NULL
-                GROUP BY strftime('%Y-%m', completed_at)
-                ORDER BY month DESC
+                WHERE status = 'Completed' AND store_id = ? AND completed_day >= ?
+                GROUP BY completed_month
+                ORDER BY completed_month DESC
                 LIMIT 6
-            """, conn, params=[user['store_id']])
+            """, conn, params=[user['store_id'], month_start_key(5)])
 
             if not monthly_revenue.empty:
                 fig = px.line(
@@ -158,86 +165,44 @@ def store_dashboard(conn, where_clause, params, store_id, user):
 
 
 
+@profiled()
 def team_performance(conn, where_clause, params, store_id):
     """Team performance analysis for managers - CORRECTED VERSION"""
     
-    # First, get all technicians assigned to this store
-    technicians_query = """
+    # Active technicians of this store with their totals from the technician_daily_stats cube
+    team_query = """
         SELECT 
             u.id,
             u.full_name,
-            u.email
+            u.email,
+            COALESCE(SUM(ts.jobs), 0) as total_assignments,
+            COALESCE(SUM(ts.completed_assignments), 0) as completed_assignments,
+            COALESCE(SUM(ts.jobs), 0) as total_jobs,
+            COALESCE(SUM(ts.completed_jobs), 0) as completed_jobs,
+            COALESCE(SUM(ts.revenue), 0) as revenue_generated
         FROM users u
         JOIN store_technicians st ON u.id = st.technician_id
+        LEFT JOIN technician_daily_stats ts ON ts.technician_id = u.id
+            AND ts.store_id = st.store_id
+            AND ts.day >= ? AND ts.day < ?
         WHERE st.store_id = ? 
             AND st.is_active = 1 
             AND u.role = 'technician'
+        GROUP BY u.id, u.full_name, u.email
     """
     
-    technicians_df = pd.read_sql(technicians_query, conn, params=[store_id])
+    team_data = read_frame(conn, team_query, [params[0], params[1], store_id])
     
-    if technicians_df.empty:
+    if team_data.empty:
         st.info("No technicians assigned to this store.")
         return
     
-    # Now get performance data for each technician
-    performance_data = []
-    
-    for _, tech in technicians_df.iterrows():
-        # Get assignments for this technician in the date range
-        assignments_query = """
-            SELECT 
-                ta.id as assignment_id,
-                ta.status as assignment_status,
-                COUNT(DISTINCT aj.job_id) as jobs_in_assignment,
-                SUM(CASE WHEN j.status = 'Completed' THEN 1 ELSE 0 END) as completed_jobs,
-                SUM(CASE WHEN j.status = 'Completed' THEN COALESCE(j.actual_cost, 0) ELSE 0 END) as revenue_generated
-            FROM technician_assignments ta
-            LEFT JOIN assignment_jobs aj ON ta.id = aj.assignment_id
-            LEFT JOIN jobs j ON aj.job_id = j.id AND j.store_id = ?
-            WHERE ta.technician_id = ?
-                AND ta.assigned_at BETWEEN ? AND ?
-            GROUP BY ta.id, ta.status
-        """
-        
-        tech_assignments = pd.read_sql(assignments_query, conn, 
-                                     params=[store_id, tech['id'], params[0], params[1]])
-        
-        # Calculate totals for this technician
-        total_assignments = len(tech_assignments)
-        completed_assignments = len(tech_assignments[tech_assignments['assignment_status'] == 'completed'])
-        total_jobs = tech_assignments['jobs_in_assignment'].sum() if not tech_assignments.empty else 0
-        completed_jobs = tech_assignments['completed_jobs'].sum() if not tech_assignments.empty else 0
-        revenue_generated = tech_assignments['revenue_generated'].sum() if not tech_assignments.empty else 0
-        
-        performance_data.append({
-            'id': tech['id'],
-            'full_name': tech['full_name'],
-            'email': tech['email'],
-            'total_assignments': total_assignments,
-            'completed_assignments': completed_assignments,
-            'total_jobs': total_jobs,
-            'completed_jobs': completed_jobs,
-            'revenue_generated': revenue_generated
-        })
-    
-    team_data = pd.DataFrame(performance_data)
-    
     if not team_data.empty and team_data['total_assignments'].sum() > 0:
         st.markdown("#### Team Performance")
         
-        # Calculate completion rates safely
-        team_data['assignment_completion_rate'] = team_data.apply(
-            lambda row: (row['completed_assignments'] / row['total_assignments'] * 100) 
-            if row['total_assignments'] > 0 else 0, axis=1
-        ).round(1)
-        
-        team_data['job_completion_rate'] = team_data.apply(
-            lambda row: (row['completed_jobs'] / row['total_jobs'] * 100) 
-            if row['total_jobs'] > 0 else 0, axis=1
-        ).round(1)
-        
-        team_data['revenue_generated'] = team_data['revenue_generated'].fillna(0).round(2)
+        team_data['assignment_completion_rate'] = rate(team_data['completed_assignments'], team_data['total_assignments'], 1)
+        team_data['job_completion_rate'] = rate(team_data['completed_jobs'], team_data['total_jobs'], 1)
+        team_data['revenue_generated'] = money(team_data['revenue_generated'])
         
         # Display team data
         display_data = team_data[['full_name', 'total_assignments', 'completed_assignments', 
@@ -274,6 +239,7 @@ def team_performance(conn, where_clause, params, store_id):
         st.info("No technician performance data available for the selected period.")
 
 
+@profiled()
 def customer_management(conn, where_clause, params, store_id):
     """Customer management analytics for managers - CORRECTED VERSION"""
     
@@ -292,27 +258,25 @@ def customer_management(conn, where_clause, params, store_id):
             MIN(j.created_at) as first_visit
         FROM customers c
         JOIN jobs j ON c.id = j.customer_id
-        WHERE j.store_id = ? AND j.created_at BETWEEN ? AND ?
+        WHERE j.store_id = ? AND j.created_day >= ? AND j.created_day < ?
         GROUP BY c.id, c.name, c.phone, c.email
         ORDER BY total_spent DESC
         LIMIT 20
     """
     
-    customers = pd.read_sql(customer_query, conn, params=[store_id, params[0], params[1]])
+    customers = read_frame(conn, customer_query, [store_id, params[0], params[1]],
+                           ['total_jobs', 'total_spent', 'completed_jobs', 'active_jobs'])
     
     if not customers.empty:
         st.markdown("#### Top Customers This Period")
         
         # Format the data for display
-        customers['total_spent'] = customers['total_spent'].fillna(0).round(2)
+        customers['total_spent'] = money(customers['total_spent'])
         customers['last_visit'] = pd.to_datetime(customers['last_visit']).dt.strftime('%Y-%m-%d')
         customers['first_visit'] = pd.to_datetime(customers['first_visit']).dt.strftime('%Y-%m-%d')
         
         # Calculate customer loyalty metrics
-        customers['avg_job_value'] = customers.apply(
-            lambda row: row['total_spent'] / row['completed_jobs'] if row['completed_jobs'] > 0 else 0, 
-            axis=1
-        ).round(2)
+        customers['avg_job_value'] = ratio(customers['total_spent'], customers['completed_jobs'], decimals=2)
         
         # Display customer summary metrics
         col1, col2, col3, col4 = st.columns(4)
@@ -359,6 +323,7 @@ def customer_management(conn, where_clause, params, store_id):
         st.info("No customer data available for the selected period.")
 
 
+@profiled()
 def revenue_analysis(conn, where_clause, params):
     """Detailed revenue analysis - CORRECTED VERSION"""
     
@@ -379,29 +344,12 @@ def revenue_analysis(conn, where_clause, params):
     
     device_revenue = pd.read_sql(device_revenue_query, conn, params=params)
     
-    # Daily revenue trend
-    daily_revenue_query = f"""
-        SELECT 
-            DATE(j.created_at) as job_date,
-            COUNT(*) as jobs_count,
-            SUM(CASE WHEN status = 'Completed' THEN COALESCE(actual_cost, 0) ELSE 0 END) as daily_revenue,
-            COUNT(CASE WHEN status = 'Completed' THEN 1 END) as completed_jobs
-        FROM jobs j
-        WHERE {where_clause}
-        GROUP BY DATE(j.created_at)
-        ORDER BY job_date
-    """
-    
-    daily_revenue = pd.read_sql(daily_revenue_query, conn, params=params)
-    
     if not device_revenue.empty:
         st.markdown("#### Revenue Analysis by Device Type")
         
         # Clean and format data
-        device_revenue['total_revenue'] = device_revenue['total_revenue'].fillna(0).round(2)
-        device_revenue['avg_revenue'] = device_revenue['avg_revenue'].fillna(0).round(2)
-        device_revenue['min_revenue'] = device_revenue['min_revenue'].fillna(0).round(2)
-        device_revenue['max_revenue'] = device_revenue['max_revenue'].fillna(0).round(2)
+        for column in ('total_revenue', 'avg_revenue', 'min_revenue', 'max_revenue'):
+            device_revenue[column] = money(device_revenue[column])
         
         # Display summary metrics
         col1, col2, col3 = st.columns(3)
@@ -410,7 +358,7 @@ def revenue_analysis(conn, where_clause, params):
         with col2:
             st.metric("Completed Jobs", f"{device_revenue['job_count'].sum():,}")
         with col3:
-            st.metric("Avg Job Value", f"₹{device_revenue['total_revenue'].sum() / device_revenue['job_count'].sum():,.2f}")
+            st.metric("Avg Job Value", f"₹{ratio(device_revenue['total_revenue'].sum(), device_revenue['job_count'].sum()):,.2f}")
         
         col1, col2 = st.columns(2)
         
@@ -435,23 +383,45 @@ def revenue_analysis(conn, where_clause, params):
                                'Avg Revenue (₹)', 'Min Revenue (₹)', 'Max Revenue (₹)']
         st.dataframe(summary_data, use_container_width=True)
         
-        # Daily revenue trend
-        if not daily_revenue.empty and len(daily_revenue) > 1:
-            st.markdown("#### Daily Revenue Trend")
-            daily_revenue['job_date'] = pd.to_datetime(daily_revenue['job_date'])
-            
-            fig = px.line(daily_revenue, x='job_date', y='daily_revenue',
-                         title="Daily Revenue Trend",
-                         markers=True)
+        # Revenue trend, bucketed by the length of the range
+        daily_revenue_query = f"""
+            SELECT 
+                date(MIN(j.created_at)) as date,
+                COUNT(*) as jobs_count,
+                SUM(CASE WHEN status = 'Completed' THEN COALESCE(actual_cost, 0) ELSE 0 END) as revenue,
+                COUNT(CASE WHEN status = 'Completed' THEN 1 END) as completed_jobs
+            FROM jobs j
+            WHERE {where_clause}
+            GROUP BY j.created_day
+            ORDER BY j.created_day
+        """
+        
+        def load(conn):
+            return read_frame(conn, daily_revenue_query, params, ['jobs_count', 'revenue', 'completed_jobs'])
+        
+        def build(daily_revenue, bucket):
+            if len(daily_revenue) <= 1:
+                return None
+            trend = rebucket(daily_revenue, bucket, ['jobs_count', 'revenue', 'completed_jobs'])
+            fig = px.line(downsample(trend, 'revenue'), x='date', y='revenue',
+                          title=f"{BUCKET_LABELS[bucket]} Revenue Trend",
+                          markers=True)
             fig.update_layout(xaxis_title="Date", yaxis_title="Revenue (₹)")
+            return fig, daily_revenue['revenue'].max(), daily_revenue['revenue'].mean()
+        
+        trend = get_timeseries_service().chart(conn, 'jobs.revenue_analysis', (where_clause, tuple(params[2:])),
+                                               params[0], params[1], ('jobs',), load, build)
+        if trend:
+            fig, best_day, average_day = trend
+            st.markdown("#### Revenue Trend")
             st.plotly_chart(fig, use_container_width=True)
             
             # Show daily summary
             col1, col2 = st.columns(2)
             with col1:
-                st.metric("Best Day Revenue", f"₹{daily_revenue['daily_revenue'].max():,.2f}")
+                st.metric("Best Day Revenue", f"₹{best_day:,.2f}")
             with col2:
-                st.metric("Average Daily Revenue", f"₹{daily_revenue['daily_revenue'].mean():,.2f}")
+                st.metric("Average Daily Revenue", f"₹{average_day:,.2f}")
     
     else:
         st.info("No completed jobs with revenue data available for the selected period.")
@@ -0,0 +1,204 @@
+import sys
+import os
+import queue
+import hashlib
+import time
+import threading
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.datamanager.databasemanger import DatabaseManager
+from components.report.daterange import day_range
+
+# Standard periods the dashboard offers by default, in days back from today
+STANDARD_PERIODS = {
+    "today": 0,
+    "week": 7,
+    "month": 30,
+}
+
+# How often the worker re-checks known scopes for changed rollups (seconds)
+REFRESH_INTERVAL = 60
+# Upper bound on cached artifacts (standard + ad-hoc ranges)
+MAX_ARTIFACTS = 200
+# Scopes not requested on the reports page for this long stop being refreshed (seconds)
+SCOPE_IDLE_SECONDS = 30 * 60
+# Upper bound on scopes the worker keeps refreshing; the least recently requested go first
+MAX_SCOPES = 100
+
+
+def standard_period_range(period, today=None):
+    """Return (start_date_str, end_date_str) for a standard period"""
+    today = today or datetime.now()
+    start = today - timedelta(days=STANDARD_PERIODS[period])
+    return start.strftime('%Y-%m-%d'), today.strftime('%Y-%m-%d')
+
+
+def match_standard_period(start_date_str, end_date_str, today=None):
+    """Return the standard period name matching a date range, or None"""
+    for period in STANDARD_PERIODS:
+        if standard_period_range(period, today) == (start_date_str, end_date_str):
+            return period
+    return None
+
+
+def report_scope(user, selected_store=None):
+    """Cache scope for a user's report: reports differ per role, store, requesting user
+    and the store chosen on the page (its header and an admin's store filter)"""
+    if selected_store == "All Stores":
+        selected_store = None
+    return (user['id'], user['role'], user.get('store_id'), selected_store)
+
+
+def rollup_version(conn, user, start_date_str, end_date_str):
+    """Cheap fingerprint of the rollup a report period is drawn from"""
+    if user['role'] == 'technician':
+        query = """
+            SELECT COUNT(DISTINCT aj.job_id), COUNT(DISTINCT ta.id),
+                   SUM(CASE WHEN ta.status = 'completed' THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN j.status = 'Completed' THEN j.actual_cost ELSE 0 END),
+                   MAX(j.updated_at), MAX(ta.id)
+            FROM technician_assignments ta
+            JOIN assignment_jobs aj ON ta.id = aj.assignment_id
+            JOIN jobs j ON aj.job_id = j.id
+            WHERE ta.technician_id = ? AND ta.assigned_day >= ? AND ta.assigned_day < ?
+        """
+        params = [user['id'], *day_range(start_date_str, end_date_str)]
+    else:
+        query = """
+            SELECT COUNT(*), SUM(CASE WHEN status = 'Completed' THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN status = 'Completed' THEN actual_cost ELSE 0 END),
+                   COUNT(DISTINCT customer_id), MAX(updated_at), MAX(id)
+            FROM jobs j
+            WHERE j.created_day >= ? AND j.created_day < ?
+        """
+        params = list(day_range(start_date_str, end_date_str))
+        if user['role'] == 'manager':
+            query += " AND j.store_id = ?"
+            params.append(user['store_id'])
+
+    row = conn.execute(query, params).fetchone()
+    return hashlib.sha1(repr(row).encode()).hexdigest()
+
+
+class ReportRenderService:
+    """Background renderer keeping a versioned cache of comprehensive report PDFs"""
+
+    def __init__(self, db_path=None, render_func=None):
+        self.db_path = db_path
+        self._render_func = render_func
+        self._artifacts = {}      # (scope, start, end) -> artifact dict
+        self._users = {}          # scope -> (user, selected_store, last requested) seen on the reports page
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._worker = threading.Thread(target=self._run, name="report-render", daemon=True)
+        self._worker.start()
+
+    def _render(self, conn, user, start_date_str, end_date_str, selected_store):
+        if self._render_func is None:
+            # Imported lazily: the report page imports this module
+            from pages.screens.reportmanagement import export_comprehensive_report
+            self._render_func = export_comprehensive_report
+        buffer = self._render_func(conn, user, start_date_str, end_date_str, selected_store)
+        return buffer.getvalue()
+
+    def _store(self, key, version, pdf_bytes):
+        with self._lock:
+            self._artifacts[key] = {
+                'version': version,
+                'pdf': pdf_bytes,
+                'rendered_at': datetime.now(),
+            }
+            if len(self._artifacts) > MAX_ARTIFACTS:
+                oldest = min(self._artifacts, key=lambda k: self._artifacts[k]['rendered_at'])
+                del self._artifacts[oldest]
+
+    def _refresh(self, conn, user, selected_store, start_date_str, end_date_str):
+        """Re-render one period only if its rollup version changed"""
+        key = (report_scope(user, selected_store), start_date_str, end_date_str)
+        version = rollup_version(conn, user, start_date_str, end_date_str)
+        with self._lock:
+            cached = self._artifacts.get(key)
+        if cached and cached['version'] == version:
+            return cached
+        self._store(key, version, self._render(conn, user, start_date_str, end_date_str, selected_store))
+        with self._lock:
+            return self._artifacts[key]
+
+    def _run(self):
+        while True:
+            try:
+                scope = self._queue.get(timeout=REFRESH_INTERVAL)
+                scopes = [scope]
+            except queue.Empty:
+                with self._lock:
+                    self._evict_idle_scopes()
+                    scopes = list(self._users)
+
+            for scope in scopes:
+                with self._lock:
+                    self._pending.discard(scope)
+                    entry = self._users.get(scope)
+                if not entry:
+                    continue
+                user, selected_store, _ = entry
+                conn = None
+                try:
+                    conn = DatabaseManager(self.db_path).get_connection()
+                    for period in STANDARD_PERIODS:
+                        start_date_str, end_date_str = standard_period_range(period)
+                        self._refresh(conn, user, selected_store, start_date_str, end_date_str)
+                except Exception as e:
+                    print(f"Report pre-render failed for {scope}: {e}")
+                finally:
+                    if conn:
+                        conn.close()
+
+    def _evict_idle_scopes(self):
+        """Stop refreshing scopes idle past SCOPE_IDLE_SECONDS, then cap them at MAX_SCOPES; caller holds the lock"""
+        cutoff = time.monotonic() - SCOPE_IDLE_SECONDS
+        for scope in [s for s, entry in self._users.items() if entry[2] < cutoff]:
+            del self._users[scope]
+        if len(self._users) > MAX_SCOPES:
+            by_age = sorted(self._users, key=lambda s: self._users[s][2])
+            for scope in by_age[:len(self._users) - MAX_SCOPES]:
+                del self._users[scope]
+
+    def schedule(self, user, selected_store=None):
+        """Register a user's scope and queue its standard periods for background refresh"""
+        scope = report_scope(user, selected_store)
+        with self._lock:
+            self._users[scope] = (dict(user), selected_store, time.monotonic())
+            self._evict_idle_scopes()
+            if scope in self._pending:
+                return
+            self._pending.add(scope)
+        self._queue.put(scope)
+
+    def get_report(self, conn, user, start_date_str, end_date_str, selected_store=None):
+        """Return (pdf_bytes, from_cache) for a range, rendering only if the rollup changed"""
+        key = (report_scope(user, selected_store), start_date_str, end_date_str)
+        with self._lock:
+            cached = self._artifacts.get(key)
+        artifact = self._refresh(conn, user, selected_store, start_date_str, end_date_str)
+        from_cache = cached is not None and artifact['version'] == cached['version']
+        return artifact['pdf'], from_cache
+
+    def cached_at(self, user, start_date_str, end_date_str, selected_store=None):
+        """Render time of the cached artifact for a range, if any"""
+        with self._lock:
+            artifact = self._artifacts.get((report_scope(user, selected_store), start_date_str, end_date_str))
+        return artifact['rendered_at'] if artifact else None
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_report_service(db_path=None):
+    """Process-wide report rendering service"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = ReportRenderService(db_path)
+        return _service
@@ -1,35 +1,39 @@
 
 import sys 
 import os 
+import json
 import pandas as pd 
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-import plotly.express as px
+from components.utils.profiler import profiled
+from components.report.daterange import day_range_condition, format_day_key
+from components.report.frames import read_frame, read_row, rate, money
+from components.report.figurecache import cached_figures
+from components.report.timeseries import get_timeseries_service, rebucket, downsample, BUCKET_LABELS
+
+# technician_performance reads at most this many jobs row by row
+RECENT_JOBS = 10
 
-def validate_numeric_data(df, numeric_columns):
-    """Ensure specified columns are numeric, converting if necessary"""
-    for col in numeric_columns:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-    return df
+@profiled()
 def technician_analytics(conn, start_date_str, end_date_str, user):
     """Technician-specific analytics - their work performance and device specialization"""
     
     st.markdown(f"### 🔧 Technician Performance - {user.get('full_name', 'Your Profile')}")
     
     # Technician sees only their assigned work
-    where_clause = """
-        j.created_at BETWEEN ? AND ? 
+    date_condition, params = day_range_condition("j.created_day", start_date_str, end_date_str)
+    where_clause = f"""
+        {date_condition}
         AND EXISTS (
             SELECT 1 FROM technician_assignments ta 
             JOIN assignment_jobs aj ON ta.id = aj.assignment_id 
             WHERE aj.job_id = j.id AND ta.technician_id = ?
         )
     """
-    params = [start_date_str, end_date_str, user['id']]
+    params.append(user['id'])
     
     # Create technician-specific tabs
     tab1, tab2, tab3 = st.tabs([
@@ -48,95 +52,90 @@ def technician_analytics(conn, start_date_str, end_date_str, user):
         work_efficiency(conn, where_clause, params, user['id'])
 
 
+@profiled()
 def device_specialization(conn, where_clause, params, technician_id):
     """Technician's device specialization and expertise analysis"""
     
-    device_expertise_query = f"""
+    device_expertise_query = """
         SELECT 
-            j.device_type,
-            j.device_model,
-            COUNT(*) as jobs_handled,
-            SUM(CASE WHEN j.status = 'Completed' THEN 1 ELSE 0 END) as completed_jobs,
-            AVG(CASE WHEN j.status = 'Completed' THEN j.actual_cost ELSE NULL END) as avg_revenue_per_job,
-            SUM(CASE WHEN j.status = 'Completed' THEN j.actual_cost ELSE 0 END) as total_revenue_generated
-        FROM jobs j
-        JOIN assignment_jobs aj ON j.id = aj.job_id
-        JOIN technician_assignments ta ON aj.assignment_id = ta.id
-        WHERE ta.technician_id = ? AND j.created_at BETWEEN ? AND ?
-        GROUP BY j.device_type, j.device_model
+            device_type,
+            device_model,
+            SUM(jobs) as jobs_handled,
+            SUM(completed_jobs) as completed_jobs,
+            SUM(revenue) / NULLIF(SUM(completed_jobs), 0) as avg_revenue_per_job,
+            SUM(revenue) as total_revenue_generated
+        FROM technician_daily_stats
+        WHERE technician_id = ? AND day >= ? AND day < ?
+        GROUP BY device_type, device_model
         ORDER BY jobs_handled DESC
     """
     
-    device_data = pd.read_sql(device_expertise_query, conn, 
-                             params=[technician_id, params[0], params[1]])
-    device_data = validate_numeric_data(device_data, ['jobs_handled', 'completed_jobs', 'avg_revenue_per_job', 'total_revenue_generated'])
+    def build(conn):
+        device_data = read_frame(conn, device_expertise_query, [technician_id, params[0], params[1]],
+                                 ['jobs_handled', 'completed_jobs', 'avg_revenue_per_job', 'total_revenue_generated'])
+        if device_data.empty:
+            return device_data, None, None
+        device_data['completion_rate'] = rate(device_data['completed_jobs'], device_data['jobs_handled'], 1)
+        device_data['avg_revenue_per_job'] = money(device_data['avg_revenue_per_job'])
+        # Device type distribution
+        device_type_summary = device_data.groupby('device_type').agg({
+            'jobs_handled': 'sum',
+            'total_revenue_generated': 'sum'
+        }).reset_index()
+        type_fig = px.pie(device_type_summary, values='jobs_handled', names='device_type',
+                          title="Jobs by Device Type")
+        # Revenue by device type
+        revenue_fig = px.bar(device_type_summary, x='device_type', y='total_revenue_generated',
+                             title="Revenue Generated by Device Type", color='total_revenue_generated')
+        return device_data, type_fig, revenue_fig
+
+    try:
+        device_data, type_fig, revenue_fig = cached_figures(
+            conn, 'technician.device_specialization', (technician_id, params[0], params[1]),
+            ('technician_daily_stats',), build)
+    except Exception as e:
+        st.error(f"Error creating device specialization charts: {str(e)}")
+        return
     
     if not device_data.empty:
         col1, col2 = st.columns(2)
         
         with col1:
-            try:
-                # Device type distribution
-                device_type_summary = device_data.groupby('device_type').agg({
-                    'jobs_handled': 'sum',
-                    'total_revenue_generated': 'sum'
-                }).reset_index()
-                
-                fig = px.pie(device_type_summary, values='jobs_handled', names='device_type',
-                            title="Jobs by Device Type")
-                st.plotly_chart(fig, use_container_width=True)
-            except Exception as e:
-                st.error(f"Error creating device type pie chart: {str(e)}")
+            st.plotly_chart(type_fig, use_container_width=True)
         
         with col2:
-            try:
-                # Revenue by device type
-                fig = px.bar(device_type_summary, x='device_type', y='total_revenue_generated',
-                            title="Revenue Generated by Device Type", color='total_revenue_generated')
-                st.plotly_chart(fig, use_container_width=True)
-            except Exception as e:
-                st.error(f"Error creating revenue by device chart: {str(e)}")
+            st.plotly_chart(revenue_fig, use_container_width=True)
         
         # Specialization insights
         st.markdown("#### Your Device Specialization")
-        device_data['completion_rate'] = (device_data['completed_jobs'] / device_data['jobs_handled'] * 100).round(1)
-        device_data['avg_revenue_per_job'] = device_data['avg_revenue_per_job'].round(2)
-        
         st.dataframe(device_data[['device_type', 'device_model', 'jobs_handled', 
                                  'completed_jobs', 'completion_rate', 'avg_revenue_per_job']])
         
         # Top expertise areas
         top_devices = device_data.nlargest(5, 'jobs_handled')
         st.markdown("#### Your Top 5 Device Expertise Areas")
-        for _, row in top_devices.iterrows():
+        for row in top_devices.to_dict('records'):
             st.success(f"🔧 **{row['device_type']} - {row['device_model']}**: {row['jobs_handled']} jobs handled "
                       f"({row['completion_rate']:.1f}% completion rate)")
 
 
 
+@profiled()
 def work_efficiency(conn, where_clause, params, technician_id):
     """Technician work efficiency and productivity metrics"""
     
     # Work efficiency metrics
-    efficiency_query = f"""
+    efficiency_query = """
         SELECT 
-            COUNT(*) as total_assignments,
-            SUM(CASE WHEN ta.status = 'completed' THEN 1 ELSE 0 END) as completed_assignments,
-            AVG(CASE 
-                WHEN ta.completed_at IS NOT NULL AND ta.started_at IS NOT NULL 
-                THEN (julianday(ta.completed_at) - julianday(ta.started_at)) * 24 
-                ELSE NULL 
-            END) as avg_hours_per_assignment,
-            SUM(CASE WHEN j.status = 'Completed' THEN j.actual_cost ELSE 0 END) as total_revenue_generated
-        FROM technician_assignments ta
-        JOIN assignment_jobs aj ON ta.id = aj.assignment_id
-        JOIN jobs j ON aj.job_id = j.id
-        WHERE ta.technician_id = ? AND ta.assigned_at BETWEEN ? AND ?
+            COALESCE(SUM(jobs), 0) as total_assignments,
+            COALESCE(SUM(completed_assignments), 0) as completed_assignments,
+            SUM(assignment_hours) / NULLIF(SUM(timed_assignments), 0) as avg_hours_per_assignment,
+            COALESCE(SUM(revenue), 0) as total_revenue_generated
+        FROM technician_daily_stats
+        WHERE technician_id = ? AND day >= ? AND day < ?
     """
     
-    efficiency_data = pd.read_sql(efficiency_query, conn, 
-                                 params=[technician_id, params[0], params[1]]).iloc[0]
-    efficiency_data = validate_numeric_data(pd.DataFrame([efficiency_data]), efficiency_data.keys()).iloc[0]
+    efficiency_data = read_row(conn, efficiency_query, (technician_id, params[0], params[1]))
     
     # Display efficiency metrics
     col1, col2, col3, col4 = st.columns(4)
@@ -145,241 +144,174 @@ def work_efficiency(conn, where_clause, params, technician_id):
         st.metric("Total Assignments", f"{efficiency_data['total_assignments']:,}")
     
     with col2:
-        completion_rate = (efficiency_data['completed_assignments'] / efficiency_data['total_assignments'] * 100) if efficiency_data['total_assignments'] > 0 else 0
+        completion_rate = rate(efficiency_data['completed_assignments'], efficiency_data['total_assignments'])
         st.metric("Assignment Completion Rate", f"{completion_rate:.1f}%")
     
     with col3:
-        avg_hours = efficiency_data['avg_hours_per_assignment'] if efficiency_data['avg_hours_per_assignment'] else 0
-        st.metric("Avg. Hours per Assignment", f"{avg_hours:.1f}h")
+        st.metric("Avg. Hours per Assignment", f"{efficiency_data['avg_hours_per_assignment']:.1f}h")
     
     with col4:
-        revenue = efficiency_data['total_revenue_generated'] if efficiency_data['total_revenue_generated'] else 0
-        st.metric("Revenue Generated", f"₹{revenue:,.2f}")
+        st.metric("Revenue Generated", f"₹{efficiency_data['total_revenue_generated']:,.2f}")
     
-    # Daily productivity trend
-    daily_productivity_query = f"""
+    # Productivity trend, bucketed by the length of the range
+    daily_productivity_query = """
         SELECT 
-            strftime('%Y-%m-%d', ta.assigned_at) as date,
-            COUNT(*) as assignments_received,
-            SUM(CASE WHEN ta.status = 'completed' THEN 1 ELSE 0 END) as assignments_completed,
-            SUM(CASE WHEN j.status = 'Completed' THEN j.actual_cost ELSE 0 END) as daily_revenue
-        FROM technician_assignments ta
-        JOIN assignment_jobs aj ON ta.id = aj.assignment_id
-        JOIN jobs j ON aj.job_id = j.id
-        WHERE ta.technician_id = ? AND ta.assigned_at BETWEEN ? AND ?
-        GROUP BY strftime('%Y-%m-%d', ta.assigned_at)
-        ORDER BY date
+            day,
+            SUM(jobs) as assignments_received,
+            SUM(completed_assignments) as assignments_completed,
+            SUM(revenue) as revenue
+        FROM technician_daily_stats
+        WHERE technician_id = ? AND day >= ? AND day < ?
+        GROUP BY day
+        ORDER BY day
     """
     
-    productivity_data = pd.read_sql(daily_productivity_query, conn, 
-                                   params=[technician_id, params[0], params[1]])
-    productivity_data = validate_numeric_data(productivity_data, ['assignments_received', 'assignments_completed', 'daily_revenue'])
+    def load(conn):
+        productivity_data = read_frame(conn, daily_productivity_query, [technician_id, params[0], params[1]],
+                                       ['assignments_received', 'assignments_completed', 'revenue'])
+        productivity_data.insert(0, 'date', productivity_data.pop('day').map(format_day_key))
+        return productivity_data
     
-    if not productivity_data.empty:
-        st.markdown("#### Daily Productivity Trend")
-        try:
-            fig = make_subplots(specs=[[{"secondary_y": True}]])
-            
-            fig.add_trace(
-                go.Bar(x=productivity_data['date'], y=productivity_data['assignments_completed'],
-                       name="Assignments Completed", opacity=0.7),
-                secondary_y=False,
-            )
-            
-            fig.add_trace(
-                go.Scatter(x=productivity_data['date'], y=productivity_data['daily_revenue'],
-                          mode='lines+markers', name="Daily Revenue", line=dict(color='red')),
-                secondary_y=True,
-            )
-            
-            fig.update_xaxes(title_text="Date")
-            fig.update_yaxes(title_text="Assignments Completed", secondary_y=False)
-            fig.update_yaxes(title_text="Revenue (₹)", secondary_y=True)
-            
+    def build(productivity_data, bucket):
+        if productivity_data.empty:
+            return None
+        productivity_data = rebucket(productivity_data, bucket,
+                                     ['assignments_received', 'assignments_completed', 'revenue'])
+        productivity_data = downsample(productivity_data, 'revenue')
+        label = BUCKET_LABELS[bucket]
+        fig = make_subplots(specs=[[{"secondary_y": True}]])
+        
+        fig.add_trace(
+            go.Bar(x=productivity_data['date'], y=productivity_data['assignments_completed'],
+                   name="Assignments Completed", opacity=0.7),
+            secondary_y=False,
+        )
+        
+        fig.add_trace(
+            go.Scatter(x=productivity_data['date'], y=productivity_data['revenue'],
+                      mode='lines+markers', name=f"{label} Revenue", line=dict(color='red')),
+            secondary_y=True,
+        )
+        
+        fig.update_xaxes(title_text="Date")
+        fig.update_yaxes(title_text="Assignments Completed", secondary_y=False)
+        fig.update_yaxes(title_text="Revenue (₹)", secondary_y=True)
+        return label, fig
+    
+    try:
+        trend = get_timeseries_service().chart(conn, 'technician.productivity', technician_id,
+                                               params[0], params[1], ('technician_daily_stats',), load, build)
+        if trend:
+            label, fig = trend
+            st.markdown(f"#### {label} Productivity Trend")
             st.plotly_chart(fig, use_container_width=True)
-        except Exception as e:
-            st.error(f"Error creating productivity chart: {str(e)}")
+    except Exception as e:
+        st.error(f"Error creating productivity chart: {str(e)}")
 
+@profiled()
 def technician_performance(conn, where_clause, params, user_id):
     """
-    Retrieve technician performance metrics based on jobs assigned to them.
+    Retrieve technician performance metrics from the technician_daily_stats cube.
     
     Args:
         conn: Database connection object
-        where_clause: SQL WHERE clause for filtering jobs
-        params: Parameters for the WHERE clause
+        where_clause: SQL WHERE clause for filtering jobs (the cube is filtered on params)
+        params: Day keys of the period followed by the technician id
         user_id: ID of the user requesting the data (for authorization)
     
     Returns:
-        dict: Performance metrics and job data
+        dict: Performance metrics and the most recent jobs
     """
     cursor = conn.cursor()
     
     try:
-        # Base query to get jobs with technician assignments
-        base_query = f"""
+        technician_id = params[-1]
+        totals = read_row(conn, """
+            SELECT 
+                u.full_name as name,
+                SUM(ts.jobs) as total_jobs,
+                SUM(ts.completed_jobs) as completed_jobs,
+                SUM(ts.in_progress_jobs) as in_progress_jobs,
+                SUM(ts.new_jobs) as new_jobs,
+                SUM(ts.actual_cost_total) as total_revenue,
+                SUM(ts.deposit_total) as estimated_revenue,
+                SUM(ts.job_hours) / NULLIF(SUM(ts.timed_jobs), 0) as avg_completion_hours
+            FROM technician_daily_stats ts
+            JOIN users u ON u.id = ts.technician_id
+            WHERE ts.technician_id = ? AND ts.day >= ? AND ts.day < ?
+            GROUP BY u.full_name
+        """, (technician_id, params[0], params[1]))
+        
+        total_jobs = totals['total_jobs']
+        completion_rate = rate(totals['completed_jobs'], total_jobs)
+        avg_completion_time = totals['avg_completion_hours'] or None
+        
+        technician_stats = {}
+        if total_jobs:
+            technician_stats[technician_id] = {
+                'name': totals['name'],
+                'total_jobs': total_jobs,
+                'completed_jobs': totals['completed_jobs'],
+                'in_progress_jobs': totals['in_progress_jobs'],
+                'pending_jobs': total_jobs - totals['completed_jobs'] - totals['in_progress_jobs'],
+                'total_revenue': totals['total_revenue'],
+                'estimated_revenue': totals['estimated_revenue'],
+                'completion_rate': completion_rate
+            }
+        
+        # Only the most recent jobs are read row by row, for context and their notes
+        cursor.execute(f"""
             SELECT 
-                j.id,
-                j.customer_id,
-                j.device_type,
-                j.device_model,
-                j.problem_description,
-                j.deposit_cost,
-                j.raw_cost,
-                j.actual_cost,
-                j.status,
-                j.created_at,
-                j.updated_at,
-                j.started_at,
-                j.completed_at,
-                c.name as customer_name,
-                c.phone as customer_phone,
-                u.full_name as technician_name,
-                u.id as technician_id,
-                ta.assigned_at,
-                ta.started_at as assignment_started_at,
+                j.id, j.customer_id, j.device_type, j.device_model, j.problem_description,
+                j.deposit_cost, j.raw_cost, j.actual_cost, j.status,
+                j.created_at, j.updated_at, j.started_at, j.completed_at,
+                c.name as customer_name, c.phone as customer_phone,
+                u.full_name as technician_name, u.id as technician_id,
+                ta.assigned_at, ta.started_at as assignment_started_at,
                 ta.completed_at as assignment_completed_at,
                 s.name as store_name
-            FROM jobs j
+            FROM technician_assignments ta
+            JOIN assignment_jobs aj ON aj.assignment_id = ta.id
+            JOIN jobs j ON j.id = aj.job_id
             JOIN customers c ON j.customer_id = c.id
-            JOIN assignment_jobs aj ON j.id = aj.job_id
-            JOIN technician_assignments ta ON aj.assignment_id = ta.id
             JOIN users u ON ta.technician_id = u.id
             LEFT JOIN stores s ON j.store_id = s.id
-            WHERE {where_clause}
-            ORDER BY j.created_at DESC
-        """
-        
-        cursor.execute(base_query, params)
-        jobs = cursor.fetchall()
-        
-        # Convert to list of dictionaries for easier processing
+            WHERE ta.technician_id = ? AND ta.assigned_day >= ? AND ta.assigned_day < ?
+            ORDER BY ta.assigned_day DESC, j.created_at DESC
+            LIMIT {RECENT_JOBS}
+        """, (technician_id, params[0], params[1]))
+        columns = [d[0] for d in cursor.description]
         job_list = []
-        for job in jobs:
-            job_dict = {
-                'id': job[0],
-                'customer_id': job[1],
-                'device_type': job[2],
-                'device_model': job[3],
-                'problem_description': job[4],
-                'deposit_cost': job[5] or 0,
-                'raw_cost': job[6] or 0,
-                'actual_cost': job[7] or 0,
-                'status': job[8],
-                'created_at': job[9],
-                'updated_at': job[10],
-                'started_at': job[11],
-                'completed_at': job[12],
-                'customer_name': job[13],
-                'customer_phone': job[14],
-                'technician_name': job[15],
-                'technician_id': job[16],
-                'assigned_at': job[17],
-                'assignment_started_at': job[18],
-                'assignment_completed_at': job[19],
-                'store_name': job[20]
-            }
+        for job in cursor.fetchall():
+            job_dict = dict(zip(columns, job))
+            for key in ('deposit_cost', 'raw_cost', 'actual_cost'):
+                job_dict[key] = job_dict[key] or 0
             job_list.append(job_dict)
         
-        # Calculate performance metrics
-        total_jobs = len(job_list)
-        completed_jobs = len([j for j in job_list if j['status'] == 'Completed'])
-        in_progress_jobs = len([j for j in job_list if j['status'] == 'In Progress'])
-        pending_jobs = len([j for j in job_list if j['status'] in ['New', 'Assigned']])
-        
-        # Revenue metrics
-        total_estimated_revenue = sum(j['deposit_cost'] for j in job_list)
-        total_actual_revenue = sum(j['actual_cost'] for j in job_list if j['actual_cost'])
-        
-        # Completion rate
-        completion_rate = (completed_jobs / total_jobs * 100) if total_jobs > 0 else 0
-        
-        # Average job duration (for completed jobs)
-        completed_with_times = [
-            j for j in job_list 
-            if j['completed_at'] and j['started_at'] and j['status'] == 'Completed'
-        ]
-        
-        avg_completion_time = None
-        if completed_with_times:
-            from datetime import datetime
-            total_duration = 0
-            for job in completed_with_times:
-                start = datetime.fromisoformat(job['started_at'].replace('Z', '+00:00'))
-                end = datetime.fromisoformat(job['completed_at'].replace('Z', '+00:00'))
-                duration = (end - start).total_seconds() / 3600  # Convert to hours
-                total_duration += duration
-            avg_completion_time = total_duration / len(completed_with_times)
-        
-        # Group by technician for individual performance
-        technician_stats = {}
-        for job in job_list:
-            tech_id = job['technician_id']
-            tech_name = job['technician_name']
-            
-            if tech_id not in technician_stats:
-                technician_stats[tech_id] = {
-                    'name': tech_name,
-                    'total_jobs': 0,
-                    'completed_jobs': 0,
-                    'in_progress_jobs': 0,
-                    'pending_jobs': 0,
-                    'total_revenue': 0,
-                    'estimated_revenue': 0
-                }
-            
-            stats = technician_stats[tech_id]
-            stats['total_jobs'] += 1
-            stats['estimated_revenue'] += job['deposit_cost']
-            stats['total_revenue'] += job['actual_cost'] or 0
-            
-            if job['status'] == 'Completed':
-                stats['completed_jobs'] += 1
-            elif job['status'] == 'In Progress':
-                stats['in_progress_jobs'] += 1
-            else:
-                stats['pending_jobs'] += 1
-        
-        # Calculate completion rates for each technician
-        for tech_id in technician_stats:
-            stats = technician_stats[tech_id]
-            stats['completion_rate'] = (
-                (stats['completed_jobs'] / stats['total_jobs'] * 100) 
-                if stats['total_jobs'] > 0 else 0
-            )
-        
         # Get recent job notes for context
-        recent_job_ids = [str(j['id']) for j in job_list[:10]]  # Last 10 jobs
-        notes_query = f"""
-            SELECT jn.job_id, jn.note, jn.created_at
-            FROM job_notes jn
-            WHERE jn.job_id IN ({','.join(['?'] * len(recent_job_ids))})
-            ORDER BY jn.created_at DESC
-            LIMIT 20
-        """
-        
-        cursor.execute(notes_query, recent_job_ids)
-        notes = cursor.fetchall()
-        
+        recent_job_ids = [j['id'] for j in job_list]
         job_notes = {}
-        for note in notes:
-            job_id = note[0]
-            if job_id not in job_notes:
-                job_notes[job_id] = []
-            job_notes[job_id].append({
-                'note': note[1],
-                'created_at': note[2]
-            })
+        if recent_job_ids:
+            # One idx_job_notes_job probe per recent job; only their notes are sorted
+            cursor.execute("""
+                SELECT jn.job_id, jn.note, jn.created_at
+                FROM json_each(?) ids
+                CROSS JOIN job_notes jn ON jn.job_id = ids.value
+                ORDER BY jn.created_at DESC
+                LIMIT 20
+            """, (json.dumps(recent_job_ids),))
+            for job_id, note, created_at in cursor.fetchall():
+                job_notes.setdefault(job_id, []).append({'note': note, 'created_at': created_at})
         
         return {
             'summary': {
                 'total_jobs': total_jobs,
-                'completed_jobs': completed_jobs,
-                'in_progress_jobs': in_progress_jobs,
-                'pending_jobs': pending_jobs,
+                'completed_jobs': totals['completed_jobs'],
+                'in_progress_jobs': totals['in_progress_jobs'],
+                'pending_jobs': totals['new_jobs'],
                 'completion_rate': round(completion_rate, 2),
-                'total_estimated_revenue': round(total_estimated_revenue, 2),
-                'total_actual_revenue': round(total_actual_revenue, 2),
+                'total_estimated_revenue': money(totals['estimated_revenue']),
+                'total_actual_revenue': money(totals['total_revenue']),
                 'avg_completion_time_hours': round(avg_completion_time, 2) if avg_completion_time else None
             },
             'technician_performance': technician_stats,
@@ -410,4 +342,4 @@ def technician_performance(conn, where_clause, params, user_id):
         }
     
     finally:
-        cursor.close()
\ No newline at end of file
+        cursor.close()
@@ -0,0 +1,109 @@
+import sys
+import os
+import threading
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.report.daterange import to_date, format_day_key
+from components.report.figurecache import cached_figures, clear_figures
+
+# Most points a time series chart is drawn with; longer series are reduced with LTTB
+MAX_POINTS = 180
+# Bucket size by range length in days: daily up to 92 days, weekly up to two years, then monthly
+BUCKETS = (("day", 92), ("week", 731), ("month", None))
+BUCKET_LABELS = {"day": "Daily", "week": "Weekly", "month": "Monthly"}
+
+
+def key_range_days(low, high):
+    """Number of days in a half-open [low, high) day key range"""
+    return (to_date(format_day_key(high)) - to_date(format_day_key(low))).days
+
+
+def pick_bucket(low, high):
+    """Bucket size for a half-open day key range"""
+    days = key_range_days(low, high)
+    for bucket, max_days in BUCKETS:
+        if max_days is None or days <= max_days:
+            return bucket
+
+
+def rebucket(frame, bucket, sums, x='date'):
+    """Sum daily rows into week or month rows, dated by the bucket's first day"""
+    if bucket == "day" or frame.empty:
+        return frame
+    period = pd.to_datetime(frame[x]).dt.to_period("W" if bucket == "week" else "M")
+    out = frame.groupby(period.dt.start_time, sort=True)[list(sums)].sum().reset_index(names=x)
+    out[x] = out[x].dt.strftime('%Y-%m-%d')
+    return out
+
+
+def lttb(x, y, threshold=MAX_POINTS):
+    """Indices of the points Largest-Triangle-Three-Buckets keeps out of (x, y).
+
+    The first and last points are always kept; each bucket in between keeps the
+    point forming the largest triangle with the previous kept point and the
+    average of the next bucket, which preserves peaks and troughs.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    every = (n - 2) / (threshold - 2)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+
+def downsample(frame, y, x='date', max_points=MAX_POINTS):
+    """frame reduced to at most max_points rows, chosen by LTTB on column y"""
+    if len(frame) <= max_points:
+        return frame
+    positions = pd.to_datetime(frame[x]).astype('int64') // 10**9
+    return frame.iloc[lttb(positions.to_numpy(), frame[y].to_numpy(), max_points)]
+
+
+class TimeSeriesService:
+    """Bucketed and downsampled time series charts per (metric, scope, range).
+
+    Built charts live in the shared figure cache under ('timeseries', metric)
+    and are rebuilt only when the table_versions counters of the tables they
+    read have moved.
+    """
+
+    def chart(self, conn, metric, scope, low, high, tables, load, build):
+        """build(load(conn), bucket) for a [low, high) day key range, cached until tables change.
+
+        load returns the series one row per day; build turns it into what the
+        page draws (usually figures) for the bucket pick_bucket chose.
+        """
+        bucket = pick_bucket(low, high)
+        return cached_figures(conn, ('timeseries', metric), (scope, low, high), tables,
+                              lambda conn: build(load(conn), bucket))
+
+    def clear(self, metric):
+        """Drop the cached charts of one metric"""
+        clear_figures(('timeseries', metric))
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_timeseries_service():
+    """Process-wide time series chart service"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = TimeSeriesService()
+        return _service
@@ -46,6 +46,8 @@ def sidebar_navigation():
             "🏪 Store Management": "stores",
             "📊 Reports": "reports",
             "👤 User Management": "users",
+            "📥 Bulk Import": "bulk_import",
+            "⏱️ Performance": "performance",
             "⚙️ Settings": "settings"
         }
     elif user['role'] == "manager":
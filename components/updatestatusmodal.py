@@ -3,6 +3,9 @@ import os
 import sys 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from components.datamanager.databasemanger import DatabaseManager
+from components.datamanager.jobstatus import apply_job_status
+from components.datamanager.technicianstats import refresh_technician_stats
+from components.datamanager.repairstatus import invalidate_job_status
 from components.notifications.email_utils import send_job_status_email
 def show_update_status_modal(conn, job_id, new_status):
     """Modal for updating job status with cost adjustment - centered UI"""
@@ -141,35 +144,15 @@ def show_update_status_modal(conn, job_id, new_status):
                             SET raw_cost = ?, actual_cost = ?, updated_at = CURRENT_TIMESTAMP
                             WHERE id = ?
                         ''', (raw_cost, actual_cost, job_id))
+                        refresh_technician_stats(cursor, [job_id])
                         
                         success_msg = f"✅ Costs updated for Job #{job_id}"
                     else:
-                        # Update job status and costs
-                        cursor.execute('''
-                            UPDATE jobs 
-                            SET status = ?, raw_cost = ?, actual_cost = ?, updated_at = CURRENT_TIMESTAMP
-                            WHERE id = ?
-                        ''', (new_status, raw_cost, actual_cost, job_id))
-                        
-                        # Set completed_at if status is Completed
-                        if new_status == 'Completed':
-                            cursor.execute('''
-                                UPDATE jobs 
-                                SET completed_at = CURRENT_TIMESTAMP
-                                WHERE id = ?
-                            ''', (job_id,))
-                        
-                        # Update technician assignments status if needed
-                        cursor.execute('''
-                            UPDATE technician_assignments 
-                            SET status = ?
-                            WHERE id IN (
-                                SELECT ta.id 
-                                FROM technician_assignments ta
-                                JOIN assignment_jobs aj ON ta.id = aj.assignment_id
-                                WHERE aj.job_id = ? AND ta.status = 'active'
-                            )
-                        ''', ('completed' if new_status == 'Completed' else 'active', job_id))
+                        # Update job status and costs, timestamps, assignment and workload
+                        apply_job_status(
+                            cursor, job_id, new_status, raw_cost, actual_cost,
+                            actor=st.session_state.get('user', {}).get('id')
+                        )
                         
                         success_icon = "▶️" if new_status == "In Progress" else "✅"
                         success_msg = f"{success_icon} Job #{job_id} updated to {new_status}"
@@ -182,6 +165,7 @@ def show_update_status_modal(conn, job_id, new_status):
                         ''', (job_id, f"Status changed to {new_status}: {notes}" if update_status_clicked else f"Costs updated: {notes}"))
                     
                     new_conn.commit()
+                    invalidate_job_status(job_id)
                     st.success(success_msg)
                     send_job_status_email(new_conn , job_id)
                     
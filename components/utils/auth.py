@@ -1,58 +1,75 @@
 import streamlit as st
 import sqlite3
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import hashlib
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-import io
 import time
+import threading
 import sys
 import os 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from components.datamanager.databasemanger import DatabaseManager
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+from components.datamanager.connectionpool import ConnectionPool
+from components.datamanager.lastloginwriter import get_last_login_writer
+from components.utils.passwordhash import (
+    hash_password, verify_password, needs_rehash, verify_password_pooled, hash_password_pooled,
+    dummy_hash, HASH_WORKERS
+)
+
+_login_pools = {}
+_login_pools_lock = threading.Lock()
+
+
+def _login_pool():
+    """Shared connection pool for logins; schema bootstrap runs once per database"""
+    db_path = DatabaseManager.default_path()
+    key = os.path.abspath(db_path)
+    with _login_pools_lock:
+        if key not in _login_pools:
+            _login_pools[key] = ConnectionPool(db_path, size=HASH_WORKERS * 2)
+            dummy_hash()
+        return _login_pools[key]
 
-def verify_password(password, hashed):
-    return hash_password(password) == hashed
 
 def authenticate_user(username, password):
-    db = DatabaseManager()
-    conn = db.get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT u.id, u.username, u.role, u.store_id, u.full_name, u.email, 
-               COALESCE(s.name, 'All Stores') as store_name
-        FROM users u
-        LEFT JOIN stores s ON u.store_id = s.id
-        WHERE u.username = ? AND u.password = ?
-    """, (username, hash_password(password)))
-    
-    user = cursor.fetchone()
-    
-    if user:
-        # Update last login
-        cursor.execute("UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE id = ?", (user[0],))
-        conn.commit()
-        
-        user_data = {
-            "id": user[0],
-            "username": user[1],
-            "role": user[2],
-            "store_id": user[3],
-            "full_name": user[4],
-            "email": user[5],
-            "store_name": user[6]
-        }
-        conn.close()
-        return user_data
-    
-    conn.close()
-    return None
+    pool = _login_pool()
+
+    # Single read on the UNIQUE(username) index; no write lock is taken on the normal path
+    with pool.connection() as conn:
+        user = conn.execute("""
+            SELECT u.id, u.username, u.role, u.store_id, u.full_name, u.email, 
+                   COALESCE(s.name, 'All Stores') as store_name, u.password
+            FROM users u
+            LEFT JOIN stores s ON u.store_id = s.id
+            WHERE u.username = ?
+        """, (username,)).fetchone()
+
+    # KDF verification runs on the bounded hashing pool, outside the borrowed connection.
+    # Unknown usernames pay the same KDF cost, so response time does not reveal them.
+    if not user:
+        verify_password_pooled(password, dummy_hash())
+        return None
+    if not verify_password_pooled(password, user[7]):
+        return None
+
+    # Upgrade legacy or outdated hashes now that we have the plaintext (once per user)
+    if needs_rehash(user[7]):
+        new_hash = hash_password_pooled(password)
+        with pool.connection() as conn:
+            with conn:
+                conn.execute("UPDATE users SET password = ? WHERE id = ?", (new_hash, user[0]))
+
+    # Coalesced into a batched background write every few seconds
+    get_last_login_writer(pool.db_path).record(user[0])
+
+    return {
+        "id": user[0],
+        "username": user[1],
+        "role": user[2],
+        "store_id": user[3],
+        "full_name": user[4],
+        "email": user[5],
+        "store_name": user[6]
+    }
 
 def create_user(username, password, role, store_id, full_name, email):
     db = DatabaseManager()
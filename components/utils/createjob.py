@@ -1,103 +1,33 @@
 import streamlit as st 
 import hashlib 
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.datamanager.jobrecords import insert_job_record, assign_technician
+from components.datamanager.jobschema import get_form_definition
+from components.datamanager.customfields import save_custom_values
+from components.datamanager.deviceregistry import register_device
 
 def create_job_in_database(conn, db, user, job_data, uploaded_photos):
     """Create job in database using only schema-compatible fields with proper photo handling"""
     try:
         cursor = conn.cursor()
         
-        # Use selected store instead of user's store
-        store_id = job_data.get('selected_store_id') or user.get('store_id')
+        # Customer create/update and the job row itself
+        job_id = insert_job_record(cursor, user, job_data)
         
-        # Check if customers table has address column
-        cursor.execute("PRAGMA table_info(customers)")
-        customer_columns = [col[1] for col in cursor.fetchall()]
-        has_customer_address = 'address' in customer_columns
+        # Configured job sheet fields without a jobs column, written in one batch
+        if job_data.get('custom_values'):
+            save_custom_values(cursor, job_id, job_data['custom_values'], get_form_definition(conn))
         
-        # Handle customer creation/update
-        if job_data['existing_customer_id']:
-            customer_id = job_data['existing_customer_id']
-            # Update existing customer
-            if has_customer_address:
-                cursor.execute('''
-                    UPDATE customers SET 
-                        name = ?, email = ?, address = ?
-                    WHERE id = ?
-                ''', (
-                    job_data['customer_name'],
-                    job_data['customer_email'],
-                    job_data['customer_address'],
-                    customer_id
-                ))
-            else:
-                cursor.execute('''
-                    UPDATE customers SET 
-                        name = ?, email = ?
-                    WHERE id = ?
-                ''', (
-                    job_data['customer_name'],
-                    job_data['customer_email'],
-                    customer_id
-                ))
-        else:
-            # Create new customer with selected store
-            if has_customer_address:
-                cursor.execute('''
-                    INSERT INTO customers (name, phone, email, address, store_id, created_at)
-                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ''', (
-                    job_data['customer_name'],
-                    job_data['customer_phone'],
-                    job_data['customer_email'],
-                    job_data['customer_address'],
-                    store_id
-                ))
-            else:
-                cursor.execute('''
-                    INSERT INTO customers (name, phone, email, store_id, created_at)
-                    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ''', (
-                    job_data['customer_name'],
-                    job_data['customer_phone'],
-                    job_data['customer_email'],
-                    store_id
-                ))
-            customer_id = cursor.lastrowid
-        
-        # Create job using selected store_id
-        cursor.execute('''
-            INSERT INTO jobs (
-                customer_id, store_id, device_type, device_model,
-                device_password_type, device_password,
-                problem_description, deposit_cost, estimate_cost,
-                notification_methods, assigned_by, status, created_at, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'New', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-        ''', (
-            customer_id, store_id, job_data['device_type'], job_data['device_model'],
-            job_data['device_password_type'], job_data['device_password'],
-            job_data['problem_description'], job_data['deposit_cost'], 
-            job_data['estimate_cost'], ','.join(job_data['notification_methods']),
-            job_data['assigned_by']
-        ))
-        
-        job_id = cursor.lastrowid
+        # Link the job to its IMEI/serial in the device registry
+        if job_data.get('device_key'):
+            register_device(cursor, job_data['device_key'], 'job', job_id, model=job_data.get('device_model'))
         
         # FIXED: Assign technician if selected (check for None explicitly)
         if job_data.get('technician_id') is not None:
             try:
-                # Create technician assignment
-                cursor.execute('''
-                    INSERT INTO technician_assignments 
-                    (technician_id, assigned_by, status, notes, assigned_at)
-                    VALUES (?, ?, 'active', 'Initial assignment', CURRENT_TIMESTAMP)
-                ''', (job_data['technician_id'], user['id']))
-                assignment_id = cursor.lastrowid
-                
-                # Link assignment to job
-                cursor.execute('''
-                    INSERT INTO assignment_jobs (assignment_id, job_id)
-                    VALUES (?, ?)
-                ''', (assignment_id, job_id))
+                assignment_id = assign_technician(cursor, job_id, job_data['technician_id'], user['id'])
                 
                 st.success(f"✅ Technician assigned successfully (Assignment ID: {assignment_id})")
                 
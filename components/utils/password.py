@@ -1,32 +1,18 @@
 import sys
 import os
-import io
-import pandas as pd
 import streamlit as st
-from datetime import datetime, date
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from components.css.css import Style
-from components.datamanager.databasemanger import DatabaseManager
-from components.utils.auth import (
-    hash_password, verify_password, authenticate_user, create_user
-)
-from pages.screens.loginpage import login_signup_page
-from pages.screens.admindashboard import admin_dashboard
-from components.sidebarnavigation import sidebar_navigation
 def render_pattern_input(field_label, pattern, is_required=False):
-    """Render a pattern-based input field"""
+    """Render a pattern-based input field.
+
+    pattern is the parsed group lengths of a compiled FormField (8-3-4 -> (8, 3, 4)),
+    so nothing is parsed per render; None falls back to a plain text input.
+    """
     if not pattern:
         return st.text_input(field_label + ('*' if is_required else ''), placeholder="Enter value")
-    
-    # Parse pattern (e.g., "8-3-4" -> [8, 3, 4])
-    try:
-        pattern_parts = [int(x) for x in pattern.split('-')]
-    except:
-        return st.text_input(field_label + ('*' if is_required else ''), placeholder="Enter value")
+    pattern_parts = pattern
     
     st.write(field_label + ('*' if is_required else ''))
     
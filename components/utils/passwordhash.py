@@ -0,0 +1,108 @@
+import os
+import hmac
+import base64
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+# Scheme used for new hashes: "scrypt" or "pbkdf2_sha256" (sized with benchmarks/bench_password_hash.py)
+PASSWORD_SCHEME = os.environ.get("REPAIRPRO_PASSWORD_SCHEME", "scrypt")
+SCRYPT_N = int(os.environ.get("REPAIRPRO_SCRYPT_N", str(2 ** 14)))
+SCRYPT_R = int(os.environ.get("REPAIRPRO_SCRYPT_R", "8"))
+SCRYPT_P = int(os.environ.get("REPAIRPRO_SCRYPT_P", "1"))
+PBKDF2_ITERATIONS = int(os.environ.get("REPAIRPRO_PBKDF2_ITERATIONS", "600000"))
+
+# KDF work is CPU bound; bound how many verifications run at once
+HASH_WORKERS = int(os.environ.get("REPAIRPRO_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+HASH_TIMEOUT_SECONDS = 30
+
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+_hash_pool = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="password-hash")
+_dummy_hash = None
+
+
+def _b64(data):
+    return base64.b64encode(data).decode().rstrip("=")
+
+
+def _unb64(text):
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def _scrypt(password, salt, n, r, p):
+    # maxmem must cover 128 * n * r bytes plus overhead
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * n * r + 1024 * 1024, dklen=KEY_BYTES)
+
+
+def _pbkdf2(password, salt, iterations):
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations, dklen=KEY_BYTES)
+
+
+def hash_password(password, scheme=None, **params):
+    """Hash a password with a random salt using the configured KDF"""
+    scheme = scheme or PASSWORD_SCHEME
+    salt = os.urandom(SALT_BYTES)
+    if scheme == "scrypt":
+        n = params.get("n", SCRYPT_N)
+        r = params.get("r", SCRYPT_R)
+        p = params.get("p", SCRYPT_P)
+        return f"scrypt${n}${r}${p}${_b64(salt)}${_b64(_scrypt(password, salt, n, r, p))}"
+    if scheme == "pbkdf2_sha256":
+        iterations = params.get("iterations", PBKDF2_ITERATIONS)
+        return f"pbkdf2_sha256${iterations}${_b64(salt)}${_b64(_pbkdf2(password, salt, iterations))}"
+    raise ValueError(f"Unknown password scheme: {scheme}")
+
+
+def verify_password(password, stored):
+    """Check a password against a stored hash of any supported scheme"""
+    if not stored:
+        return False
+    try:
+        parts = stored.split("$")
+        if parts[0] == "scrypt" and len(parts) == 6:
+            n, r, p = int(parts[1]), int(parts[2]), int(parts[3])
+            expected = _unb64(parts[5])
+            return hmac.compare_digest(_scrypt(password, _unb64(parts[4]), n, r, p), expected)
+        if parts[0] == "pbkdf2_sha256" and len(parts) == 4:
+            expected = _unb64(parts[3])
+            return hmac.compare_digest(_pbkdf2(password, _unb64(parts[2]), int(parts[1])), expected)
+        if len(stored) == 64:
+            # Legacy unsalted SHA-256 hex digest
+            return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), stored)
+    except (ValueError, TypeError):
+        return False
+    return False
+
+
+def needs_rehash(stored):
+    """True when a stored hash is legacy or uses weaker settings than the current configuration"""
+    parts = (stored or "").split("$")
+    if parts[0] != PASSWORD_SCHEME:
+        return True
+    if PASSWORD_SCHEME == "scrypt":
+        return parts[1:4] != [str(SCRYPT_N), str(SCRYPT_R), str(SCRYPT_P)]
+    return parts[1] != str(PBKDF2_ITERATIONS)
+
+
+def dummy_hash():
+    """Hash of a random password with the current settings, made once per process.
+
+    Verifying against it costs the same as verifying a real user's password, so a
+    login for an unknown username takes as long as one with a wrong password.
+    """
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = hash_password(_b64(os.urandom(SALT_BYTES)))
+    return _dummy_hash
+
+
+def verify_password_pooled(password, stored, timeout=HASH_TIMEOUT_SECONDS):
+    """verify_password on the bounded hashing pool"""
+    return _hash_pool.submit(verify_password, password, stored).result(timeout=timeout)
+
+
+def hash_password_pooled(password, timeout=HASH_TIMEOUT_SECONDS):
+    """hash_password on the bounded hashing pool"""
+    return _hash_pool.submit(hash_password, password).result(timeout=timeout)
@@ -1,10 +1,4 @@
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.platypus import Table, TableStyle
-from reportlab.lib.utils import ImageReader
 from io import BytesIO
-import qrcode
 import sqlite3
 import os
 import sys
@@ -25,6 +19,14 @@ def generate_invoice_pdf_stream(job_id: int,  status:str,  base_url="https://jay
     """
     Generate invoice PDF for a job with improved error handling
     """
+    # reportlab and qrcode are only needed here, so importing pdf.py stays cheap
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib import colors
+    from reportlab.platypus import Table, TableStyle
+    from reportlab.lib.utils import ImageReader
+    import qrcode
+
     try:
         db = DatabaseManager()
         conn = db.get_connection()
@@ -0,0 +1,234 @@
+import sys
+import os
+import time
+import threading
+import functools
+import statistics
+from collections import deque, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.datamanager.querystats import thread_query_totals
+
+# REPAIRPRO_PROFILE=1 profiles every rerun; otherwise admins can add ?profile=1 to the URL
+ENV_ENABLED = os.environ.get("REPAIRPRO_PROFILE", "0") == "1"
+# Reruns kept for the rolling summary and the flame graph export
+WINDOW = int(os.environ.get("REPAIRPRO_PROFILE_WINDOW", "50"))
+
+WIDGET_TYPES = {
+    "button", "button_group", "download_button", "camera_input", "chat_input", "checkbox",
+    "color_picker", "date_input", "date_time_input", "file_uploader", "multiselect",
+    "number_input", "radio", "selectbox", "slider", "text_area", "text_input", "time_input",
+    "audio_input",
+}
+
+_active = threading.local()
+_history = deque(maxlen=WINDOW)
+_history_lock = threading.Lock()
+_hooks_lock = threading.Lock()
+_hooks_installed = False
+
+
+class Section:
+    """Totals for one profiled block; children are the sections opened inside it"""
+
+    __slots__ = ("name", "children", "wall_ms", "cpu_ms", "sql_ms", "sql_count",
+                 "df_bytes", "df_count", "elements", "widgets")
+
+    def __init__(self, name):
+        self.name = name
+        self.children = []
+        self.wall_ms = self.cpu_ms = self.sql_ms = 0.0
+        self.sql_count = self.df_bytes = self.df_count = self.elements = self.widgets = 0
+
+    def walk(self, prefix=()):
+        """(path, section) for this section and every descendant, depth first"""
+        path = prefix + (self.name,)
+        yield path, self
+        for child in self.children:
+            yield from child.walk(path)
+
+    @property
+    def self_ms(self):
+        return max(self.wall_ms - sum(c.wall_ms for c in self.children), 0.0)
+
+
+class RenderProfile:
+    """One rerun of one page"""
+
+    def __init__(self, page):
+        self.page = page
+        self.started = datetime.now()
+        self.root = Section(page)
+        self.stack = [self.root]
+        # Running totals; sections record the difference between entry and exit
+        self.df_bytes = self.df_count = self.elements = self.widgets = 0
+        self.overhead_ms = 0.0
+
+    def snapshot(self):
+        return (time.perf_counter(), time.thread_time(), *thread_query_totals(), self.df_bytes,
+                self.df_count, self.elements, self.widgets, self.overhead_ms)
+
+    def close(self, section, before):
+        after = self.snapshot()
+        # Measuring DataFrame memory is profiler work, not page work
+        section.wall_ms = (after[0] - before[0]) * 1000 - (after[8] - before[8])
+        section.cpu_ms = (after[1] - before[1]) * 1000
+        section.sql_count = after[2] - before[2]
+        section.sql_ms = after[3] - before[3]
+        section.df_bytes = after[4] - before[4]
+        section.df_count = after[5] - before[5]
+        section.elements = after[6] - before[6]
+        section.widgets = after[7] - before[7]
+
+
+def active_profile():
+    return getattr(_active, "profile", None)
+
+
+@contextmanager
+def profile_section(name):
+    """Time a block as a child of the current section; free when profiling is off"""
+    profile = active_profile()
+    if profile is None:
+        yield None
+        return
+    section = Section(name)
+    profile.stack[-1].children.append(section)
+    profile.stack.append(section)
+    before = profile.snapshot()
+    try:
+        yield section
+    finally:
+        profile.close(section, before)
+        profile.stack.pop()
+
+
+def profiled(name=None):
+    """Decorator form of profile_section, named after the function by default"""
+    def decorate(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if active_profile() is None:
+                return func(*args, **kwargs)
+            with profile_section(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _install_hooks():
+    """Wrap pd.read_sql / read_sql_query once to measure the DataFrames pages load"""
+    global _hooks_installed
+    import pandas as pd
+    with _hooks_lock:
+        if _hooks_installed:
+            return
+
+        def measured(original):
+            @functools.wraps(original)
+            def wrapper(*args, **kwargs):
+                result = original(*args, **kwargs)
+                profile = active_profile()
+                if profile is not None and isinstance(result, pd.DataFrame):
+                    started = time.perf_counter()
+                    profile.df_count += 1
+                    profile.df_bytes += int(result.memory_usage(deep=True).sum())
+                    profile.overhead_ms += (time.perf_counter() - started) * 1000
+                return result
+            return wrapper
+
+        pd.read_sql = measured(pd.read_sql)
+        pd.read_sql_query = measured(pd.read_sql_query)
+        _hooks_installed = True
+
+
+def _count_elements(profile):
+    """Count elements sent to the browser during the run; returns a function that stops counting"""
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return lambda: None
+    enqueue = ctx.enqueue
+
+    def counting(msg):
+        if msg.HasField("delta") and msg.delta.HasField("new_element"):
+            profile.elements += 1
+            if msg.delta.new_element.WhichOneof("type") in WIDGET_TYPES:
+                profile.widgets += 1
+        enqueue(msg)
+
+    ctx.enqueue = counting
+    return lambda: vars(ctx).pop("enqueue", None)
+
+
+def profiling_requested(user):
+    if ENV_ENABLED:
+        return True
+    return st.query_params.get("profile") == "1" and user.get('role') == 'admin'
+
+
+@contextmanager
+def profile_run(page, enabled=True):
+    """Profile one page render; yields the RenderProfile, or None when disabled"""
+    if not enabled:
+        yield None
+        return
+    _install_hooks()
+    profile = RenderProfile(page)
+    _active.profile = profile
+    stop_counting = _count_elements(profile)
+    before = profile.snapshot()
+    try:
+        yield profile
+    finally:
+        profile.close(profile.root, before)
+        stop_counting()
+        _active.profile = None
+        with _history_lock:
+            _history.append(profile)
+
+
+def recent_profiles(page=None):
+    with _history_lock:
+        return [p for p in _history if page is None or p.page == page]
+
+
+def summarize(profiles):
+    """Per section path over several reruns: run count, wall time percentiles and averages"""
+    grouped = defaultdict(list)
+    for profile in profiles:
+        for path, section in profile.root.walk():
+            grouped[path].append(section)
+    rows = []
+    for path, sections in grouped.items():
+        walls = sorted(s.wall_ms for s in sections)
+        rows.append({
+            "section": " / ".join(path),
+            "depth": len(path) - 1,
+            "runs": len(sections),
+            "wall_p50_ms": statistics.median(walls),
+            "wall_p95_ms": walls[min(int(len(walls) * 0.95), len(walls) - 1)],
+            "cpu_ms": statistics.fmean(s.cpu_ms for s in sections),
+            "sql_ms": statistics.fmean(s.sql_ms for s in sections),
+            "queries": statistics.fmean(s.sql_count for s in sections),
+            "df_mb": statistics.fmean(s.df_bytes for s in sections) / 1024 ** 2,
+            "elements": statistics.fmean(s.elements for s in sections),
+            "widgets": statistics.fmean(s.widgets for s in sections),
+        })
+    return rows
+
+
+def folded_stacks(profiles):
+    """Collapsed-stack text ("main;page;section <microseconds>") for flamegraph.pl, speedscope or inferno"""
+    totals = defaultdict(float)
+    for profile in profiles:
+        for path, section in profile.root.walk(("main",)):
+            totals[path] += section.self_ms
+    return "".join(
+        f"{';'.join(part.replace(';', ',') for part in path)} {round(ms * 1000)}\n"
+        for path, ms in totals.items() if ms > 0
+    )
@@ -1,75 +1,412 @@
-import sqlite3
+"""Build a synthetic RepairPro database for scale and performance testing.
+
+    python components/utils/randomdata.py --scale large --db fixtures/repairpro_1m.db
+    python components/utils/randomdata.py --jobs 50000 --stores 5 --seed 7 --db /tmp/small.db
+
+The schema comes from DatabaseManager, so the fixture always matches the app.
+The same seed and scale produce the same rows, apart from password salts. All
+generated users share the password "password123". Per-row triggers and
+secondary indexes are suspended while loading, and projections (customer_stats,
+technician_workload, job_events) are rebuilt once at the end.
+"""
+import sys
+import os
+import time
 import random
-from faker import Faker
+import argparse
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from components.datamanager.databasemanger import DatabaseManager
+from components.datamanager.technicianworkload import refresh_technician_workload
+from components.datamanager.technicianstats import refresh_technician_stats
+from components.datamanager.deviceregistry import backfill_device_registry
+from components.utils.models import models
+from components.utils.passwordhash import hash_password
 
-fake = Faker()
+SCALES = {
+    "small": {"stores": 3, "technicians_per_store": 3, "customers": 2000, "jobs": 10000},
+    "medium": {"stores": 10, "technicians_per_store": 5, "customers": 40000, "jobs": 200000},
+    "large": {"stores": 25, "technicians_per_store": 6, "customers": 250000, "jobs": 1000000},
+}
+DEFAULT_PASSWORD = "password123"
+INSERT_CHUNK = 20000
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 
-DB_PATH = "/Users/jayanth/Documents/GitHub/refactored-JobSheet/repairpro.db"  
+FIRST_NAMES = [
+    "Aarav", "Priya", "Rahul", "Ananya", "Vikram", "Sneha", "Arjun", "Kavya", "Rohan", "Meera",
+    "James", "Mary", "John", "Linda", "Michael", "Sarah", "David", "Emma", "Daniel", "Olivia",
+    "Mohammed", "Fatima", "Omar", "Aisha", "Wei", "Mei", "Carlos", "Sofia", "Lucas", "Isabella",
+    "Arun", "Divya", "Karthik", "Lakshmi", "Suresh", "Pooja", "Nikhil", "Riya", "Sanjay", "Neha",
+]
+LAST_NAMES = [
+    "Sharma", "Patel", "Reddy", "Iyer", "Nair", "Gupta", "Singh", "Kumar", "Rao", "Menon",
+    "Smith", "Johnson", "Brown", "Williams", "Jones", "Garcia", "Miller", "Davis", "Wilson", "Taylor",
+    "Khan", "Ali", "Chen", "Wang", "Lopez", "Martinez", "Silva", "Costa", "Fernandes", "D'Souza",
+]
+CITIES = ["Bengaluru", "Chennai", "Hyderabad", "Mumbai", "Pune", "Delhi", "Kochi", "Mysuru", "Coimbatore", "Vizag"]
+STREETS = ["MG Road", "Main Street", "Park Avenue", "Station Road", "Market Road", "Lake View", "Church Street", "Ring Road"]
 
-def seed_stores(conn, count=50):
-    print("Seeding stores...")
-    cursor = conn.cursor()
-    for _ in range(count):
-        name = f"{fake.company()} Store"
-        location = fake.address()
-        phone = fake.phone_number()
-        email = fake.company_email()
-
-        cursor.execute("""
-            INSERT INTO stores (name, location, phone, email)
-            VALUES (?, ?, ?, ?)
-        """, (name, location, phone, email))
-    conn.commit()
+# (device type, weight, models); smartphones use the shared models list
+DEVICE_TYPES = [
+    ("Smartphone", 70, models),
+    ("Tablet", 10, ["iPad Air", "iPad Pro 11", "Galaxy Tab S9", "Lenovo Tab P11", "Xiaomi Pad 6"]),
+    ("Laptop", 10, ["MacBook Air M2", "Dell XPS 13", "HP Pavilion 15", "Lenovo ThinkPad E14", "Asus VivoBook 15"]),
+    ("Desktop", 4, ["Dell OptiPlex 7090", "HP ProDesk 400", "iMac 24", "Custom Build"]),
+    ("Watch", 3, ["Apple Watch Series 9", "Galaxy Watch 6", "Amazfit GTR 4"]),
+    ("Other", 3, ["PS5 Controller", "JBL Flip 6", "Kindle Paperwhite"]),
+]
+PROBLEMS = {
+    "Smartphone": ["Cracked screen", "Battery drains quickly", "Not charging", "Water damage", "Speaker not working",
+                   "Camera blurry", "Stuck on boot logo", "Touch not responding", "Back glass broken", "No network signal"],
+    "Tablet": ["Cracked screen", "Not charging", "Battery swollen", "Touch not responding"],
+    "Laptop": ["Keyboard keys not working", "Overheating and shutting down", "Hinge broken", "Display flickering", "Will not power on"],
+    "Desktop": ["No display", "Random restarts", "Slow performance, needs cleanup", "PSU failure"],
+    "Watch": ["Cracked screen", "Not charging", "Strap replacement"],
+    "Other": ["Not powering on", "Charging port loose", "Button stuck"],
+}
+NOTE_TEXTS = [
+    "Customer called for update", "Part ordered from supplier", "Part received", "Diagnosis complete, awaiting approval",
+    "Customer approved estimate", "Tested OK after repair", "Customer informed, ready for pickup", "Data backup taken",
+]
+LOCK_TYPES = [("None", 50), ("PIN", 30), ("Pattern", 12), ("Password", 8)]
+NOTIFICATIONS = [("Email", 35), ("SMS", 25), ("WhatsApp", 25), ("Phone Call", 5), ("SMS,WhatsApp", 10)]
+PAYMENT_METHODS = [("Cash", 35), ("Card", 20), ("UPI", 40), ("Bank Transfer", 5)]
+OLD_MOBILE_STATUSES = [("Working", 45), ("Not Working", 15), ("Partially Working", 10), ("Screen Damaged", 15),
+                       ("Battery Issues", 10), ("Water Damaged", 5)]
+# Status mix for jobs created 4-21 days and 0-3 days before the end of history
+WEEK_OLD_STATUSES = [("Completed", 70), ("In Progress", 15), ("Pending", 15)]
+RECENT_STATUSES = [("New", 45), ("In Progress", 35), ("Pending", 10), ("Completed", 10)]
+BRAND_PREFIXES = {"iPhone": "Apple", "Redmi": "Xiaomi", "POCO": "Xiaomi", "Moto": "Motorola"}
 
-def seed_customers(conn, count=50):
-    print("Seeding customers...")
-    cursor = conn.cursor()
-    store_ids = [row[0] for row in cursor.execute("SELECT id FROM stores").fetchall()]
-    for _ in range(count):
-        name = fake.name()
-        phone = fake.phone_number()
-        email = fake.email()
-        address = fake.address()
-        store_id = random.choice(store_ids)
-
-        cursor.execute("""
-            INSERT INTO customers (name, phone, email, address, store_id)
-            VALUES (?, ?, ?, ?, ?)
-        """, (name, phone, email, address, store_id))
-    conn.commit()
 
-def seed_jobs(conn, count=50):
-    print("Seeding jobs...")
+_cumulative_cache = {}
+
+
+def _weighted(rng, pairs):
+    """Weighted choice from (value, weight) pairs, with cumulative weights computed once per table"""
+    key = id(pairs)
+    if key not in _cumulative_cache:
+        values, cum, running = [], [], 0
+        for value, weight in pairs:
+            running += weight
+            values.append(value)
+            cum.append(running)
+        _cumulative_cache[key] = (values, cum)
+    values, cum = _cumulative_cache[key]
+    return rng.choices(values, cum_weights=cum)[0]
+
+
+def _name(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def _phone(n):
+    # Bijective scramble so phones look random but never collide
+    return str(6000000000 + (n * 2654435761) % 4000000000)
+
+
+def _address(rng):
+    return f"{rng.randint(1, 999)}, {rng.choice(STREETS)}, {rng.choice(CITIES)}"
+
+
+def _brand(model):
+    first = model.split()[0]
+    return BRAND_PREFIXES.get(first, first)
+
+
+def seed_stores(cursor, rng, count):
+    """Top up the default store to `count` stores; returns store ids"""
+    cursor.execute("SELECT COUNT(*) FROM stores")
+    existing = cursor.fetchone()[0]
+    cursor.executemany(
+        "INSERT INTO stores (name, location, phone, email) VALUES (?, ?, ?, ?)",
+        [(f"{city} Branch {i + 1}", f"{rng.randint(1, 200)}, {rng.choice(STREETS)}, {city}", _phone(900000 + i),
+          f"store{i + 1}@repairpro.com")
+         for i, city in ((i, rng.choice(CITIES)) for i in range(existing, count))]
+    )
+    cursor.execute("SELECT id FROM stores ORDER BY id")
+    return [r[0] for r in cursor.fetchall()]
+
+
+def seed_users(cursor, rng, store_ids, technicians_per_store):
+    """One manager, two staff and N technicians per store; returns ({store: [staff ids]}, {store: [tech ids]})"""
+    password = hash_password(DEFAULT_PASSWORD)
+    staff, technicians = {}, {}
+    for store_id in store_ids:
+        people = [("manager", f"manager_{store_id}")]
+        people += [("staff", f"staff_{store_id}_{n}") for n in range(1, 3)]
+        people += [("technician", f"tech_{store_id}_{n}") for n in range(1, technicians_per_store + 1)]
+        for role, username in people:
+            cursor.execute(
+                "INSERT INTO users (username, password, role, full_name, email, store_id, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (username, password, role, _name(rng), f"{username}@repairpro.com", store_id, "2023-01-01 09:00:00")
+            )
+            user_id = cursor.lastrowid
+            cursor.execute("INSERT INTO user_stores (user_id, store_id, is_primary) VALUES (?, ?, 1)", (user_id, store_id))
+            if role == "technician":
+                cursor.execute("INSERT INTO store_technicians (store_id, technician_id) VALUES (?, ?)", (store_id, user_id))
+                technicians.setdefault(store_id, []).append(user_id)
+            else:
+                staff.setdefault(store_id, []).append(user_id)
+    return staff, technicians
+
+
+def _status_for_age(rng, age_days):
+    if age_days > 21:
+        return "Completed" if rng.random() < 0.97 else "Pending"
+    if age_days > 3:
+        return _weighted(rng, WEEK_OLD_STATUSES)
+    return _weighted(rng, RECENT_STATUSES)
+
+
+def seed_jobs(cursor, rng, store_ids, staff, technicians, jobs, customers, days, end,
+              notes_ratio, photos_ratio, photo_bytes, progress=None):
+    """Generate jobs in time order with customers, assignments, notes and photos; returns row counts"""
+    start = end - timedelta(days=days)
+    # Volume grows ~40% over the period and halves on Sundays
+    weights = [(1 + 0.4 * d / days) * (0.5 if (start + timedelta(days=d)).weekday() == 6 else 1.0) for d in range(days)]
+    total_weight = sum(weights)
+    store_cum = []
+    running = 0
+    for _ in store_ids:
+        running += rng.lognormvariate(0, 0.5)
+        store_cum.append(running)
+    device_types = [d[0] for d in DEVICE_TYPES]
+    device_cum = []
+    running = 0
+    for d in DEVICE_TYPES:
+        running += d[1]
+        device_cum.append(running)
+    device_models = {d[0]: d[2] for d in DEVICE_TYPES}
+    new_customer_rate = min(1.0, customers / max(jobs, 1))
+    photo_blob = rng.randbytes(photo_bytes)
+
+    pools = {store_id: [] for store_id in store_ids}
+    counts = {"customers": 0, "jobs": 0, "assignments": 0, "notes": 0, "photos": 0}
+    rows = {"customers": [], "jobs": [], "assignments": [], "assignment_jobs": [], "notes": [], "photos": []}
+    customer_id = job_id = assignment_id = 0
+    emitted = 0
+    cumulative = 0.0
+
+    def flush():
+        cursor.executemany("INSERT INTO customers (id, name, phone, email, address, store_id, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)", rows["customers"])
+        cursor.executemany('''
+            INSERT INTO jobs (
+                id, customer_id, device_type, device_model, device_password_type, device_password,
+                notification_methods, problem_description, deposit_cost, raw_cost, estimate_cost, actual_cost,
+                payment_status, payment_method, status, store_id, assigned_by,
+                created_at, updated_at, completed_at, started_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows["jobs"])
+        cursor.executemany('''
+            INSERT INTO technician_assignments (id, technician_id, assigned_by, assigned_at, started_at, completed_at, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', rows["assignments"])
+        cursor.executemany("INSERT INTO assignment_jobs (assignment_id, job_id) VALUES (?, ?)", rows["assignment_jobs"])
+        cursor.executemany("INSERT INTO job_notes (job_id, note, created_at) VALUES (?, ?, ?)", rows["notes"])
+        cursor.executemany("INSERT INTO job_photos (job_id, photo, uploaded_at) VALUES (?, ?, ?)", rows["photos"])
+        for key in rows:
+            rows[key].clear()
+        if progress:
+            progress(counts)
+
+    for day, weight in enumerate(weights):
+        # Cumulative rounding keeps the total exactly at `jobs`
+        cumulative += weight
+        day_count = round(cumulative / total_weight * jobs) - emitted
+        emitted += day_count
+        day_start = start + timedelta(days=day)
+        age_days = days - day
+        opening = sorted(9 * 3600 + rng.random() * 11 * 3600 for _ in range(day_count))
+        day_stores = rng.choices(store_ids, cum_weights=store_cum, k=day_count)
+
+        for seconds, store_id in zip(opening, day_stores):
+            created = day_start + timedelta(seconds=int(seconds))
+            created_text = created.strftime(TIME_FORMAT)
+            pool = pools[store_id]
+
+            if not pool or rng.random() < new_customer_rate:
+                customer_id += 1
+                name = _name(rng)
+                rows["customers"].append((
+                    customer_id, name, _phone(customer_id),
+                    f"{name.split()[0].lower()}{customer_id}@example.com" if rng.random() < 0.7 else None,
+                    _address(rng) if rng.random() < 0.6 else None, store_id, created_text
+                ))
+                pool.append(customer_id)
+                counts["customers"] += 1
+                job_customer = customer_id
+            else:
+                # Recent customers are the most likely to come back
+                job_customer = pool[int(len(pool) * rng.random() ** 0.5)]
+
+            job_id += 1
+            device_type = rng.choices(device_types, cum_weights=device_cum)[0]
+            lock = _weighted(rng, LOCK_TYPES)
+            lock_value = {"None": None, "PIN": f"{rng.randint(0, 999999):06d}",
+                          "Pattern": " → ".join(str(n) for n in rng.sample(range(1, 10), 4)),
+                          "Password": f"pass{rng.randint(100, 9999)}"}[lock]
+            status = _status_for_age(rng, age_days)
+            estimate = round(rng.lognormvariate(4.3, 0.6), 2)
+            deposit = round(estimate * rng.choice((0, 0, 0.2, 0.5)), 2)
+
+            started = completed = None
+            if status != "New":
+                started = min(created + timedelta(hours=rng.lognormvariate(1.0, 1.0)), end)
+            if status == "Completed":
+                completed = min(started + timedelta(hours=rng.lognormvariate(2.5, 1.0)), end)
+                actual = round(estimate * rng.uniform(0.85, 1.25), 2)
+                raw = round(actual * rng.uniform(0.35, 0.6), 2)
+                paid = rng.random() < 0.95
+            else:
+                actual = raw = 0
+                paid = False
+            started_text = started.strftime(TIME_FORMAT) if started else None
+            completed_text = completed.strftime(TIME_FORMAT) if completed else None
+            assigned_by = rng.choice(staff[store_id])
+
+            rows["jobs"].append((
+                job_id, job_customer, device_type, rng.choice(device_models[device_type]), lock, lock_value,
+                _weighted(rng, NOTIFICATIONS), rng.choice(PROBLEMS[device_type]), deposit, raw, estimate, actual,
+                "Completed" if paid else "Pending", _weighted(rng, PAYMENT_METHODS) if paid else None,
+                status, store_id, assigned_by,
+                created_text, completed_text or started_text or created_text, completed_text, started_text
+            ))
+
+            if status != "New" or rng.random() < 0.5:
+                assignment_id += 1
+                rows["assignments"].append((
+                    assignment_id, rng.choice(technicians[store_id]), assigned_by,
+                    (created + timedelta(minutes=rng.randint(1, 90))).strftime(TIME_FORMAT),
+                    started_text, completed_text, "completed" if status == "Completed" else "active"
+                ))
+                rows["assignment_jobs"].append((assignment_id, job_id))
+                counts["assignments"] += 1
+
+            if rng.random() < notes_ratio:
+                span = ((completed or end) - created).total_seconds()
+                for _ in range(rng.randint(1, 3)):
+                    noted = created + timedelta(seconds=rng.random() * span)
+                    rows["notes"].append((job_id, rng.choice(NOTE_TEXTS), noted.strftime(TIME_FORMAT)))
+                    counts["notes"] += 1
+
+            if rng.random() < photos_ratio:
+                rows["photos"].append((job_id, photo_blob, created_text))
+                counts["photos"] += 1
+
+            counts["jobs"] += 1
+            if len(rows["jobs"]) >= INSERT_CHUNK:
+                flush()
+
+    flush()
+    return counts
+
+
+def seed_old_mobiles(cursor, rng, store_ids, count, end):
+    """Trade-in devices spread over the last year"""
+    phones = [m for m in models if m.split()[0] not in ("iPad", "MacBook")]
+    rows = []
+    for n in range(count):
+        model = rng.choice(phones)
+        status = _weighted(rng, OLD_MOBILE_STATUSES)
+        created = (end - timedelta(seconds=rng.random() * 365 * 86400)).strftime(TIME_FORMAT)
+        rows.append((
+            _name(rng), _phone(5000000 + n), None, None, _address(rng) if rng.random() < 0.5 else None,
+            _brand(model), model, "".join(str(rng.randint(0, 9)) for _ in range(15)) if rng.random() < 0.8 else None,
+            status, rng.choice(("Yes", "No")), round(rng.lognormvariate(8.5, 0.7), 2),
+            rng.choice(store_ids), created, created
+        ))
+    cursor.executemany('''
+        INSERT INTO old_mobiles (
+            customer_name, customer_phone, customer_email, aadhar_number, customer_address,
+            mobile_brand, mobile_model, imei_number, repair_status, warranty_status, estimated_value,
+            store_id, created_at, updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+
+
+def generate(db_path, seed=42, stores=10, technicians_per_store=5, customers=40000, jobs=200000,
+             days=730, end=datetime(2025, 6, 30, 21, 0), notes_ratio=0.3, photos_ratio=0.01,
+             photo_bytes=2048, old_mobiles=None, progress=None):
+    """Create a fresh fixture database at db_path; returns generated row counts"""
+    if os.path.exists(db_path):
+        raise FileExistsError(f"{db_path} already exists")
+    rng = random.Random(seed)
+
+    # Schema, default store and admin come from the app itself
+    db = DatabaseManager(db_path)
+    conn = db.get_connection()
     cursor = conn.cursor()
-    store_ids = [row[0] for row in cursor.execute("SELECT id FROM stores").fetchall()]
-    statuses = ["Pending", "In Progress", "Completed"]
-    technicians = [fake.name() for _ in range(10)] + ["Unassigned"]
-
-    for _ in range(count):
-        customer_name = fake.name()
-        device_type = random.choice(["Phone", "Laptop", "Tablet", "Smartwatch"])
-        device_model = f"{device_type} {fake.word().capitalize()}"
-        problem_description = fake.sentence(nb_words=6)
-        deposit_cost = round(random.uniform(50, 500), 2)
-        status = random.choice(statuses)
-        technician = random.choice(technicians)
-        store_id = random.choice(store_ids)
-
-        cursor.execute("""
-            INSERT INTO jobs (customer_name, device_type, device_model, 
-                              problem_description, deposit_cost, status, 
-                              technician, store_id)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (customer_name, device_type, device_model, problem_description,
-              deposit_cost, status, technician if technician != "Unassigned" else None, store_id))
+    cursor.execute("PRAGMA journal_mode = MEMORY")
+    cursor.execute("PRAGMA synchronous = OFF")
+
+    deferred_indexes = DatabaseManager.drop_secondary_indexes(
+        cursor, ["jobs", "customers", "old_mobiles", "assignment_jobs", "technician_assignments", "job_events"]
+    )
+    DatabaseManager.drop_customer_stats_triggers(cursor)
+
+    store_ids = seed_stores(cursor, rng, stores)
+    staff, technicians = seed_users(cursor, rng, store_ids, technicians_per_store)
+    counts = seed_jobs(cursor, rng, store_ids, staff, technicians, jobs, customers, days, end,
+                       notes_ratio, photos_ratio, photo_bytes, progress)
+    old_mobiles = jobs // 50 if old_mobiles is None else old_mobiles
+    seed_old_mobiles(cursor, rng, store_ids, old_mobiles, end)
+    counts["old_mobiles"] = old_mobiles
+
+    for sql in deferred_indexes:
+        cursor.execute(sql)
+    DatabaseManager.rebuild_customer_stats(cursor)
+    DatabaseManager.create_customer_stats_triggers(cursor)
+    DatabaseManager.backfill_job_events(cursor)
+    refresh_technician_workload(cursor)
+    refresh_technician_stats(cursor)
+    backfill_device_registry(cursor)
     conn.commit()
 
-if __name__ == "__main__":
-    conn = sqlite3.connect(DB_PATH)
-    
-    seed_stores(conn)
-    seed_customers(conn)
-    seed_jobs(conn)
-    
-    print("✅ Done seeding dummy data!")
+    cursor.execute("ANALYZE")
+    cursor.execute("PRAGMA journal_mode = DELETE")
     conn.close()
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a deterministic RepairPro fixture database")
+    parser.add_argument("--db", required=True, help="Output database path (must not exist unless --force)")
+    parser.add_argument("--scale", choices=SCALES, default="medium", help="Preset sizes; explicit flags override")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--stores", type=int)
+    parser.add_argument("--technicians-per-store", type=int)
+    parser.add_argument("--customers", type=int, help="Approximate number of distinct customers")
+    parser.add_argument("--jobs", type=int)
+    parser.add_argument("--days", type=int, default=730, help="History length ending at --end")
+    parser.add_argument("--end", default="2025-06-30", help="Last day of generated history (YYYY-MM-DD)")
+    parser.add_argument("--notes-ratio", type=float, default=0.3, help="Share of jobs with notes")
+    parser.add_argument("--photos-ratio", type=float, default=0.01, help="Share of jobs with a photo")
+    parser.add_argument("--photo-bytes", type=int, default=2048)
+    parser.add_argument("--old-mobiles", type=int, help="Default: jobs / 50")
+    parser.add_argument("--force", action="store_true", help="Replace an existing file at --db")
+    args = parser.parse_args()
+
+    params = dict(SCALES[args.scale])
+    for key in params:
+        if getattr(args, key) is not None:
+            params[key] = getattr(args, key)
+
+    if os.path.exists(args.db):
+        if not args.force:
+            sys.exit(f"{args.db} exists; pass --force to replace it")
+        os.remove(args.db)
+    if os.path.dirname(args.db):
+        os.makedirs(os.path.dirname(args.db), exist_ok=True)
+
+    started = time.perf_counter()
+    counts = generate(
+        args.db, seed=args.seed, days=args.days,
+        end=datetime.strptime(args.end, "%Y-%m-%d").replace(hour=21),
+        notes_ratio=args.notes_ratio, photos_ratio=args.photos_ratio, photo_bytes=args.photo_bytes,
+        old_mobiles=args.old_mobiles,
+        progress=lambda c: print(f"  {c['jobs']:,} jobs, {c['customers']:,} customers", end="\r"),
+        **params
+    )
+    elapsed = time.perf_counter() - started
+    print(f"\n✅ {args.db}: " + ", ".join(f"{v:,} {k}" for k, v in counts.items()) + f" in {elapsed:.1f}s")
@@ -4,6 +4,10 @@ import sys
 import pandas as pd
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from components.datamanager.databasemanger import DatabaseManager
+from components.datamanager.deviceregistry import unregister_record
+from components.datamanager.oldmobilequery import (
+    OLD_MOBILE_PAGE_SIZE, get_old_mobile_facets, search_old_mobiles
+)
 
 def view_old_mobiles():
     st.header("All Old Mobile Records")
@@ -16,82 +20,90 @@ def view_old_mobiles():
         store_id = st.session_state.user.get('store_id')
         user_role = st.session_state.user.get('role')
         
-        # Build query based on user role
-        if user_role == 'admin':
-            # Admin can see all records
-            query = '''
-                SELECT om.*, s.name as store_name 
-                FROM old_mobiles om 
-                LEFT JOIN stores s ON om.store_id = s.id 
-                ORDER BY om.created_at DESC
-            '''
-            df = pd.read_sql_query(query, conn)
-        else:
-            # Other roles see only their store's records
-            query = '''
-                SELECT * FROM old_mobiles 
-                WHERE store_id = ? 
-                ORDER BY created_at DESC
-            '''
-            df = pd.read_sql_query(query, conn, params=[store_id])
+        # Admin can see all records, other roles only their store's records
+        scope_store_id = None if user_role == 'admin' else store_id
         
-        conn.close()
-        
-        if df.empty:
+        # Dropdown options and counts come from cached SQL facets
+        facets = get_old_mobile_facets(conn, scope_store_id)
+        if not facets['brands'] and not facets['statuses']:
+            conn.close()
             st.info("No old mobile records found.")
             return
+        brand_counts = dict(facets['brands'])
+        status_counts = dict(facets['statuses'])
         
         # Add search and filter options
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            search_term = st.text_input("🔍 Search", placeholder="Search by customer name, phone, or brand")
+            search_term = st.text_input("🔍 Search", placeholder="Search by customer name, phone, brand or full IMEI")
         
         with col2:
-            # Handle case where mobile_brand column might have None values
-            brand_options = ["All"] + [brand for brand in df['mobile_brand'].dropna().unique().tolist() if brand]
-            brand_filter = st.selectbox("Filter by Brand", brand_options)
+            brand_options = ["All"] + list(brand_counts)
+            brand_filter = st.selectbox(
+                "Filter by Brand", brand_options,
+                format_func=lambda b: b if b == "All" else f"{b} ({brand_counts[b]})"
+            )
         
         with col3:
-            # Handle case where repair_status column might have None values
-            status_options = ["All"] + [status for status in df['repair_status'].dropna().unique().tolist() if status]
-            status_filter = st.selectbox("Filter by Status", status_options)
-        
-        # Apply filters
-        filtered_df = df.copy()
-        
-        if search_term:
-            # Use proper pandas string operations with na=False to handle None values
-            filtered_df = filtered_df[
-                (filtered_df['customer_name'].astype(str).str.contains(search_term, case=False, na=False)) |
-                (filtered_df['customer_phone'].astype(str).str.contains(search_term, case=False, na=False)) |
-                (filtered_df['mobile_brand'].astype(str).str.contains(search_term, case=False, na=False))
-            ]
-        
-        if brand_filter != "All":
-            filtered_df = filtered_df[filtered_df['mobile_brand'] == brand_filter]
-        
-        if status_filter != "All":
-            filtered_df = filtered_df[filtered_df['repair_status'] == status_filter]
+            status_options = ["All"] + list(status_counts)
+            status_filter = st.selectbox(
+                "Filter by Status", status_options,
+                format_func=lambda s: s if s == "All" else f"{s} ({status_counts[s]})"
+            )
+        
+        # Reset to the first page whenever the filters change
+        filter_key = (search_term, brand_filter, status_filter)
+        if st.session_state.get('old_mobiles_filter_key') != filter_key:
+            st.session_state.old_mobiles_filter_key = filter_key
+            st.session_state.old_mobiles_page = 1
+        
+        page = st.session_state.get('old_mobiles_page', 1)
+        filtered_df, counts = search_old_mobiles(
+            conn, scope_store_id, search_term, brand_filter, status_filter,
+            page=page, include_store_name=(user_role == 'admin')
+        )
+        total_pages = max(1, -(-counts['total'] // OLD_MOBILE_PAGE_SIZE))
+        if page > total_pages:
+            # Records were removed since the page was chosen
+            page = st.session_state.old_mobiles_page = total_pages
+            filtered_df, counts = search_old_mobiles(
+                conn, scope_store_id, search_term, brand_filter, status_filter,
+                page=page, include_store_name=(user_role == 'admin')
+            )
+        conn.close()
         
         # Display statistics
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.metric("Total Records", len(filtered_df))
+            st.metric("Total Records", counts['total'])
         
         with col2:
-            working_count = len(filtered_df[filtered_df['repair_status'] == 'Working'])
-            st.metric("Working Phones", working_count)
+            st.metric("Working Phones", counts['working'])
         
         with col3:
-            not_working_count = len(filtered_df[filtered_df['repair_status'] == 'Not Working'])
-            st.metric("Not Working", not_working_count)
+            st.metric("Not Working", counts['not_working'])
+        
+        if counts['total'] == 0:
+            st.info("No records match the current filters.")
+            return
+        
+        # Pagination controls
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            st.number_input(
+                f"Page (of {total_pages})", min_value=1, max_value=total_pages,
+                step=1, key='old_mobiles_page'
+            )
+        with col2:
+            first = (page - 1) * OLD_MOBILE_PAGE_SIZE + 1
+            st.caption(f"Showing {first}-{first + len(filtered_df) - 1} of {counts['total']} records")
         
         # Display records in expandable format
-        st.subheader(f"Records ({len(filtered_df)})")
+        st.subheader(f"Records ({counts['total']})")
         
-        for index, record in filtered_df.iterrows():
+        for record in filtered_df.to_dict('records'):
             with st.expander(f"📱 {record['mobile_brand']} {record['mobile_model']} - {record['customer_name']} ({record['customer_phone']})"):
                 col1, col2 = st.columns(2)
                 
@@ -161,6 +173,7 @@ def delete_old_mobile_record(record_id):
         conn = db.get_connection()
         cursor = conn.cursor()
         cursor.execute("DELETE FROM old_mobiles WHERE id = ?", (record_id,))
+        unregister_record(cursor, 'old_mobile', record_id)
         conn.commit()
         conn.close()
         st.success("Record deleted successfully!")
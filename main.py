@@ -4,19 +4,10 @@ import sys
 import json
 import time
 import hashlib
+import importlib
 from components.css.css import Style
-from pages.screens.old_mobiles import old_mobiles_page
-from pages.screens.loginpage import login_signup_page
-from pages.screens.admindashboard import admin_dashboard
-from pages.screens.staffdashboard import staff_dashboard
-from pages.screens.jobmanagement import jobs_management
-from pages.screens.storemanagement import store_management
-from pages.screens.customersmanagement import customers_management
-from pages.screens.reportmanagement import reports_management
-from pages.screens.settingpage import settings_page
-from pages.screens.usermanagement import user_management
 from components.sidebarnavigation import sidebar_navigation
-from pages.screens.techniciandashboard import technician_dashboard
+from components.utils.profiler import profile_run, profiling_requested
 
 st.set_page_config(
     page_title="RepairPro - Management System",
@@ -29,6 +20,36 @@ st.markdown(Style, unsafe_allow_html=True)
 
 TOKEN_FILE = "tokens.json"
 
+# Screens are imported on first navigation, so a session only pays for the
+# plotly/reportlab/PIL imports of the pages it actually opens
+PAGES = {
+    "jobs": ("pages.screens.jobmanagement", "jobs_management"),
+    "customers": ("pages.screens.customersmanagement", "customers_management"),
+    "stores": ("pages.screens.storemanagement", "store_management"),
+    "reports": ("pages.screens.reportmanagement", "reports_management"),
+    "users": ("pages.screens.usermanagement", "user_management"),
+    "settings": ("pages.screens.settingpage", "settings_page"),
+    "old_mobiles": ("pages.screens.old_mobiles", "old_mobiles_page"),
+    "bulk_import": ("pages.screens.bulkimport", "bulk_import_page"),
+    "performance": ("pages.screens.performance", "performance_page"),
+}
+
+DASHBOARDS = {
+    "admin": ("pages.screens.admindashboard", "admin_dashboard"),
+    "manager": ("pages.screens.admindashboard", "admin_dashboard"),
+    "staff": ("pages.screens.staffdashboard", "staff_dashboard"),
+    "technician": ("pages.screens.techniciandashboard", "technician_dashboard"),
+}
+
+LOGIN_PAGE = ("pages.screens.loginpage", "login_signup_page")
+
+
+def load_page(entry):
+    """Page function for a (module, function) registry entry, importing the module if needed"""
+    module_name, function_name = entry
+    return getattr(importlib.import_module(module_name), function_name)
+
+
 def main():
     token = st.query_params.get("token", None)
 
@@ -45,7 +66,7 @@ def main():
                 print("Token error:", e)
 
     if 'authenticated' not in st.session_state or not st.session_state.authenticated:
-        login_signup_page()
+        load_page(LOGIN_PAGE)()
     else:
         # Optional logout button
         # with st.sidebar:
@@ -55,29 +76,19 @@ def main():
         #         st.rerun()
 
         current_page = sidebar_navigation()
-        if current_page == "dashboard":
-            if st.session_state.user['role'] == 'admin' or st.session_state.user['role'] == 'manager':
-                admin_dashboard(st)
-            elif (st.session_state.user['role'] == 'staff'):
-                staff_dashboard()
-            elif (st.session_state.user['role'] == 'technician'):
-                technician_dashboard() 
-                
-                
-        elif current_page == "jobs":
-            jobs_management()
-        elif current_page == "customers":
-            customers_management()
-        elif current_page == "stores":
-            store_management()
-        elif current_page == "reports":
-            reports_management()
-        elif current_page == "users":
-            user_management()
-        elif current_page == "settings":
-            settings_page()
-        elif current_page == "old_mobiles":
-            old_mobiles_page()
+        profiling = profiling_requested(st.session_state.user)
+        with profile_run(current_page, enabled=profiling) as profile:
+            if current_page == "dashboard":
+                role = st.session_state.user['role']
+                if role in ('admin', 'manager'):
+                    load_page(DASHBOARDS[role])(st)
+                elif role in DASHBOARDS:
+                    load_page(DASHBOARDS[role])()
+            elif current_page in PAGES:
+                load_page(PAGES[current_page])()
+        if profile is not None:
+            from components.profilepanel import profile_panel
+            profile_panel(profile)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
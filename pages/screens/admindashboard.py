@@ -4,6 +4,7 @@ import sys
 import os 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from components.datamanager.databasemanger import DatabaseManager
+from components.report.daterange import today_key
 from pages.screens.createjob import create_job_tab 
 
 def admin_dashboard(st):
@@ -49,7 +50,7 @@ def admin_dashboard(st):
     # Job metrics
     total_jobs = count_query()
     ongoing_jobs = count_query("status = 'In Progress'")
-    completed_today = count_query("status = 'Completed' AND DATE(completed_at) = DATE('now')")
+    completed_today = count_query(f"status = 'Completed' AND completed_day = {today_key()}")
     completed_jobs = count_query("status = 'Completed'")
 
     # === Display Metrics ===
@@ -107,7 +108,7 @@ def admin_dashboard(st):
 
         if not search_results.empty:
             st.success(f"Found {len(search_results)} matching job(s):")
-            for _, job in search_results.iterrows():
+            for job in search_results.to_dict('records'):
                 st.markdown(f'''
                     <div class="job-card">
                         <div class="job-title">#{job['id']} - {job['customer_name']} {f"| 🏪 {job['store_name']}" if user['role'] == 'admin' else ""}</div>
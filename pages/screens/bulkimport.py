@@ -0,0 +1,97 @@
+import streamlit as st
+import pandas as pd
+import csv
+import io
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.datamanager.databasemanger import DatabaseManager
+from components.datamanager.dimensions import get_store_options
+from components.datamanager.bulkimport import import_jobs, read_rows, IMPORT_COLUMNS, REQUIRED_COLUMNS
+
+
+def bulk_import_page():
+    """Only accessible by admin users"""
+    user = st.session_state.user
+
+    if user['role'] != 'admin':
+        st.error("❌ Access Denied: Admin privileges required")
+        return
+
+    st.markdown('''
+        <div class="main-header">
+            <h1>📥 Bulk Job Import</h1>
+            <p>Import historical jobs from CSV or Excel</p>
+        </div>
+    ''', unsafe_allow_html=True)
+
+    db = DatabaseManager()
+    conn = db.get_connection()
+
+    with st.expander("📄 File format"):
+        st.write("One job per row. Headers may be the column names below or the labels configured in Job Schema.")
+        st.write(f"**Required:** {', '.join(REQUIRED_COLUMNS)}")
+        st.write(f"**Optional:** {', '.join(c for c in IMPORT_COLUMNS if c not in REQUIRED_COLUMNS)}")
+        st.caption("Customers are matched by phone number ignoring formatting. `store` is a store name and "
+                   "`assigned_technician` a technician username or full name. `serial_number` (or `imei`) "
+                   "links the job to the device registry; custom Job Schema fields are imported by name or label.")
+
+    store_options = dict(sorted(get_store_options(conn).items()))
+    store_names = list(store_options)
+
+    with st.form("bulk_import_form"):
+        uploaded = st.file_uploader("Jobs file", type=["csv", "xlsx"])
+        default_store = st.selectbox("Store for rows without a store column", store_names)
+        dry_run = st.checkbox("Validate only (no changes saved)")
+        submitted = st.form_submit_button("📥 Import Jobs", use_container_width=True)
+
+    if submitted:
+        if uploaded is None:
+            st.error("❌ Please choose a file to import")
+        else:
+            store_id = store_options[default_store]
+            rejects = io.StringIO()
+            status = st.empty()
+            try:
+                with st.spinner("Importing jobs..."):
+                    result = import_jobs(
+                        conn, read_rows(uploaded, uploaded.name), user_id=user['id'],
+                        default_store_id=store_id, reject_writer=csv.writer(rejects), dry_run=dry_run,
+                        progress=lambda s: status.info(f"⏳ {s['read']:,} rows read, {s['imported']:,} imported")
+                    )
+                st.session_state.bulk_import_result = (result, rejects.getvalue(), uploaded.name, dry_run)
+            except Exception as e:
+                st.session_state.pop('bulk_import_result', None)
+                st.error(f"❌ Import failed, no changes were saved: {str(e)}")
+
+    if 'bulk_import_result' in st.session_state:
+        result, reject_csv, filename, was_dry_run = st.session_state.bulk_import_result
+
+        if was_dry_run:
+            st.info(f"🔍 Validation of {filename}: {result['imported']:,} rows valid, nothing saved")
+        else:
+            st.success(f"✅ Imported {result['imported']:,} jobs from {filename} in {result['seconds']:.1f}s")
+
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Rows Read", f"{result['read']:,}")
+        with col2:
+            st.metric("Imported", f"{result['imported']:,}")
+        with col3:
+            st.metric("Rejected", f"{result['rejected']:,}")
+        with col4:
+            st.metric("New Customers", f"{result['customers_created']:,}")
+
+        if result['missing_fields']:
+            st.warning(f"⚠️ Columns not in file: {', '.join(result['missing_fields'])}")
+
+        if result['rejected']:
+            st.download_button(
+                "⬇️ Download Rejected Rows",
+                data=reject_csv,
+                file_name=f"{os.path.splitext(filename)[0]}_rejects.csv",
+                mime="text/csv",
+                use_container_width=True
+            )
+
+    conn.close()
@@ -1,14 +1,18 @@
 import streamlit as st 
-from PIL import Image
 import os 
 import sys 
 import pandas as pd 
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from components.utils.createjob import create_job_in_database
+from components.datamanager.technicianworkload import get_technician_workload, least_loaded_technician
 from components.notifications.email_utils import send_job_status_email
 from components.utils.models import models
 from components.billpreview import display_bill_preview
+from components.datamanager.jobschema import get_form_definition
+from components.utils.password import render_pattern_input
+from components.datamanager.deviceregistry import normalize_device_key, validate_device_key
+from components.devicehistory import display_device_history
 
 def create_job_tab(conn, user, db):
     st.markdown("### Create New Repair Job")
@@ -60,6 +64,13 @@ def create_job_tab(conn, user, db):
         device_type = st.selectbox("Device Type*", ["Smartphone", "Tablet", "Laptop", "Desktop", "Watch", "Other"], index=0)
     with col2:
         device_model = st.selectbox("Device Model", models)
+    device_serial = st.text_input("IMEI / Serial Number", placeholder="15-digit IMEI or device serial number", key="device_serial_input")
+    device_key = normalize_device_key(device_serial)
+    device_key_error = validate_device_key(device_key)
+    if device_key_error:
+        st.error(f"⚠️ {device_key_error}")
+    else:
+        display_device_history(conn, device_key)
         
     # Store assignment section - MOVED OUTSIDE FORM for immediate response
     st.markdown("#### 🏪 Store Assignment")
@@ -104,6 +115,14 @@ def create_job_tab(conn, user, db):
         st.markdown("#### 📢 Notification Preferences")
         notification_methods = st.multiselect("How should we notify the customer?", ["SMS", "Email", "Phone Call", "WhatsApp"], default=["Email"])
 
+        # Job sheet fields configured in Job Schema that have no jobs column
+        custom_fields = get_form_definition(conn).custom_fields
+        custom_values = {}
+        if custom_fields:
+            st.markdown("#### 📋 Additional Details")
+            for field in custom_fields:
+                custom_values[field.name] = render_custom_field(field)
+
         st.markdown("#### 📸 Device Photos")
         st.info("💡 Photos will be uploaded and securely stored")
         uploaded_photos = st.file_uploader("Upload device photos (optional)", type=['png', 'jpg', 'jpeg'], accept_multiple_files=True, help="Upload photos of the device showing the issue (Max 10MB per photo)")
@@ -124,6 +143,12 @@ def create_job_tab(conn, user, db):
                 errors.append("Problem description is required")
             if not selected_store_id:
                 errors.append("Store selection is required")
+            if device_key_error:
+                errors.append(device_key_error)
+            for field in custom_fields:
+                error = field.validate(custom_values.get(field.name))
+                if error:
+                    errors.append(error)
 
             if uploaded_photos:
                 for photo in uploaded_photos:
@@ -167,7 +192,9 @@ def create_job_tab(conn, user, db):
                             'notification_methods': notification_methods,
                             'existing_customer_id': existing_customer_info[0] if existing_customer_info else None,
                             'auto_used_existing': bool(existing_customer_info),
-                            'selected_store_id': selected_store_id
+                            'selected_store_id': selected_store_id,
+                            'custom_values': custom_values,
+                            'device_key': device_key or None
                         },
                         uploaded_photos
                     )
@@ -255,18 +282,16 @@ def render_technician_assignment(conn, user, selected_store_id):
         st.warning("⚠️ Please select a store first to see available technicians")
         return None, None
     
-    # Get technicians for the selected store
-    technicians_df = pd.read_sql('''
-        SELECT u.id, u.full_name, u.email
-        FROM users u
-        JOIN store_technicians st ON u.id = st.technician_id
-        WHERE st.store_id = ? AND st.is_active = 1 AND u.role = 'technician'
-        ORDER BY u.full_name
-    ''', conn, params=[selected_store_id])
+    # Technicians with their current load, read from the workload projection
+    workload = get_technician_workload(conn, selected_store_id)
 
-    if not technicians_df.empty:
-        tech_options = [("Unassigned", None)]
-        tech_options.extend([(f"{row['full_name']} ({row['email']})", row['id']) for _, row in technicians_df.iterrows()])
+    if workload:
+        suggested = least_loaded_technician(workload)
+        tech_options = [("Unassigned", None), ("⚡ Auto-assign (least loaded)", "auto")]
+        tech_options.extend([
+            (f"{tech['full_name']} ({tech['email']}) - {tech['open_jobs']} open, {tech['in_progress_jobs']} in progress", tech['id'])
+            for tech in workload
+        ])
         
         selected_tech = st.selectbox(
             "Assign Technician",
@@ -277,6 +302,9 @@ def render_technician_assignment(conn, user, selected_store_id):
         )
         
         technician_id = selected_tech[1]
+        if technician_id == "auto":
+            technician_id = suggested['id']
+            st.caption(f"⚡ Will assign {suggested['full_name']} ({suggested['open_jobs']} open jobs)")
         assigned_by = user["id"]  # Logged-in user is assigning the tech
 
         return technician_id, assigned_by
@@ -285,6 +313,29 @@ def render_technician_assignment(conn, user, selected_store_id):
         return None, None
 
 
+def render_custom_field(field):
+    """Input for a compiled job_schema field, by its type; returns the entered value"""
+    label = field.label + ('*' if field.required else '')
+    key = f"custom_field_{field.id}"
+    if field.type == 'pattern':
+        return render_pattern_input(field.label, field.pattern, field.required)
+    if field.type == 'textarea':
+        return st.text_area(label, key=key, height=80)
+    if field.type == 'number':
+        return st.number_input(label, value=None, key=key)
+    if field.type == 'date':
+        return st.date_input(label, value="today" if field.required else None, key=key)
+    if field.type == 'select' and field.options:
+        return st.selectbox(label, field.options, index=None, key=key)
+    if field.type in ('multiselect', 'checkbox') and field.options:
+        return st.multiselect(label, field.options, key=key)
+    if field.type == 'checkbox':
+        return st.checkbox(label, key=key)
+    if field.type == 'password':
+        return st.text_input(label, type="password", key=key)
+    return st.text_input(label, key=key)
+
+
 def render_password_section():
     password_type = st.radio(
         "Device Lock Type*",
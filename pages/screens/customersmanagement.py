@@ -5,6 +5,9 @@ import streamlit as st
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from components.datamanager.databasemanger import DatabaseManager
+from components.datamanager.customerdirectory import (
+    CUSTOMER_PAGE_SIZE, count_customers, fetch_customer_page, fetch_recent_jobs
+)
 from components.jobdetailmodal import show_job_details_modal
 
 
@@ -30,58 +33,40 @@ def customers_management():
             placeholder="Type part of a name, phone, email, address or #ID…"
         ).strip()
 
-        # ── Build query ──
-        base_query = """
-            SELECT
-                c.id, c.name, c.phone, c.email, c.address,
-                c.created_at,
-                {store_col}
-                COUNT(j.id) AS total_jobs
-            FROM customers c
-            LEFT JOIN stores s ON c.store_id = s.id
-            LEFT JOIN jobs j ON c.id = j.customer_id
-            WHERE 1 = 1
-        """
-        params = []
-
         # Role-based filtering
-        if user["role"] != "admin":
-            base_query += " AND c.store_id = ?"
-            params.append(user["store_id"])
-            store_col = ""
-        else:
-            store_col = "s.name AS store_name,"
-
-        # Search filter
-        if search_term:
-            base_query += """
-                AND (
-                    c.name LIKE ?
-                    OR c.email LIKE ?
-                    OR c.phone LIKE ?
-                    OR c.address LIKE ?
-                    OR CAST(c.id AS TEXT) LIKE ?
-                )
-            """
-            like = f"%{search_term}%"
-            params.extend([like] * 5)
+        scope_store_id = None if user["role"] == "admin" else user["store_id"]
 
-        # Finalize query
-        base_query += f"""
-            GROUP BY c.id, c.name, c.phone, c.email, c.address, c.created_at {',' if store_col else ''} {store_col and 's.name'}
-            ORDER BY c.created_at DESC
-        """
-
-        query = base_query.format(store_col=store_col)
+        # Reset to the first page whenever the search changes
+        if st.session_state.get("customers_search") != search_term:
+            st.session_state.customers_search = search_term
+            st.session_state.customers_page = 1
 
         # ── Fetch data ──
-        customers_df = pd.read_sql(query, conn, params=params)
+        total_customers = count_customers(conn, scope_store_id, search_term)
+        total_pages = max(1, -(-total_customers // CUSTOMER_PAGE_SIZE))
+        if st.session_state.get("customers_page", 1) > total_pages:
+            st.session_state.customers_page = total_pages
+        page = st.session_state.get("customers_page", 1)
+
+        customers_df = fetch_customer_page(
+            conn, scope_store_id, search_term, page=page,
+            include_store_name=(user["role"] == "admin")
+        )
+        # Job history for every visible customer in one query
+        recent_jobs = fetch_recent_jobs(conn, customers_df['id'].tolist())
 
         # ── Display ──
         if not customers_df.empty:
-            st.write(f"**Total Customers:** {len(customers_df)}")
+            col1, col2 = st.columns([1, 3])
+            with col1:
+                st.number_input(
+                    f"Page (of {total_pages})", min_value=1, max_value=total_pages,
+                    step=1, key="customers_page"
+                )
+            with col2:
+                st.write(f"**Total Customers:** {total_customers}")
 
-            for _, customer in customers_df.iterrows():
+            for customer in customers_df.to_dict('records'):
                 with st.expander(f"👤 {customer['name']} | 📞 {customer['phone']} | Jobs: {customer['total_jobs']}"):
                     col1, col2 = st.columns(2)
 
@@ -94,21 +79,16 @@ def customers_management():
                     with col2:
                         st.write(f"**Customer Since:** {customer['created_at'][:10]}")
                         st.write(f"**Total Jobs:** {customer['total_jobs']}")
+                        st.write(f"**Lifetime Spend:** ₹{customer['lifetime_spend']:,.2f}")
+                        if pd.notna(customer['last_visit']):
+                            st.write(f"**Last Visit:** {customer['last_visit'][:10]}")
                         if user['role'] == 'admin':
                             st.write(f"**Store:** {customer['store_name']}")
 
                     if customer['total_jobs'] > 0:
                         st.markdown("**📝 Recent Jobs:**")
 
-                        job_history = pd.read_sql("""
-                            SELECT id, device_type, device_model, status, created_at
-                            FROM jobs 
-                            WHERE customer_id = ?
-                            ORDER BY created_at DESC
-                            LIMIT 5
-                        """, conn, params=[customer['id']])
-
-                        for _, job in job_history.iterrows():
+                        for job in recent_jobs[int(customer['id'])]:
                             job_id = job['id']
                             status_class = f"status-{job['status'].lower().replace(' ', '-')}"
                             st.markdown(f'''
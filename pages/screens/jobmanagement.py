@@ -2,7 +2,6 @@ import sys
 import os
 import io
 import streamlit as st
-from PIL import Image
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -63,6 +62,7 @@ def view_job_photos(conn, job_id):
     photos = cursor.fetchall()
     
     if photos:
+        from PIL import Image
         st.markdown(f"### 📸 Photos for Job #{job_id}")
         
         cols = st.columns(min(len(photos), 3))
@@ -1,7 +1,6 @@
 import sys
 import os 
 import json 
-import pandas as pd
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import streamlit as st
 import hashlib
@@ -9,27 +8,22 @@ import time
 import streamlit as st
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from components.datamanager.databasemanger import DatabaseManager
+from components.datamanager.dimensions import get_store_options
 from components.utils.auth import  authenticate_user, create_user
 from components.jobstatusinfo import display_job_info
+from components.datamanager.repairstatus import get_status_service, get_status_rate_limiter
 
 def fetch_job_details(job_id):
     try:
-        db = DatabaseManager()
-        conn = db.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            SELECT j.id, j.device_model, j.problem_description, j.actual_cost, j.status, 
-                   c.name AS customer_name, c.phone AS customer_phone,
-                   s.name AS store_name, s.phone AS store_phone
-            FROM jobs j
-            LEFT JOIN customers c ON j.customer_id = c.id
-            LEFT JOIN stores s ON j.store_id = s.id
-            WHERE j.id = ?
-        ''', (job_id,))
-        result = cursor.fetchone()
-
-        return result
+        # Public lookups are rate limited per client address when Streamlit exposes it
+        client_ip = getattr(st.context, "ip_address", None)
+        if client_ip:
+            allowed, retry_after = get_status_rate_limiter().allow(client_ip)
+            if not allowed:
+                st.warning(f"⏳ Too many lookups. Please try again in {max(1, round(retry_after))} seconds.")
+                return None
+
+        return get_status_service().get(job_id)
 
     except Exception as e:
         st.error("❌ Failed to retrieve job details.")
@@ -140,7 +134,7 @@ def login_signup_page():
                 # Get available stores for selection
                 db = DatabaseManager()
                 conn = db.get_connection()
-                stores = pd.read_sql("SELECT id, name FROM stores", conn)
+                store_options = get_store_options(conn)
                 conn.close()
                 
                 col1, col2 = st.columns(2)
@@ -152,7 +146,6 @@ def login_signup_page():
                 with col2:
                     new_password = st.text_input("Password*", type="password", placeholder="Set password")
                     new_role = st.selectbox("Role*", ["admin", "manager", "staff", "technician"])
-                    store_options = dict(zip(stores['name'], stores['id']))
                     selected_store = st.selectbox("Assign to Store*", list(store_options.keys()))
                     new_store_id = store_options[selected_store]
                 
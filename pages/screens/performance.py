@@ -0,0 +1,151 @@
+import streamlit as st
+import pandas as pd
+import sys
+import os
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.datamanager.querystats import get_query_recorder, ENABLED
+
+SORT_OPTIONS = {
+    "Total time": "total_ms",
+    "p95 latency": "p95_ms",
+    "Calls": "calls",
+    "Lock wait": "lock_ms",
+    "Rows returned": "rows",
+}
+
+
+def performance_page():
+    """Only accessible by admin users"""
+    user = st.session_state.user
+
+    if user['role'] != 'admin':
+        st.error("❌ Access Denied: Admin privileges required")
+        return
+
+    st.markdown('''
+        <div class="main-header">
+            <h1>⏱️ Performance</h1>
+            <p>Database query timings for this server process</p>
+        </div>
+    ''', unsafe_allow_html=True)
+
+    recorder = get_query_recorder()
+
+    if not ENABLED:
+        st.warning("⚠️ Query statistics are disabled (REPAIRPRO_QUERY_STATS=0)")
+        return
+
+    # Snapshot before this page's own queries are recorded
+    queries = pd.DataFrame(recorder.top(limit=None))
+    recent = pd.DataFrame(recorder.recent())
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.caption(f"Collecting since {recorder.started:%Y-%m-%d %H:%M:%S} · "
+                   f"slow-query log: `{recorder.slow_log}` (≥ {recorder.slow_ms:g} ms)")
+    with col2:
+        if st.button("🔄 Reset Statistics", use_container_width=True):
+            recorder.reset()
+            st.rerun()
+
+    if queries.empty:
+        st.info("No queries recorded yet.")
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Queries", f"{int(queries['calls'].sum()):,}")
+    with col2:
+        st.metric("Distinct Queries", f"{len(queries):,}")
+    with col3:
+        st.metric("Total Time", f"{queries['total_ms'].sum() / 1000:,.1f} s")
+    with col4:
+        slow = int((recent['ms'] >= recorder.slow_ms).sum()) if not recent.empty else 0
+        st.metric("Slow (recent)", f"{slow:,}")
+
+    tab1, tab2, tab3 = st.tabs(["🐢 Top Queries", "📄 By Page", "🕒 Recent Slow Queries"])
+
+    with tab1:
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            sort_label = st.selectbox("Sort by", list(SORT_OPTIONS.keys()))
+        with col2:
+            limit = st.number_input("Show", min_value=5, max_value=500, value=25, step=5)
+
+        top = queries.sort_values(SORT_OPTIONS[sort_label], ascending=False).head(int(limit))
+        st.dataframe(
+            top[['fingerprint', 'calls', 'total_ms', 'avg_ms', 'p50_ms', 'p95_ms', 'p99_ms',
+                 'max_ms', 'avg_rows', 'lock_ms', 'errors', 'top_page', 'top_caller']],
+            column_config={
+                "fingerprint": st.column_config.TextColumn("Query", width="large"),
+                "calls": "Calls",
+                "total_ms": st.column_config.NumberColumn("Total (ms)", format="%.1f"),
+                "avg_ms": st.column_config.NumberColumn("Avg (ms)", format="%.2f"),
+                "p50_ms": st.column_config.NumberColumn("p50 (ms)", format="%.2f"),
+                "p95_ms": st.column_config.NumberColumn("p95 (ms)", format="%.2f"),
+                "p99_ms": st.column_config.NumberColumn("p99 (ms)", format="%.2f"),
+                "max_ms": st.column_config.NumberColumn("Max (ms)", format="%.2f"),
+                "avg_rows": st.column_config.NumberColumn("Avg Rows", format="%.1f"),
+                "lock_ms": st.column_config.NumberColumn("Lock Wait (ms)", format="%.1f"),
+                "errors": "Errors",
+                "top_page": "Page",
+                "top_caller": "Caller",
+            },
+            hide_index=True,
+            use_container_width=True
+        )
+        st.caption("Percentiles come from a histogram with 25% wide buckets. Lock wait is the time spent "
+                   "in statements that had to take the write lock (first write of a transaction, COMMIT).")
+
+        selected = st.selectbox("Query details", top['id'].tolist(),
+                                format_func=lambda i: top.loc[top['id'] == i, 'fingerprint'].iloc[0][:120])
+        if selected:
+            st.code(top.loc[top['id'] == selected, 'fingerprint'].iloc[0], language="sql")
+
+    with tab2:
+        if recent.empty:
+            st.info("No recent queries.")
+        else:
+            by_page = recent.groupby('page').agg(
+                queries=('ms', 'size'), total_ms=('ms', 'sum'), max_ms=('ms', 'max'),
+                rows=('rows', lambda r: r.clip(lower=0).sum()), lock_ms=('lock_ms', 'sum')
+            ).sort_values('total_ms', ascending=False).reset_index()
+            st.dataframe(
+                by_page,
+                column_config={
+                    "page": "Page",
+                    "queries": "Queries",
+                    "total_ms": st.column_config.NumberColumn("Total (ms)", format="%.1f"),
+                    "max_ms": st.column_config.NumberColumn("Max (ms)", format="%.2f"),
+                    "rows": "Rows",
+                    "lock_ms": st.column_config.NumberColumn("Lock Wait (ms)", format="%.1f"),
+                },
+                hide_index=True,
+                use_container_width=True
+            )
+            st.caption(f"Based on the last {len(recent):,} queries.")
+
+    with tab3:
+        slow_recent = recent[recent['ms'] >= recorder.slow_ms] if not recent.empty else recent
+        if slow_recent.empty:
+            st.success(f"✅ No recent queries slower than {recorder.slow_ms:g} ms")
+        else:
+            slow_recent = slow_recent.merge(queries[['id', 'fingerprint']], on='id', how='left')
+            slow_recent['at'] = slow_recent['at'].map(datetime.fromtimestamp)
+            st.dataframe(
+                slow_recent.sort_values('at', ascending=False)[
+                    ['at', 'ms', 'rows', 'lock_ms', 'page', 'caller', 'error', 'fingerprint']],
+                column_config={
+                    "at": st.column_config.DatetimeColumn("Time", format="YYYY-MM-DD HH:mm:ss"),
+                    "ms": st.column_config.NumberColumn("Duration (ms)", format="%.1f"),
+                    "rows": "Rows",
+                    "lock_ms": st.column_config.NumberColumn("Lock Wait (ms)", format="%.1f"),
+                    "page": "Page",
+                    "caller": "Caller",
+                    "error": "Error",
+                    "fingerprint": st.column_config.TextColumn("Query", width="large"),
+                },
+                hide_index=True,
+                use_container_width=True
+            )
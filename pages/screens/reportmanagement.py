@@ -8,16 +8,10 @@ from components.datamanager.databasemanger import DatabaseManager
 from components.report.adminanalytics import admin_analytics
 from components.report.manageranalytics import manager_analytics
 from components.report.techniciananalytics import technician_analytics
+from components.report.reportcache import get_report_service, match_standard_period
+from components.report.daterange import day_range
+from components.report.frames import read_row, rate
 import io 
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-
-def validate_numeric_data(df, numeric_columns):
-    """Ensure specified columns are numeric, converting if necessary"""
-    for col in numeric_columns:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-    return df
 
 
 def reports_management():
@@ -56,8 +50,6 @@ def reports_management():
     if user['role'] == 'admin':
         admin_analytics(conn, start_date_str, end_date_str, user)
         # Get selected store for export
-        stores = pd.read_sql("SELECT id, name FROM stores", conn)
-        store_options = dict(zip(stores['name'], stores['id']))
         selected_store = st.session_state.get('selected_store', "All Stores")
         
     elif user['role'] == 'manager':
@@ -76,7 +68,10 @@ def reports_management():
 
 def export_comprehensive_report(conn, user, start_date_str, end_date_str, selected_store=None):
     """Export comprehensive business report as PDF"""
-    
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+    day_keys = day_range(start_date_str, end_date_str)
+
     buffer = io.BytesIO()
     c = canvas.Canvas(buffer, pagesize=letter)
     width, height = letter
@@ -99,13 +94,13 @@ def export_comprehensive_report(conn, user, start_date_str, end_date_str, select
     # Role-specific content
     if user['role'] == 'admin':
         # Get summary statistics for admin
-        where_clause = "j.created_at BETWEEN ? AND ?"
-        params = [start_date_str, end_date_str]
+        where_clause = "j.created_day >= ? AND j.created_day < ?"
+        params = list(day_keys)
         
         summary_query = f"""
             SELECT 
                 COUNT(*) as total_jobs,
-                SUM(CASE WHEN status = 'Completed' THEN 1 ELSE 0 END) as completed_jobs,
+                COALESCE(SUM(CASE WHEN status = 'Completed' THEN 1 ELSE 0 END), 0) as completed_jobs,
                 SUM(CASE WHEN status = 'Completed' THEN actual_cost ELSE 0 END) as total_revenue,
                 COUNT(DISTINCT store_id) as active_stores,
                 COUNT(DISTINCT customer_id) as unique_customers
@@ -113,7 +108,7 @@ def export_comprehensive_report(conn, user, start_date_str, end_date_str, select
             WHERE {where_clause}
         """
         
-        summary = pd.read_sql(summary_query, conn, params=params).iloc[0]
+        summary = read_row(conn, summary_query, params)
         
         c.setFont("Helvetica-Bold", 14)
         c.drawString(50, y_position, "Executive Summary")
@@ -125,8 +120,7 @@ def export_comprehensive_report(conn, user, start_date_str, end_date_str, select
         c.drawString(70, y_position, f"• Jobs Completed: {summary['completed_jobs']:,}")
         y_position -= 20
         
-        revenue = summary['total_revenue'] if summary['total_revenue'] else 0
-        c.drawString(70, y_position, f"• Total Revenue: ₹{revenue:,.2f}")
+        c.drawString(70, y_position, f"• Total Revenue: ₹{summary['total_revenue']:,.2f}")
         y_position -= 20
         c.drawString(70, y_position, f"• Active Stores: {summary['active_stores']:,}")
         y_position -= 20
@@ -134,26 +128,26 @@ def export_comprehensive_report(conn, user, start_date_str, end_date_str, select
         y_position -= 40
         
         # Completion rate
-        completion_rate = (summary['completed_jobs'] / summary['total_jobs'] * 100) if summary['total_jobs'] > 0 else 0
+        completion_rate = rate(summary['completed_jobs'], summary['total_jobs'])
         c.drawString(70, y_position, f"• Overall Completion Rate: {completion_rate:.1f}%")
         y_position -= 40
         
     elif user['role'] == 'manager':
         # Manager-specific summary
-        where_clause = "j.created_at BETWEEN ? AND ? AND j.store_id = ?"
-        params = [start_date_str, end_date_str, user['store_id']]
+        where_clause = "j.created_day >= ? AND j.created_day < ? AND j.store_id = ?"
+        params = [*day_keys, user['store_id']]
         
         store_summary_query = f"""
             SELECT 
                 COUNT(*) as total_jobs,
-                SUM(CASE WHEN status = 'Completed' THEN 1 ELSE 0 END) as completed_jobs,
+                COALESCE(SUM(CASE WHEN status = 'Completed' THEN 1 ELSE 0 END), 0) as completed_jobs,
                 SUM(CASE WHEN status = 'Completed' THEN actual_cost ELSE 0 END) as total_revenue,
                 COUNT(DISTINCT customer_id) as unique_customers
             FROM jobs j
             WHERE {where_clause}
         """
         
-        summary = pd.read_sql(store_summary_query, conn, params=params).iloc[0]
+        summary = read_row(conn, store_summary_query, params)
         
         c.setFont("Helvetica-Bold", 14)
         c.drawString(50, y_position, "Store Performance Summary")
@@ -163,8 +157,7 @@ def export_comprehensive_report(conn, user, start_date_str, end_date_str, select
         c.drawString(70, y_position, f"• Store Jobs: {summary['total_jobs']:,}")
         y_position -= 20
         
-        revenue = summary['total_revenue'] if summary['total_revenue'] else 0
-        c.drawString(70, y_position, f"• Store Revenue: ₹{revenue:,.2f}")
+        c.drawString(70, y_position, f"• Store Revenue: ₹{summary['total_revenue']:,.2f}")
         y_position -= 20
         c.drawString(70, y_position, f"• Store Customers: {summary['unique_customers']:,}")
         y_position -= 40
@@ -175,16 +168,15 @@ def export_comprehensive_report(conn, user, start_date_str, end_date_str, select
             SELECT 
                 COUNT(DISTINCT aj.job_id) as jobs_handled,
                 COUNT(DISTINCT ta.id) as total_assignments,
-                SUM(CASE WHEN ta.status = 'completed' THEN 1 ELSE 0 END) as completed_assignments,
+                COALESCE(SUM(CASE WHEN ta.status = 'completed' THEN 1 ELSE 0 END), 0) as completed_assignments,
                 SUM(CASE WHEN j.status = 'Completed' THEN j.actual_cost ELSE 0 END) as revenue_generated
             FROM technician_assignments ta
             JOIN assignment_jobs aj ON ta.id = aj.assignment_id
             JOIN jobs j ON aj.job_id = j.id
-            WHERE ta.technician_id = ? AND ta.assigned_at BETWEEN ? AND ?
+            WHERE ta.technician_id = ? AND ta.assigned_day >= ? AND ta.assigned_day < ?
         """
         
-        summary = pd.read_sql(tech_summary_query, conn, 
-                             params=[user['id'], start_date_str, end_date_str]).iloc[0]
+        summary = read_row(conn, tech_summary_query, [user['id'], *day_keys])
         
         c.setFont("Helvetica-Bold", 14)
         c.drawString(50, y_position, "Personal Performance Summary")
@@ -196,8 +188,7 @@ def export_comprehensive_report(conn, user, start_date_str, end_date_str, select
         c.drawString(70, y_position, f"• Assignments Completed: {summary['completed_assignments']:,}")
         y_position -= 20
         
-        revenue = summary['revenue_generated'] if summary['revenue_generated'] else 0
-        c.drawString(70, y_position, f"• Revenue Generated: ₹{revenue:,.2f}")
+        c.drawString(70, y_position, f"• Revenue Generated: ₹{summary['revenue_generated']:,.2f}")
         y_position -= 40
     
     # Add device analytics section
@@ -207,21 +198,21 @@ def export_comprehensive_report(conn, user, start_date_str, end_date_str, select
     
     # Get device type distribution
     if user['role'] == 'admin':
-        device_query = "SELECT device_type, COUNT(*) as count FROM jobs j WHERE j.created_at BETWEEN ? AND ? GROUP BY device_type ORDER BY count DESC LIMIT 5"
-        device_params = [start_date_str, end_date_str]
+        device_query = "SELECT device_type, COUNT(*) as count FROM jobs j WHERE j.created_day >= ? AND j.created_day < ? GROUP BY device_type ORDER BY count DESC LIMIT 5"
+        device_params = list(day_keys)
     elif user['role'] == 'manager':
-        device_query = "SELECT device_type, COUNT(*) as count FROM jobs j WHERE j.created_at BETWEEN ? AND ? AND j.store_id = ? GROUP BY device_type ORDER BY count DESC LIMIT 5"
-        device_params = [start_date_str, end_date_str, user['store_id']]
+        device_query = "SELECT device_type, COUNT(*) as count FROM jobs j WHERE j.created_day >= ? AND j.created_day < ? AND j.store_id = ? GROUP BY device_type ORDER BY count DESC LIMIT 5"
+        device_params = [*day_keys, user['store_id']]
     else:  # technician
         device_query = """
             SELECT j.device_type, COUNT(*) as count 
             FROM jobs j
             JOIN assignment_jobs aj ON j.id = aj.job_id
             JOIN technician_assignments ta ON aj.assignment_id = ta.id
-            WHERE ta.technician_id = ? AND ta.assigned_at BETWEEN ? AND ?
+            WHERE ta.technician_id = ? AND ta.assigned_day >= ? AND ta.assigned_day < ?
             GROUP BY j.device_type ORDER BY count DESC LIMIT 5
         """
-        device_params = [user['id'], start_date_str, end_date_str]
+        device_params = [user['id'], *day_keys]
     
     device_data = pd.read_sql(device_query, conn, params=device_params)
     
@@ -229,12 +220,12 @@ def export_comprehensive_report(conn, user, start_date_str, end_date_str, select
     c.drawString(70, y_position, "Top Device Types:")
     y_position -= 20
     
-    for _, row in device_data.iterrows():
+    for row in device_data.to_dict('records'):
         c.drawString(90, y_position, f"• {row['device_type']}: {row['count']} jobs")
         y_position -= 15
     
     # Footer
-    c.setFont("Helvetica-Italic", 10)
+    c.setFont("Helvetica-Oblique", 10)
     c.drawString(50, 50, "This report is generated automatically by RepairPro Analytics System")
     c.drawString(50, 35, f"For questions or support, contact your system administrator")
     
@@ -245,20 +236,32 @@ def export_comprehensive_report(conn, user, start_date_str, end_date_str, select
 
 def add_export_functionality(conn, user, start_date_str, end_date_str, selected_store=None):
     """Add export functionality to the analytics dashboard"""
-    
+    day_keys = day_range(start_date_str, end_date_str)
+
     st.markdown("---")
     st.markdown("### 📄 Export Reports")
     
+    # Keep today/week/month reports for this user pre-rendered in the background
+    report_service = get_report_service()
+    report_service.schedule(user, selected_store)
+    
     col1, col2, col3 = st.columns(3)
     
     with col1:
         if st.button("📊 Export Analytics Report"):
             try:
-                pdf_buffer = export_comprehensive_report(conn, user, start_date_str, end_date_str, selected_store)
+                pdf_buffer, from_cache = report_service.get_report(
+                    conn, user, start_date_str, end_date_str, selected_store
+                )
                 
                 filename = f"RepairPro_Analytics_{user['role']}_{start_date_str}_to_{end_date_str}.pdf"
                 
                 st.success("✅ Report generated successfully!")
+                if from_cache:
+                    period = match_standard_period(start_date_str, end_date_str)
+                    rendered_at = report_service.cached_at(user, start_date_str, end_date_str, selected_store)
+                    label = f"{period} report" if period else "report"
+                    st.caption(f"⚡ Served pre-rendered {label} (rendered {rendered_at.strftime('%H:%M:%S')}, data unchanged since)")
                 st.download_button(
                     label="⬇️ Download PDF Report",
                     data=pdf_buffer,
@@ -280,20 +283,20 @@ def add_export_functionality(conn, user, start_date_str, end_date_str, selected_
                         FROM jobs j
                         LEFT JOIN customers c ON j.customer_id = c.id
                         LEFT JOIN stores s ON j.store_id = s.id
-                        WHERE j.created_at BETWEEN ? AND ?
+                        WHERE j.created_day >= ? AND j.created_day < ?
                         ORDER BY j.created_at DESC
                     """
-                    export_params = [start_date_str, end_date_str]
+                    export_params = list(day_keys)
                     
                 elif user['role'] == 'manager':
                     export_query = """
                         SELECT j.*, c.name as customer_name, c.phone as customer_phone
                         FROM jobs j
                         LEFT JOIN customers c ON j.customer_id = c.id
-                        WHERE j.created_at BETWEEN ? AND ? AND j.store_id = ?
+                        WHERE j.created_day >= ? AND j.created_day < ? AND j.store_id = ?
                         ORDER BY j.created_at DESC
                     """
-                    export_params = [start_date_str, end_date_str, user['store_id']]
+                    export_params = [*day_keys, user['store_id']]
                     
                 else:  # technician
                     export_query = """
@@ -302,12 +305,13 @@ def add_export_functionality(conn, user, start_date_str, end_date_str, selected_
                         LEFT JOIN customers c ON j.customer_id = c.id
                         JOIN assignment_jobs aj ON j.id = aj.job_id
                         JOIN technician_assignments ta ON aj.assignment_id = ta.id
-                        WHERE ta.technician_id = ? AND ta.assigned_at BETWEEN ? AND ?
+                        WHERE ta.technician_id = ? AND ta.assigned_day >= ? AND ta.assigned_day < ?
                         ORDER BY ta.assigned_at DESC
                     """
-                    export_params = [user['id'], start_date_str, end_date_str]
+                    export_params = [user['id'], *day_keys]
                 
                 export_data = pd.read_sql(export_query, conn, params=export_params)
+                export_data = export_data.drop(columns=list(DatabaseManager.TIME_KEYS['jobs']), errors='ignore')
                 
                 if not export_data.empty:
                     csv_buffer = io.StringIO()
@@ -342,9 +346,9 @@ def add_export_functionality(conn, user, start_date_str, end_date_str, selected_
                             COUNT(DISTINCT customer_id) as customers,
                             SUM(CASE WHEN status = 'Completed' THEN actual_cost ELSE 0 END) as revenue
                         FROM jobs 
-                        WHERE created_at BETWEEN ? AND ?
+                        WHERE created_day >= ? AND created_day < ?
                     """
-                    summary_params = [start_date_str, end_date_str]
+                    summary_params = list(day_keys)
                     
                 elif user['role'] == 'manager':
                     summary_query = """
@@ -353,9 +357,9 @@ def add_export_functionality(conn, user, start_date_str, end_date_str, selected_
                             COUNT(DISTINCT customer_id) as customers,
                             SUM(CASE WHEN status = 'Completed' THEN actual_cost ELSE 0 END) as revenue
                         FROM jobs 
-                        WHERE created_at BETWEEN ? AND ? AND store_id = ?
+                        WHERE created_day >= ? AND created_day < ? AND store_id = ?
                     """
-                    summary_params = [start_date_str, end_date_str, user['store_id']]
+                    summary_params = [*day_keys, user['store_id']]
                     
                 else:  # technician
                     summary_query = """
@@ -365,11 +369,11 @@ def add_export_functionality(conn, user, start_date_str, end_date_str, selected_
                         FROM technician_assignments ta
                         JOIN assignment_jobs aj ON ta.id = aj.assignment_id
                         JOIN jobs j ON aj.job_id = j.id
-                        WHERE ta.technician_id = ? AND ta.assigned_at BETWEEN ? AND ?
+                        WHERE ta.technician_id = ? AND ta.assigned_day >= ? AND ta.assigned_day < ?
                     """
-                    summary_params = [user['id'], start_date_str, end_date_str]
+                    summary_params = [user['id'], *day_keys]
                 
-                summary = pd.read_sql(summary_query, conn, params=summary_params).iloc[0]
+                summary = read_row(conn, summary_query, summary_params)
                 
                 # Display quick summary
                 st.success("📊 Quick Summary Generated!")
@@ -5,6 +5,7 @@ import os
 from datetime import datetime
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from components.datamanager.databasemanger import DatabaseManager
+from components.datamanager.dimensions import get_store_options
 from components.utils.auth import hash_password, verify_password, create_user
 
 def settings_page():
@@ -125,11 +126,10 @@ def settings_page():
             # Different permissions for admin vs manager
             if user['role'] == 'admin':
                 allowed_roles = ['admin', 'manager', 'staff', 'technician']
-                stores = pd.read_sql("SELECT id, name FROM stores", conn)
+                store_options = get_store_options(conn)
             else:  # manager
                 allowed_roles = ['staff', 'technician']
-                stores = pd.read_sql("SELECT id, name FROM stores WHERE id = ?", 
-                                   conn, params=[user['store_id']])
+                store_options = get_store_options(conn, user['store_id'])
             
             # Create new user form
             with st.expander("➕ Create New User", expanded=False):
@@ -145,9 +145,9 @@ def settings_page():
                         new_role = st.selectbox("Role*", allowed_roles)
                         new_password = st.text_input("Password*", type="password")
                         if user['role'] == 'admin':
-                            new_store = st.selectbox("Store", stores['name'], index=0)
+                            new_store = st.selectbox("Store", list(store_options), index=0)
                         else:
-                            new_store = stores.iloc[0]['name']
+                            new_store = next(iter(store_options))
                     
                     create_button = st.form_submit_button("👤 Create User", use_container_width=True)
                     
@@ -156,7 +156,7 @@ def settings_page():
                             st.error("⚠️ Please fill all required fields (*)")
                         else:
                             try:
-                                store_id = stores[stores['name'] == new_store].iloc[0]['id']
+                                store_id = store_options[new_store]
                                 create_user(
                                     conn=conn,
                                     username=new_username,
@@ -2,10 +2,10 @@ import sys
 import os
 import pandas as pd
 import streamlit as st
-import plotly.express as px
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from components.datamanager.databasemanger import DatabaseManager
+from components.report.daterange import today_key
 
 
 def staff_dashboard():
@@ -35,8 +35,8 @@ def staff_dashboard():
     ).iloc[0]['count']
 
     completed_today = pd.read_sql(
-        "SELECT COUNT(*) as count FROM jobs WHERE status = 'Completed' AND DATE(completed_at) = DATE('now') AND store_id = ?",
-        conn, params=[user['store_id']]
+        "SELECT COUNT(*) as count FROM jobs WHERE status = 'Completed' AND completed_day = ? AND store_id = ?",
+        conn, params=[today_key(), user['store_id']]
     ).iloc[0]['count']
 
     total_revenue = pd.read_sql(
@@ -8,6 +8,12 @@ from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from components.datamanager.databasemanger import DatabaseManager
+from components.datamanager.dimensions import get_store_options
+from components.report.daterange import day_key, day_range, days_ago_key, month_start_key
+from components.report.frames import read_frame, rate, money
+from components.report.figurecache import cached_figures
+from components.utils.profiler import profile_section
+from components.datamanager.technicianworkload import get_technician_workload
 
 def store_management():
     """Only accessible by admin users"""
@@ -37,27 +43,38 @@ def store_management():
     db = DatabaseManager()
     conn = db.get_connection()
     
-    with tab1:
+    with tab1, profile_section("View Stores"):
         st.markdown("### Store Directory")
         
+        # Aggregate each table per store first; joining them directly multiplies rows
+        # (jobs x customers x staff) and inflates the revenue sum
         stores_query = """
             SELECT s.id, s.name, s.location, s.phone, s.email, s.created_at,
-                   COUNT(DISTINCT u.id) as staff_count,
-                   COUNT(DISTINCT j.id) as total_jobs,
-                   COUNT(DISTINCT c.id) as total_customers,
-                   COALESCE(SUM(CASE WHEN j.status = 'Completed' THEN j.actual_cost ELSE 0 END), 0) as total_revenue
+                   COALESCE(u.staff_count, 0) as staff_count,
+                   COALESCE(j.total_jobs, 0) as total_jobs,
+                   COALESCE(c.total_customers, 0) as total_customers,
+                   COALESCE(j.total_revenue, 0) as total_revenue
             FROM stores s
-            LEFT JOIN users u ON s.id = u.store_id AND u.role = 'staff'
-            LEFT JOIN jobs j ON s.id = j.store_id
-            LEFT JOIN customers c ON s.id = c.store_id
-            GROUP BY s.id, s.name, s.location, s.phone, s.email, s.created_at
+            LEFT JOIN (
+                SELECT store_id, COUNT(*) as staff_count
+                FROM users WHERE role = 'staff' GROUP BY store_id
+            ) u ON u.store_id = s.id
+            LEFT JOIN (
+                SELECT store_id, COUNT(*) as total_jobs,
+                       SUM(CASE WHEN status = 'Completed' THEN actual_cost ELSE 0 END) as total_revenue
+                FROM jobs GROUP BY store_id
+            ) j ON j.store_id = s.id
+            LEFT JOIN (
+                SELECT store_id, COUNT(*) as total_customers
+                FROM customers GROUP BY store_id
+            ) c ON c.store_id = s.id
             ORDER BY s.created_at ASC
         """
         
         stores_df = pd.read_sql(stores_query, conn)
         
         if not stores_df.empty:
-            for _, store in stores_df.iterrows():
+            for store in stores_df.to_dict('records'):
                 with st.expander(f"🏪 {store['name']} - {store['location']}"):
                     col1, col2, col3 = st.columns(3)
                     
@@ -82,8 +99,8 @@ def store_management():
                         # Recent activity
                         recent_jobs = pd.read_sql("""
                             SELECT COUNT(*) as count FROM jobs 
-                            WHERE store_id = ? AND DATE(created_at) >= DATE('now', '-7 days')
-                        """, conn, params=[store['id']]).iloc[0]['count']
+                            WHERE store_id = ? AND created_day >= ?
+                        """, conn, params=[store['id'], days_ago_key(7)]).iloc[0]['count']
                         
                         st.metric("Jobs (Last 7 Days)", recent_jobs)
                     
@@ -97,13 +114,13 @@ def store_management():
                     
                     if not store_staff.empty:
                         st.markdown("**Store Staff:**")
-                        for _, staff in store_staff.iterrows():
-                            last_login = staff['last_login'][:10] if staff['last_login'] else 'Never'
+                        for staff in store_staff.to_dict('records'):
+                            last_login = str(staff['last_login'])[:10] if pd.notna(staff['last_login']) else 'Never'
                             st.write(f"👨‍🔧 {staff['full_name']} ({staff['email']}) - Last login: {last_login}")
         else:
             st.info("No stores found")
     
-    with tab2:
+    with tab2, profile_section("Add Store"):
         st.markdown("### ➕ Add New Store")
 
         with st.form("new_store_form"):
@@ -147,22 +164,32 @@ def store_management():
                 else:
                     st.error("⚠️ Please fill in required fields (Name and Location)")
 
-    with tab3:
+    with tab3, profile_section("Store Analytics"):
         st.markdown("### Store Performance Analytics")
         
         # Store comparison metrics
         store_metrics = pd.read_sql("""
             SELECT s.name as store_name,
-                   COUNT(DISTINCT j.id) as total_jobs,
-                   COUNT(DISTINCT CASE WHEN j.status = 'Completed' THEN j.id END) as completed_jobs,
-                   COUNT(DISTINCT CASE WHEN j.status = 'In Progress' THEN j.id END) as in_progress_jobs,
-                   COUNT(DISTINCT c.id) as total_customers,
-                   COALESCE(SUM(CASE WHEN j.status = 'Completed' THEN j.actual_cost ELSE 0 END), 0) as total_revenue,
-                   COALESCE(AVG(CASE WHEN j.status = 'Completed' THEN j.actual_cost ELSE NULL END), 0) as avg_job_value
+                   COALESCE(j.total_jobs, 0) as total_jobs,
+                   COALESCE(j.completed_jobs, 0) as completed_jobs,
+                   COALESCE(j.in_progress_jobs, 0) as in_progress_jobs,
+                   COALESCE(c.total_customers, 0) as total_customers,
+                   COALESCE(j.total_revenue, 0) as total_revenue,
+                   COALESCE(j.avg_job_value, 0) as avg_job_value
             FROM stores s
-            LEFT JOIN jobs j ON s.id = j.store_id
-            LEFT JOIN customers c ON s.id = c.store_id
-            GROUP BY s.id, s.name
+            LEFT JOIN (
+                SELECT store_id,
+                       COUNT(*) as total_jobs,
+                       SUM(status = 'Completed') as completed_jobs,
+                       SUM(status = 'In Progress') as in_progress_jobs,
+                       SUM(CASE WHEN status = 'Completed' THEN actual_cost ELSE 0 END) as total_revenue,
+                       AVG(CASE WHEN status = 'Completed' THEN actual_cost ELSE NULL END) as avg_job_value
+                FROM jobs GROUP BY store_id
+            ) j ON j.store_id = s.id
+            LEFT JOIN (
+                SELECT store_id, COUNT(*) as total_customers
+                FROM customers GROUP BY store_id
+            ) c ON c.store_id = s.id
             ORDER BY total_revenue DESC
         """, conn)
         
@@ -180,7 +207,7 @@ def store_management():
                 
             with col2:
                 st.markdown("#### Job Completion Rate")
-                store_metrics['completion_rate'] = (store_metrics['completed_jobs'] / store_metrics['total_jobs']) * 100
+                store_metrics['completion_rate'] = rate(store_metrics['completed_jobs'], store_metrics['total_jobs'])
                 fig = px.bar(store_metrics, x='store_name', y='completion_rate',
                             title="Job Completion Rate (%)",
                             color='store_name',
@@ -193,17 +220,17 @@ def store_management():
             # Monthly trends for selected store
             selected_store = st.selectbox("Select Store for Detailed Analysis", store_metrics['store_name'].tolist())
             
-            store_id = pd.read_sql("SELECT id FROM stores WHERE name = ?", conn, params=[selected_store]).iloc[0]['id']
+            store_id = get_store_options(conn)[selected_store]
             
             # Monthly revenue trend
             monthly_revenue = pd.read_sql("""
-                SELECT strftime('%Y-%m', completed_at) as month,
+                SELECT strftime('%Y-%m', MIN(completed_at)) as month,
                        SUM(actual_cost) as revenue,
                        COUNT(*) as jobs_completed
                 FROM jobs
                 WHERE store_id = ? AND status = 'Completed' AND completed_at IS NOT NULL
-                GROUP BY strftime('%Y-%m', completed_at)
-                ORDER BY month
+                GROUP BY completed_month
+                ORDER BY completed_month
             """, conn, params=[store_id])
             
             if not monthly_revenue.empty:
@@ -227,7 +254,7 @@ def store_management():
         else:
             st.info("No store performance data available")
     
-    with tab4:
+    with tab4, profile_section("Device Analytics"):
         st.markdown("### Device Types Analytics")
         
         # Device type distribution across all stores
@@ -311,9 +338,8 @@ def store_management():
                 'total_revenue': 'sum'
             }).reset_index()
             
-            device_analysis['completion_rate'] = (device_analysis['completed_count'] / device_analysis['job_count'] * 100).round(2)
-            device_analysis['avg_repair_cost'] = device_analysis['avg_repair_cost']
-            device_analysis['total_revenue'] = device_analysis['total_revenue'].round(2)
+            device_analysis['completion_rate'] = rate(device_analysis['completed_count'], device_analysis['job_count'], 2)
+            device_analysis['total_revenue'] = money(device_analysis['total_revenue'])
             
             device_analysis = device_analysis.sort_values('total_revenue', ascending=False)
             
@@ -334,7 +360,7 @@ def store_management():
         else:
             st.info("No device data available for analysis")
     
-    with tab5:
+    with tab5, profile_section("Repair Analytics"):
         st.markdown("### Repair Analytics")
         
         # Repair success rates and performance metrics
@@ -391,7 +417,7 @@ def store_management():
             
             if 'Completed' in store_success.columns:
                 store_success['total_jobs'] = store_success.sum(axis=1)
-                store_success['success_rate'] = (store_success['Completed'] / store_success['total_jobs'] * 100).round(2)
+                store_success['success_rate'] = rate(store_success['Completed'], store_success['total_jobs'], 2)
                 
                 fig = px.bar(store_success.reset_index(), 
                            x='store_name', y='success_rate',
@@ -465,15 +491,15 @@ def store_management():
             # Monthly repair trends
             st.markdown("#### Monthly Repair Trends")
             monthly_repairs = pd.read_sql("""
-                SELECT strftime('%Y-%m', created_at) as month,
+                SELECT strftime('%Y-%m', MIN(created_at)) as month,
                        status,
                        COUNT(*) as job_count,
                        SUM(actual_cost) as revenue
                 FROM jobs
-                WHERE created_at >= date('now', '-12 months')
-                GROUP BY strftime('%Y-%m', created_at), status
-                ORDER BY month
-            """, conn)
+                WHERE created_day >= ?
+                GROUP BY created_month, status
+                ORDER BY created_month
+            """, conn, params=[month_start_key(12)])
             
             if not monthly_repairs.empty:
                 fig = px.line(monthly_repairs, x='month', y='job_count',
@@ -483,7 +509,7 @@ def store_management():
         else:
             st.info("No repair data available for analysis")
 
-    with tab6:
+    with tab6, profile_section("Technician Analytics"):
         st.markdown("### 👨‍🔧 Technician Analytics")
         
         # Technician performance overview
@@ -508,50 +534,47 @@ def store_management():
         with col2:
             # Store filter for technician analysis
             st.markdown("#### Filter by Store")
-            all_stores_tech = pd.read_sql("SELECT id, name FROM stores ORDER BY name", conn)
-            store_options = ["All Stores"] + all_stores_tech['name'].tolist()
+            all_stores_tech = dict(sorted(get_store_options(conn).items()))
+            store_options = ["All Stores"] + list(all_stores_tech)
             selected_store_tech = st.selectbox("Select Store", store_options, key="tech_store_filter")
         
-        # Build the technician query with filters
-        tech_base_query = """
-            SELECT u.id as technician_id, u.full_name as technician_name, u.email,
-                   s.name as store_name,
-                   COUNT(DISTINCT j.id) as total_jobs,
-                   COUNT(DISTINCT CASE WHEN j.status = 'Completed' THEN j.id END) as completed_jobs,
-                   COUNT(DISTINCT CASE WHEN j.status = 'In Progress' THEN j.id END) as in_progress_jobs,
-                   COUNT(DISTINCT CASE WHEN j.status = 'Failed' THEN j.id END) as failed_jobs,
-                   COALESCE(SUM(CASE WHEN j.status = 'Completed' THEN j.actual_cost ELSE 0 END), 0) as total_revenue,
-                   COALESCE(AVG(CASE WHEN j.status = 'Completed' THEN j.actual_cost END), 0) as avg_job_value,
-                   AVG(CASE 
-                       WHEN j.completed_at IS NOT NULL AND j.started_at IS NOT NULL 
-                       THEN (julianday(j.completed_at) - julianday(j.started_at))
-                       ELSE NULL 
-                   END) as avg_completion_time,
-                   u.last_login
-            FROM users u
-            LEFT JOIN stores s ON u.store_id = s.id
-            LEFT JOIN jobs j ON u.id = j.assigned_by
-            WHERE u.role IN ('staff', 'technician')
-        """
-        
-        # Add date filter
-        tech_base_query += f" AND (j.created_at IS NULL OR j.created_at BETWEEN '{start_date}' AND '{end_date}')"
-        
-        # Add store filter
-        if selected_store_tech != "All Stores":
-            store_id_tech = all_stores_tech[all_stores_tech['name'] == selected_store_tech]['id'].iloc[0]
-            tech_base_query += f" AND u.store_id = {store_id_tech}"
+        # Totals come from the technician_daily_stats cube; the query and the grid are
+        # cached until the cube, users or stores change
+        tech_low, tech_high = day_range(start_date, end_date)
+        tech_store_id = all_stores_tech.get(selected_store_tech)
         
-        tech_base_query += """
-            GROUP BY u.id, u.full_name, u.email, s.name, u.last_login
-            ORDER BY completed_jobs DESC
-        """
-        
-        technician_data = pd.read_sql(tech_base_query, conn)
-        
-        if not technician_data.empty:
-            # Main technician performance chart
-            st.markdown("#### 👨‍🔧 Technician vs Number of Jobs Repaired")
+        def build_technician_overview(conn):
+            tech_params = [tech_low, tech_high]
+            tech_base_query = """
+                SELECT u.id as technician_id, u.full_name as technician_name, u.email,
+                       s.name as store_name,
+                       COALESCE(SUM(ts.jobs), 0) as total_jobs,
+                       COALESCE(SUM(ts.completed_jobs), 0) as completed_jobs,
+                       COALESCE(SUM(ts.in_progress_jobs), 0) as in_progress_jobs,
+                       COALESCE(SUM(ts.failed_jobs), 0) as failed_jobs,
+                       COALESCE(SUM(ts.revenue), 0) as total_revenue,
+                       COALESCE(SUM(ts.revenue) / NULLIF(SUM(ts.completed_jobs), 0), 0) as avg_job_value,
+                       SUM(ts.job_hours) / NULLIF(SUM(ts.timed_jobs), 0) / 24 as avg_completion_time
+                FROM users u
+                LEFT JOIN stores s ON u.store_id = s.id
+                LEFT JOIN technician_daily_stats ts ON ts.technician_id = u.id
+                    AND ts.day >= ? AND ts.day < ?
+                WHERE u.role = 'technician'
+            """
+            
+            # Add store filter
+            if tech_store_id is not None:
+                tech_base_query += " AND u.store_id = ?"
+                tech_params.append(tech_store_id)
+            
+            tech_base_query += """
+                GROUP BY u.id, u.full_name, u.email, s.name
+                ORDER BY completed_jobs DESC
+            """
+            
+            technician_data = read_frame(conn, tech_base_query, tech_params)
+            if technician_data.empty:
+                return technician_data, None
             
             # Create a comprehensive technician performance chart
             fig = make_subplots(
@@ -594,15 +617,15 @@ def store_management():
             )
             
             # Success rate calculation and chart
-            tech_sorted['success_rate'] = (tech_sorted['completed_jobs'] / tech_sorted['total_jobs'] * 100).fillna(0)
+            success_rate = rate(tech_sorted['completed_jobs'], tech_sorted['total_jobs'])
             fig.add_trace(
                 go.Bar(
-                    x=tech_sorted['success_rate'],
+                    x=success_rate,
                     y=tech_sorted['technician_name'],
                     orientation='h',
                     name='Success Rate',
                     marker_color='orange',
-                    text=[f'{x:.1f}%' for x in tech_sorted['success_rate']],
+                    text=[f'{x:.1f}%' for x in success_rate],
                     textposition='outside'
                 ),
                 row=2, col=1
@@ -627,19 +650,28 @@ def store_management():
                 showlegend=False,
                 title_text="Comprehensive Technician Performance Dashboard"
             )
-            
+            return technician_data, fig
+        
+        technician_data, fig = cached_figures(
+            conn, 'stores.technician_overview', (tech_low, tech_high, tech_store_id),
+            ('technician_daily_stats', 'users', 'stores'), build_technician_overview,
+        )
+        
+        if not technician_data.empty:
+            # Main technician performance chart
+            st.markdown("#### 👨‍🔧 Technician vs Number of Jobs Repaired")
             st.plotly_chart(fig, use_container_width=True)
             
             # Detailed technician comparison table
             st.markdown("#### Detailed Technician Performance")
             
-            # Prepare data for display
+            # Prepare data for display; last_login is read fresh, it does not move the users version
             display_data = technician_data.copy()
-            display_data['success_rate'] = (display_data['completed_jobs'] / display_data['total_jobs'] * 100).fillna(0).round(1)
+            last_logins = dict(conn.execute("SELECT id, last_login FROM users WHERE role = 'technician'").fetchall())
+            display_data['last_login'] = display_data['technician_id'].map(last_logins)
+            display_data['success_rate'] = rate(display_data['completed_jobs'], display_data['total_jobs'], 1)
             display_data['avg_completion_time'] = display_data['avg_completion_time'].fillna(0).round(1)
-            display_data['last_login_formatted'] = display_data['last_login'].apply(
-                lambda x: x[:10] if x else 'Never'
-            )
+            display_data['last_login_formatted'] = display_data['last_login'].astype('string').str[:10].fillna('Never')
             
             # Display the dataframe with custom formatting
             st.dataframe(
@@ -670,14 +702,14 @@ def store_management():
             with col1:
                 st.markdown("**Most Jobs Completed**")
                 top_jobs = technician_data.nlargest(3, 'completed_jobs')
-                for i, (_, tech) in enumerate(top_jobs.iterrows()):
+                for i, tech in enumerate(top_jobs.to_dict('records')):
                     medal = ["🥇", "🥈", "🥉"][i]
                     st.write(f"{medal} {tech['technician_name']} - {tech['completed_jobs']} jobs")
             
             with col2:
                 st.markdown("**Highest Revenue**")
                 top_revenue = technician_data.nlargest(3, 'total_revenue')
-                for i, (_, tech) in enumerate(top_revenue.iterrows()):
+                for i, tech in enumerate(top_revenue.to_dict('records')):
                     medal = ["🥇", "🥈", "🥉"][i]
                     st.write(f"{medal} {tech['technician_name']} - ${tech['total_revenue']:.2f}")
             
@@ -685,9 +717,9 @@ def store_management():
                 st.markdown("**Best Success Rate**")
                 tech_with_jobs = technician_data[technician_data['total_jobs'] >= 5]  # Only consider techs with at least 5 jobs
                 if not tech_with_jobs.empty:
-                    tech_with_jobs['success_rate'] = (tech_with_jobs['completed_jobs'] / tech_with_jobs['total_jobs'] * 100)
+                    tech_with_jobs = tech_with_jobs.assign(success_rate=rate(tech_with_jobs['completed_jobs'], tech_with_jobs['total_jobs']))
                     top_success = tech_with_jobs.nlargest(3, 'success_rate')
-                    for i, (_, tech) in enumerate(top_success.iterrows()):
+                    for i, tech in enumerate(top_success.to_dict('records')):
                         medal = ["🥇", "🥈", "🥉"][i]
                         st.write(f"{medal} {tech['technician_name']} - {tech['success_rate']:.1f}%")
                 else:
@@ -696,21 +728,20 @@ def store_management():
             # Workload distribution
             st.markdown("#### 📊 Current Workload Distribution")
             
-            current_workload = pd.read_sql("""
-                SELECT u.full_name as technician_name,
-                       s.name as store_name,
-                       COUNT(CASE WHEN j.status = 'In Progress' THEN 1 END) as active_jobs,
-                       COUNT(CASE WHEN j.status = 'New' THEN 1 END) as pending_jobs,
-                       COUNT(CASE WHEN j.status IN ('In Progress', 'New') THEN 1 END) as total_workload
-                FROM users u
-                LEFT JOIN stores s ON u.store_id = s.id
-                LEFT JOIN jobs j ON u.id = j.assigned_by
-                WHERE u.role IN ('staff', 'technician')
-                GROUP BY u.id, u.full_name, s.name
-                ORDER BY total_workload DESC
-            """, conn)
-            
-            if not current_workload.empty:
+            def build_workload(conn):
+                # Read from the maintained technician_workload projection
+                current_workload = pd.DataFrame(get_technician_workload(conn))
+                if current_workload.empty:
+                    return None
+                # Waiting work is both new and pending jobs
+                current_workload['pending_jobs'] = current_workload['new_jobs'] + current_workload['pending_jobs']
+                current_workload = current_workload.rename(columns={
+                    'full_name': 'technician_name',
+                    'in_progress_jobs': 'active_jobs',
+                })
+                current_workload['total_workload'] = current_workload['open_jobs']
+                current_workload = current_workload.sort_values('total_workload', ascending=False)
+                
                 fig = px.bar(current_workload, 
                            x='technician_name', 
                            y=['active_jobs', 'pending_jobs'],
@@ -718,12 +749,17 @@ def store_management():
                            labels={'value': 'Number of Jobs', 'variable': 'Job Status'},
                            color_discrete_map={'active_jobs': 'orange', 'pending_jobs': 'lightblue'})
                 fig.update_xaxes(tickangle=45)
+                return fig
+            
+            fig = cached_figures(conn, 'stores.technician_workload', None,
+                                 ('technician_workload', 'store_technicians', 'users', 'stores'), build_workload)
+            if fig is not None:
                 st.plotly_chart(fig, use_container_width=True)
             
         else:
             st.info("No technician data available for the selected criteria")
     
-    with tab7:
+    with tab7, profile_section("Daily Analysis"):
         st.markdown("### 📅 Daily Analysis")
         
         # Date selector for daily analysis
@@ -736,33 +772,186 @@ def store_management():
                 max_value=datetime.now().date(),
                 key="daily_analysis_date"
             )
+            analysis_key = day_key(analysis_date)
         
         with col2:
             # Store filter for daily analysis
-            daily_store_options = ["All Stores"] + all_stores_tech['name'].tolist()
+            daily_store_options = ["All Stores"] + list(all_stores_tech)
             selected_daily_store = st.selectbox("Select Store", daily_store_options, key="daily_store_filter")
         
-        # Build query for daily analysis
-        daily_base_query = f"""
-            SELECT s.name as store_name,
-                   COUNT(DISTINCT j.id) as total_jobs_created,
-                   COUNT(DISTINCT CASE WHEN j.status = 'Completed' AND DATE(j.completed_at) = '{analysis_date}' THEN j.id END) as jobs_completed_today,
-                   COUNT(DISTINCT CASE WHEN j.status = 'New' THEN j.id END) as new_jobs,
-                   COUNT(DISTINCT CASE WHEN j.status = 'In Progress' THEN j.id END) as in_progress_jobs,
-                   COALESCE(SUM(CASE WHEN j.status = 'Completed' AND DATE(j.completed_at) = '{analysis_date}' THEN j.actual_cost ELSE 0 END), 0) as daily_revenue,
-                   COUNT(DISTINCT c.id) as customers_served
-            FROM stores s
-            LEFT JOIN jobs j ON s.id = j.store_id AND DATE(j.created_at) = '{analysis_date}'
-            LEFT JOIN customers c ON s.id = c.store_id AND DATE(c.created_at) = '{analysis_date}'
-        """
-        
-        if selected_daily_store != "All Stores":
-            store_id_daily = all_stores_tech[all_stores_tech['name'] == selected_daily_store]['id'].iloc[0]
-            daily_base_query += f" WHERE s.id = {store_id_daily}"
+        daily_store = None if selected_daily_store == "All Stores" else selected_daily_store
         
-        daily_base_query += " GROUP BY s.id, s.name ORDER BY daily_revenue DESC"
+        def build_daily_analysis(conn):
+            """Every query and chart of the Daily Analysis tab for one date and store filter"""
+            section = {}
+            
+            # Build query for daily analysis
+            daily_base_query = f"""
+                SELECT s.name as store_name,
+                       COUNT(DISTINCT j.id) as total_jobs_created,
+                       COUNT(DISTINCT CASE WHEN j.status = 'Completed' AND j.completed_day = {analysis_key} THEN j.id END) as jobs_completed_today,
+                       COUNT(DISTINCT CASE WHEN j.status = 'New' THEN j.id END) as new_jobs,
+                       COUNT(DISTINCT CASE WHEN j.status = 'In Progress' THEN j.id END) as in_progress_jobs,
+                       COALESCE(SUM(CASE WHEN j.status = 'Completed' AND j.completed_day = {analysis_key} THEN j.actual_cost ELSE 0 END), 0) as daily_revenue,
+                       COUNT(DISTINCT c.id) as customers_served
+                FROM stores s
+                LEFT JOIN jobs j ON s.id = j.store_id AND j.created_day = {analysis_key}
+                LEFT JOIN customers c ON s.id = c.store_id
+                    AND c.created_at >= ? AND c.created_at < ?
+            """
+            # Half-open day range on the raw column, so idx_customers_store_created applies
+            daily_params = [str(analysis_date), str(analysis_date + timedelta(days=1))]
+            
+            if daily_store is not None:
+                daily_base_query += " WHERE s.id = ?"
+                daily_params.append(all_stores_tech[daily_store])
+            
+            daily_base_query += " GROUP BY s.id, s.name ORDER BY daily_revenue DESC"
+            
+            section['daily_data'] = daily_data = pd.read_sql(daily_base_query, conn, params=daily_params)
+            if daily_data.empty:
+                return section
+            
+            # Only the chosen store's rows in the per-store queries below
+            store_filter = " AND s.name = ?" if daily_store is not None else ""
+            store_params = [daily_store] if daily_store is not None else []
+            
+            # Daily performance by store
+            if daily_store is None:
+                jobs_fig = px.bar(daily_data, x='store_name', y='total_jobs_created',
+                           title="Jobs Created Today by Store",
+                           color='store_name')
+                jobs_fig.update_layout(showlegend=False)
+                jobs_fig.update_xaxes(tickangle=45)
+                
+                revenue_fig = px.bar(daily_data, x='store_name', y='daily_revenue',
+                           title="Revenue Generated Today by Store",
+                           color='store_name')
+                revenue_fig.update_layout(showlegend=False)
+                revenue_fig.update_xaxes(tickangle=45)
+                section['store_figures'] = (jobs_fig, revenue_fig)
+            
+            # Hourly analysis for the selected date
+            hourly_query = f"""
+                SELECT strftime('%H', j.created_at) as hour,
+                       COUNT(*) as jobs_count,
+                       SUM(j.actual_cost) as hourly_revenue
+                FROM jobs j
+                JOIN stores s ON j.store_id = s.id
+                WHERE j.created_day = {analysis_key}{store_filter}
+                GROUP BY strftime('%H', j.created_at)
+                ORDER BY hour
+            """
+            
+            hourly_data = pd.read_sql(hourly_query, conn, params=store_params)
+            
+            if not hourly_data.empty:
+                # Convert hour to more readable format
+                hourly_data['hour_formatted'] = hourly_data['hour'] + ":00"
+                
+                jobs_fig = px.line(hourly_data, x='hour_formatted', y='jobs_count',
+                            title="Jobs Created by Hour",
+                            markers=True)
+                jobs_fig.update_xaxes(title="Hour of Day")
+                jobs_fig.update_yaxes(title="Number of Jobs")
+                
+                revenue_fig = px.bar(hourly_data, x='hour_formatted', y='hourly_revenue',
+                           title="Revenue by Hour",
+                           color='hourly_revenue')
+                revenue_fig.update_xaxes(title="Hour of Day")
+                revenue_fig.update_yaxes(title="Revenue ($)")
+                section['hourly_figures'] = (jobs_fig, revenue_fig)
+            
+            # Daily technician activity
+            daily_tech_query = f"""
+                SELECT u.full_name as technician_name,
+                       s.name as store_name,
+                       COUNT(CASE WHEN j.created_day = {analysis_key} THEN 1 END) as jobs_assigned_today,
+                       COUNT(CASE WHEN j.completed_day = {analysis_key} THEN 1 END) as jobs_completed_today,
+                       SUM(CASE WHEN j.completed_day = {analysis_key} THEN j.actual_cost ELSE 0 END) as revenue_today
+                FROM users u
+                LEFT JOIN stores s ON u.store_id = s.id
+                LEFT JOIN jobs j ON u.id = j.assigned_by
+                WHERE u.role IN ('staff', 'technician'){store_filter}
+                GROUP BY u.id, u.full_name, s.name
+                HAVING jobs_assigned_today > 0 OR jobs_completed_today > 0
+                ORDER BY jobs_completed_today DESC, jobs_assigned_today DESC
+            """
+            
+            section['daily_tech_data'] = pd.read_sql(daily_tech_query, conn, params=store_params)
+            
+            # Device types worked on today
+            device_daily_query = f"""
+                SELECT j.device_type,
+                       COUNT(*) as count,
+                       AVG(j.actual_cost) as avg_cost
+                FROM jobs j
+                JOIN stores s ON j.store_id = s.id
+                WHERE j.created_day = {analysis_key}
+                  AND j.device_type IS NOT NULL 
+                  AND j.device_type != ''{store_filter}
+                GROUP BY j.device_type
+                ORDER BY count DESC
+            """
+            
+            device_daily_data = pd.read_sql(device_daily_query, conn, params=store_params)
+            
+            if not device_daily_data.empty:
+                share_fig = px.pie(device_daily_data, values='count', names='device_type',
+                           title="Device Types Serviced Today")
+                
+                cost_fig = px.bar(device_daily_data, x='device_type', y='avg_cost',
+                           title="Average Repair Cost by Device Type",
+                           color='device_type')
+                cost_fig.update_layout(showlegend=False)
+                section['device_figures'] = (share_fig, cost_fig)
+            
+            # Get data for the past 7 days including selected date
+            week_low, week_high = day_range(analysis_date - timedelta(days=6), analysis_date)
+            weekly_query = f"""
+                SELECT DATE(MIN(j.created_at)) as date,
+                       COUNT(*) as jobs_created,
+                       COUNT(CASE WHEN j.status = 'Completed' THEN 1 END) as jobs_completed,
+                       SUM(CASE WHEN j.status = 'Completed' THEN j.actual_cost ELSE 0 END) as daily_revenue
+                FROM jobs j
+                JOIN stores s ON j.store_id = s.id
+                WHERE j.created_day >= {week_low} AND j.created_day < {week_high}{store_filter}
+                GROUP BY j.created_day
+                ORDER BY j.created_day
+            """
+            
+            weekly_data = pd.read_sql(weekly_query, conn, params=store_params)
+            
+            if not weekly_data.empty:
+                activity_fig = make_subplots(specs=[[{"secondary_y": True}]])
+                
+                activity_fig.add_trace(
+                    go.Scatter(x=weekly_data['date'], y=weekly_data['jobs_created'],
+                             mode='lines+markers', name='Jobs Created', line=dict(color='blue')),
+                    secondary_y=False
+                )
+                
+                activity_fig.add_trace(
+                    go.Scatter(x=weekly_data['date'], y=weekly_data['jobs_completed'],
+                             mode='lines+markers', name='Jobs Completed', line=dict(color='green')),
+                    secondary_y=False
+                )
+                
+                activity_fig.update_xaxes(title_text="Date")
+                activity_fig.update_yaxes(title_text="Number of Jobs", secondary_y=False)
+                activity_fig.update_layout(title_text="7-Day Job Activity Trend")
+                
+                revenue_fig = px.line(weekly_data, x='date', y='daily_revenue',
+                            title="7-Day Revenue Trend",
+                            markers=True)
+                revenue_fig.update_yaxes(title="Revenue ($)")
+                section['weekly_figures'] = (activity_fig, revenue_fig)
+            
+            return section
         
-        daily_data = pd.read_sql(daily_base_query, conn)
+        section = cached_figures(conn, 'stores.daily_analysis', (analysis_key, daily_store),
+                                 ('jobs', 'stores', 'customers', 'users'), build_daily_analysis)
+        daily_data = section['daily_data']
         
         if not daily_data.empty:
             # Daily summary metrics
@@ -788,99 +977,31 @@ def store_management():
                 st.metric("👥 New Customers", total_customers)
             
             # Daily performance by store
-            if selected_daily_store == "All Stores":
+            if 'store_figures' in section:
                 st.markdown("#### 🏪 Store Performance Today")
                 
                 col1, col2 = st.columns(2)
-                
                 with col1:
-                    fig = px.bar(daily_data, x='store_name', y='total_jobs_created',
-                               title="Jobs Created Today by Store",
-                               color='store_name')
-                    fig.update_layout(showlegend=False)
-                    fig.update_xaxes(tickangle=45)
-                    st.plotly_chart(fig, use_container_width=True)
-                
+                    st.plotly_chart(section['store_figures'][0], use_container_width=True)
                 with col2:
-                    fig = px.bar(daily_data, x='store_name', y='daily_revenue',
-                               title="Revenue Generated Today by Store",
-                               color='store_name')
-                    fig.update_layout(showlegend=False)
-                    fig.update_xaxes(tickangle=45)
-                    st.plotly_chart(fig, use_container_width=True)
+                    st.plotly_chart(section['store_figures'][1], use_container_width=True)
             
             # Hourly analysis for the selected date
             st.markdown("#### ⏰ Hourly Job Creation Pattern")
             
-            hourly_query = f"""
-                SELECT strftime('%H', j.created_at) as hour,
-                       COUNT(*) as jobs_count,
-                       SUM(j.actual_cost) as hourly_revenue
-                FROM jobs j
-                JOIN stores s ON j.store_id = s.id
-                WHERE DATE(j.created_at) = '{analysis_date}'
-            """
-            
-            if selected_daily_store != "All Stores":
-                hourly_query += f" AND s.name = '{selected_daily_store}'"
-            
-            hourly_query += """
-                GROUP BY strftime('%H', j.created_at)
-                ORDER BY hour
-            """
-            
-            hourly_data = pd.read_sql(hourly_query, conn)
-            
-            if not hourly_data.empty:
-                # Convert hour to more readable format
-                hourly_data['hour_formatted'] = hourly_data['hour'].apply(lambda x: f"{x}:00")
-                
+            if 'hourly_figures' in section:
                 col1, col2 = st.columns(2)
-                
                 with col1:
-                    fig = px.line(hourly_data, x='hour_formatted', y='jobs_count',
-                                title="Jobs Created by Hour",
-                                markers=True)
-                    fig.update_xaxes(title="Hour of Day")
-                    fig.update_yaxes(title="Number of Jobs")
-                    st.plotly_chart(fig, use_container_width=True)
-                
+                    st.plotly_chart(section['hourly_figures'][0], use_container_width=True)
                 with col2:
-                    fig = px.bar(hourly_data, x='hour_formatted', y='hourly_revenue',
-                               title="Revenue by Hour",
-                               color='hourly_revenue')
-                    fig.update_xaxes(title="Hour of Day")
-                    fig.update_yaxes(title="Revenue ($)")
-                    st.plotly_chart(fig, use_container_width=True)
+                    st.plotly_chart(section['hourly_figures'][1], use_container_width=True)
             else:
                 st.info(f"No hourly data available for {analysis_date}")
             
             # Daily technician activity
             st.markdown("#### 👨‍🔧 Technician Activity Today")
             
-            daily_tech_query = f"""
-                SELECT u.full_name as technician_name,
-                       s.name as store_name,
-                       COUNT(CASE WHEN DATE(j.created_at) = '{analysis_date}' THEN 1 END) as jobs_assigned_today,
-                       COUNT(CASE WHEN DATE(j.completed_at) = '{analysis_date}' THEN 1 END) as jobs_completed_today,
-                       SUM(CASE WHEN DATE(j.completed_at) = '{analysis_date}' THEN j.actual_cost ELSE 0 END) as revenue_today
-                FROM users u
-                LEFT JOIN stores s ON u.store_id = s.id
-                LEFT JOIN jobs j ON u.id = j.assigned_by
-                WHERE u.role IN ('staff', 'technician')
-            """
-            
-            if selected_daily_store != "All Stores":
-                daily_tech_query += f" AND s.name = '{selected_daily_store}'"
-            
-            daily_tech_query += """
-                GROUP BY u.id, u.full_name, s.name
-                HAVING jobs_assigned_today > 0 OR jobs_completed_today > 0
-                ORDER BY jobs_completed_today DESC, jobs_assigned_today DESC
-            """
-            
-            daily_tech_data = pd.read_sql(daily_tech_query, conn)
-            
+            daily_tech_data = section['daily_tech_data']
             if not daily_tech_data.empty:
                 st.dataframe(
                     daily_tech_data,
@@ -899,101 +1020,24 @@ def store_management():
             # Device types worked on today
             st.markdown("#### 📱 Device Types Serviced Today")
             
-            device_daily_query = f"""
-                SELECT j.device_type,
-                       COUNT(*) as count,
-                       AVG(j.actual_cost) as avg_cost
-                FROM jobs j
-                JOIN stores s ON j.store_id = s.id
-                WHERE DATE(j.created_at) = '{analysis_date}'
-                  AND j.device_type IS NOT NULL 
-                  AND j.device_type != ''
-            """
-            
-            if selected_daily_store != "All Stores":
-                device_daily_query += f" AND s.name = '{selected_daily_store}'"
-            
-            device_daily_query += """
-                GROUP BY j.device_type
-                ORDER BY count DESC
-            """
-            
-            device_daily_data = pd.read_sql(device_daily_query, conn)
-            
-            if not device_daily_data.empty:
+            if 'device_figures' in section:
                 col1, col2 = st.columns(2)
-                
                 with col1:
-                    fig = px.pie(device_daily_data, values='count', names='device_type',
-                               title="Device Types Serviced Today")
-                    st.plotly_chart(fig, use_container_width=True)
-                
+                    st.plotly_chart(section['device_figures'][0], use_container_width=True)
                 with col2:
-                    fig = px.bar(device_daily_data, x='device_type', y='avg_cost',
-                               title="Average Repair Cost by Device Type",
-                               color='device_type')
-                    fig.update_layout(showlegend=False)
-                    st.plotly_chart(fig, use_container_width=True)
+                    st.plotly_chart(section['device_figures'][1], use_container_width=True)
             else:
                 st.info(f"No device service data for {analysis_date}")
             
             # Weekly comparison
             st.markdown("#### 📈 Weekly Trend Comparison")
             
-            # Get data for the past 7 days including selected date
-            week_start = analysis_date - timedelta(days=6)
-            week_end = analysis_date
-            
-            weekly_query = f"""
-                SELECT DATE(j.created_at) as date,
-                       COUNT(*) as jobs_created,
-                       COUNT(CASE WHEN j.status = 'Completed' THEN 1 END) as jobs_completed,
-                       SUM(CASE WHEN j.status = 'Completed' THEN j.actual_cost ELSE 0 END) as daily_revenue
-                FROM jobs j
-                JOIN stores s ON j.store_id = s.id
-                WHERE DATE(j.created_at) BETWEEN '{week_start}' AND '{week_end}'
-            """
-            
-            if selected_daily_store != "All Stores":
-                weekly_query += f" AND s.name = '{selected_daily_store}'"
-            
-            weekly_query += """
-                GROUP BY DATE(j.created_at)
-                ORDER BY date
-            """
-            
-            weekly_data = pd.read_sql(weekly_query, conn)
-            
-            if not weekly_data.empty:
+            if 'weekly_figures' in section:
                 col1, col2 = st.columns(2)
-                
                 with col1:
-                    fig = make_subplots(specs=[[{"secondary_y": True}]])
-                    
-                    fig.add_trace(
-                        go.Scatter(x=weekly_data['date'], y=weekly_data['jobs_created'],
-                                 mode='lines+markers', name='Jobs Created', line=dict(color='blue')),
-                        secondary_y=False
-                    )
-                    
-                    fig.add_trace(
-                        go.Scatter(x=weekly_data['date'], y=weekly_data['jobs_completed'],
-                                 mode='lines+markers', name='Jobs Completed', line=dict(color='green')),
-                        secondary_y=False
-                    )
-                    
-                    fig.update_xaxes(title_text="Date")
-                    fig.update_yaxes(title_text="Number of Jobs", secondary_y=False)
-                    fig.update_layout(title_text="7-Day Job Activity Trend")
-                    
-                    st.plotly_chart(fig, use_container_width=True)
-                
+                    st.plotly_chart(section['weekly_figures'][0], use_container_width=True)
                 with col2:
-                    fig = px.line(weekly_data, x='date', y='daily_revenue',
-                                title="7-Day Revenue Trend",
-                                markers=True)
-                    fig.update_yaxes(title="Revenue ($)")
-                    st.plotly_chart(fig, use_container_width=True)
+                    st.plotly_chart(section['weekly_figures'][1], use_container_width=True)
             else:
                 st.info("No weekly trend data available")
                 
@@ -1,18 +1,15 @@
 import streamlit as st
 import sqlite3
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import hashlib
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
 import io
 import time
 import sys
 import os 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from components.datamanager.databasemanger import DatabaseManager
+from components.datamanager.dimensions import get_store_options, get_store_name
 from components.utils.auth import hash_password , verify_password,authenticate_user , create_user
 
 def user_management():
@@ -49,7 +46,7 @@ def user_management():
         users_df = pd.read_sql(users_query, conn)
         
         if not users_df.empty:
-            for _, user_data in users_df.iterrows():
+            for user_data in users_df.to_dict('records'):
                 with st.expander(f"👤 {user_data['full_name']} ({user_data['role']})"):
                     col1, col2 = st.columns(2)
                     
@@ -60,7 +57,7 @@ def user_management():
                     
                     with col2:
                         st.write(f"**Role:** {user_data['role']}")
-                        last_login = user_data['last_login'][:19] if user_data['last_login'] else 'Never'
+                        last_login = str(user_data['last_login'])[:19] if pd.notna(user_data['last_login']) else 'Never'
                         st.write(f"**Last Login:** {last_login}")
                     
                     # User actions
@@ -118,8 +115,7 @@ def user_management():
                 new_role = st.selectbox("Role*", roles)
                 
                 # Get stores for assignment
-                stores = pd.read_sql("SELECT id, name FROM stores", conn)
-                store_options = {row['name']: row['id'] for _, row in stores.iterrows()}
+                store_options = get_store_options(conn)
                 
                 selected_store = None
                 new_store_id = None
@@ -230,23 +226,16 @@ def edit_user_form(conn, user_data, current_user_role):
             edit_role = st.selectbox("Role", roles, index=current_role_index)
             
             # Store selection
-            stores = pd.read_sql("SELECT id, name FROM stores", conn)
-            store_options = {row['name']: row['id'] for _, row in stores.iterrows()}
+            store_options = get_store_options(conn)
             
             if edit_role in ["staff", "technician", "manager"]:
                 store_names = list(store_options.keys())
                 current_store_index = 0
                 
                 if user_data['store_id']:
-                    current_store_name = pd.read_sql(
-                        "SELECT name FROM stores WHERE id = ?", 
-                        conn, params=[user_data['store_id']]
-                    )
-                    if not current_store_name.empty:
-                        try:
-                            current_store_index = store_names.index(current_store_name.iloc[0]['name'])
-                        except ValueError:
-                            current_store_index = 0
+                    current_store_name = get_store_name(conn, user_data['store_id'])
+                    if current_store_name in store_names:
+                        current_store_index = store_names.index(current_store_name)
                 
                 edit_store = st.selectbox("Store", store_names, index=current_store_index)
                 edit_store_id = store_options[edit_store]
@@ -363,6 +352,8 @@ def delete_user(conn, user_id):
         cursor.execute("DELETE FROM user_stores WHERE user_id = ?", (user_id,))
         cursor.execute("DELETE FROM store_technicians WHERE technician_id = ?", (user_id,))
         cursor.execute("DELETE FROM technician_assignments WHERE technician_id = ?", (user_id,))
+        cursor.execute("DELETE FROM technician_daily_stats WHERE technician_id = ?", (user_id,))
+        cursor.execute("DELETE FROM technician_workload WHERE technician_id = ?", (user_id,))
         
         # Delete user
         cursor.execute("DELETE FROM users WHERE id = ?", (user_id,))
@@ -8,6 +8,8 @@ from components.datamanager.databasemanger import DatabaseManager
 from components.updatestatusmodal import show_update_status_modal
 from components.utils.pdf import generate_invoice_pdf_stream
 from components.conformation_reopen import show_reopen_confirmation_modal
+from components.datamanager.jobqueries import fetch_jobs_by_status
+from components.datamanager.customfields import load_custom_values
 
 # Database connection manager
 db = DatabaseManager()
@@ -28,79 +30,7 @@ def view_jobs_tab(conn, user):
     
     # Helper function to get jobs by status with role-based filtering
     def get_jobs_by_status(status, payment_filter=None):
-        base_query = '''
-        SELECT 
-            j.id,
-            j.created_at,
-            c.name AS customer_name,
-            c.phone AS customer_phone,
-            c.email AS customer_email,
-            j.device_type,
-            j.device_model,
-            j.problem_description,
-            j.status,
-            j.deposit_cost,
-            j.raw_cost,
-            j.estimate_cost,
-            j.actual_cost,
-            j.payment_status,
-            j.payment_method,
-            u.full_name AS technician,
-            s.name AS store_name,
-            s.location AS store_location,
-            j.completed_at
-        FROM jobs j
-        JOIN customers c ON j.customer_id = c.id
-        LEFT JOIN stores s ON j.store_id = s.id
-        LEFT JOIN assignment_jobs aj ON aj.job_id = j.id
-        LEFT JOIN technician_assignments ta ON ta.id = aj.assignment_id AND ta.status = 'active'
-        LEFT JOIN users u ON u.id = ta.technician_id
-        WHERE j.status = ?
-        '''
-
-        params = [status]
-
-        # Add payment filter
-        if payment_filter:
-            if payment_filter == "completed":
-                base_query += " AND j.payment_status = 'Completed'"
-            elif payment_filter == "pending":
-                base_query += " AND j.payment_status != 'Completed'"
-
-        # Role-based filtering
-        if user['role'] == 'admin':
-            pass
-        elif user['role'] in ['manager', 'staff']:
-            if user.get('store_id'):
-                base_query += " AND j.store_id = ?"
-                params.append(user['store_id'])
-        elif user['role'] == 'technician':
-            base_query += " AND ta.technician_id = ?"
-            params.append(user['id'])
-
-        # Enhanced search filter
-        if search_term:
-            base_query += '''
-            AND (
-                c.name LIKE ? OR
-                c.email LIKE ? OR
-                c.phone LIKE ? OR
-                j.device_type LIKE ? OR
-                j.problem_description LIKE ? OR
-                CAST(j.id AS TEXT) LIKE ?
-            )
-            '''
-            search_pattern = f"%{search_term}%"
-            params.extend([search_pattern]*6)
-
-        # Optional device filter
-        if device_filter != "All":
-            base_query += " AND j.device_type = ?"
-            params.append(device_filter)
-
-        base_query += " ORDER BY j.created_at DESC"
-
-        return pd.read_sql(base_query, conn, params=params)
+        return fetch_jobs_by_status(conn, user, status, payment_filter, search_term, device_filter)
     
     # Helper function to update payment information
     def update_payment_info(job_id, payment_method, payment_status):
@@ -129,7 +59,9 @@ def view_jobs_tab(conn, user):
     # Helper function to display job card with action buttons
     def display_job_card(jobs_df, tab_status, payment_section=False):
         if len(jobs_df) > 0:
-            for idx, job in jobs_df.iterrows():
+            # Custom job sheet field values of every listed job in one query
+            custom_values = load_custom_values(conn, jobs_df['id'])
+            for job in jobs_df.to_dict('records'):
                 with st.container():
                     st.markdown("---")
                     
@@ -220,6 +152,8 @@ def view_jobs_tab(conn, user):
                             📞 {job['customer_phone']}  
                             🔧 {job['problem_description'][:80]}{'...' if len(str(job['problem_description'])) > 80 else ''}
                             """)
+                            if job['id'] in custom_values:
+                                st.caption(" · ".join(f"{label}: {str(value)[:40]}" for label, value in custom_values[job['id']]))
                         
                         with col2:
                             st.markdown(f"**📅 Created:** {pd.to_datetime(job['created_at']).strftime('%Y-%m-%d %H:%M')}")